@@ -1,250 +1,426 @@
 import argparse
+import contextlib
+import csv
+import glob
 import json
 import math
-from typing import Dict
-
-import pandas as pd
-import requests
-from geopy.distance import geodesic
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from cost_model import (
+    COST_COMPONENTS,
+    DEFAULT_SPEED,
+    CostParameters,
+    print_costs,
+    summarize_costs,
+)
+from csv_table import integer_column, iter_tables, numeric_column, read_table
+from distance_cache import DEFAULT_MAX_ENTRIES, DistanceCache
+from distance_matrix import DENSE_MATRIX_LIMIT, PAIR_FUNCTIONS, DistanceMatrix, SparseLegTable
+from instance_model import CLIENT, DEPOT, NodeTable, RouteStops, normalize_id
+from lower_bounds import instance_bound, print_gap, quality_gap
+from matrix_io import read_distance_matrix
+from osrm_client import DEFAULT_OSRM_URL, OSRMError, OSRMTableClient
+from parallel import ParallelValidator
+from profiling import NULL_PROFILER, Profiler
+from route_memo import RouteMemo, split_route_results
+from sensitivity import CostSweep, parse_axis, print_sweep, range_axes, write_sweep
+
+# Routes per chunk read by streaming validation (iter_validation)
+DEFAULT_CHUNK_ROWS = 1024
 
 
 class SolutionValidator:
+    # Reader for instance and solution CSV files. The csv-module Table keeps
+    # pandas (and its import time) off the base validator; subclasses that
+    # parse with pandas string helpers set this to pandas.read_csv.
+    read_table = staticmethod(read_table)
+    read_table_chunks = staticmethod(iter_tables)
+
+    # validate_routes result arrays summed across route chunks and passed to
+    # check_totals (client visit counts; subclasses add their own)
+    summed_results = ("visits",)
+
+    # Fuel is priced as distance over fuel efficiency (Project C prices the
+    # refuels bought at stations instead)
+    fuel_from_records = False
+
+    # Whether routes may return to a depot to reload mid-route (Project B
+    # parameters); one route can then serve any demand
+    resupply_allowed = False
+
     def __init__(
         self,
         distance_method: str = "haversine",
-        cache_file: str = "distance_cache.json",
+        cache_file: str = "distance_cache.sqlite",
+        cache_max_entries: int = DEFAULT_MAX_ENTRIES,
         matrix_file: str = None,
+        sparse_matrix: bool = False,
         solution_file: str = None,
+        load_solution: bool = True,
+        osrm_url: str = DEFAULT_OSRM_URL,
+        osrm_request_budget: int = None,
+        osrm_timeout: float = 10.0,
+        parameters_file: str = "parameters_base.csv",
+        speed: float = DEFAULT_SPEED,
+        route_memo: int = 0,
+        report_gap: bool = False,
+        profiler=None,
     ):
+        self.profiler = profiler or NULL_PROFILER
+        # Per-route results reused across solutions (0 disables the memo)
+        self.route_memo = RouteMemo(route_memo) if route_memo else None
+        # Gap to the instance lower bounds in every result (bound computed once)
+        self.report_gap = report_gap
+        self._lower_bound = None
         self.distance_method = distance_method
         self.cache_file = cache_file
-        self.distance_cache = {}
+        self.cache_max_entries = cache_max_entries
+        self.distance_cache = None
         self.distance_matrix = None
+        self.distance_engine = None
         self.distance_matrix_file = matrix_file
+        self.sparse_matrix = sparse_matrix
+        self._matrix_nodes = None
+        self._matrix_legs = None
         self.matrix_metadata = {}
         self.solution_file = solution_file or "verificacion_caso1.csv"
 
+        self.osrm_client = None
+        self.osrm_failed_legs = set()
+        if distance_method == "osrm":
+            self.osrm_client = OSRMTableClient(
+                base_url=osrm_url,
+                timeout=osrm_timeout,
+                request_budget=osrm_request_budget,
+            )
+
         # Load distance matrix if provided and method is matrix
         if matrix_file and distance_method == "matrix":
-            self.load_distance_matrix(matrix_file)
+            with self.profiler.phase("load_matrix"):
+                self.load_distance_matrix(matrix_file)
 
-        # Load cache only if not using matrix method
-        if distance_method != "matrix":
+        # Load cache only for methods without a precomputed distance table
+        if distance_method not in ("matrix", *PAIR_FUNCTIONS):
             self.load_cache()
 
         try:
             # Load data
-            self.vehicles_df = pd.read_csv("vehicles.csv")
-            self.clients_df = pd.read_csv("clients.csv")
-            self.depots_df = pd.read_csv("depots.csv")
+            with self.profiler.phase("load_instance"):
+                self.vehicles_df = self.read_table("vehicles.csv")
+                self.clients_df = self.read_table("clients.csv")
+                self.depots_df = self.read_table("depots.csv")
 
             # Try configured solution file, fallback to solution.csv
-            try:
-                self.solution_df = pd.read_csv(self.solution_file)
-            except FileNotFoundError:
-                if self.solution_file != "solution.csv":
-                    print(f"Warning: {self.solution_file} not found, trying solution.csv...")
-                    self.solution_df = pd.read_csv("solution.csv")
-                else:
-                    raise
-
-            # Create coordinate mappings
-            self.locations = {}
-
-            # Map depots with their alphanumeric identifiers
-            # Based on your data, depot 1 maps to "CDA"
-            for _, depot in self.depots_df.iterrows():
-                depot_numeric_id = int(depot["DepotID"])
-
-                # Map numeric ID
-                self.locations[depot_numeric_id] = {
-                    "latitude": depot["Latitude"],
-                    "longitude": depot["Longitude"],
-                    "type": "depot",
-                }
-
-                # Map alphanumeric ID (CDA for depot 1)
-                if depot_numeric_id == 1:
-                    self.locations["CDA"] = {
-                        "latitude": depot["Latitude"],
-                        "longitude": depot["Longitude"],
-                        "type": "depot",
-                    }
-
-            # Add client coordinates
-            for _, client in self.clients_df.iterrows():
-                client_id = f"C{int(client['ClientID']):03d}"
-                self.locations[client_id] = {
-                    "latitude": client["Latitude"],
-                    "longitude": client["Longitude"],
-                    "type": "client",
-                    "demand": int(client["Demand"]),
-                }
-
-            # Create lookup dictionaries
-            self.client_demands = {
-                f"C{int(row.ClientID):03d}": int(row.Demand)
-                for _, row in self.clients_df.iterrows()
-            }
+            # (batch mode loads its solutions later, one file at a time)
+            self.solution_df = None
+            if load_solution:
+                try:
+                    with self.profiler.phase("load_solution"):
+                        self.solution_df = self.read_table(self.solution_file)
+                except FileNotFoundError:
+                    if self.solution_file != "solution.csv":
+                        print(
+                            f"Warning: {self.solution_file} not found, trying solution.csv..."
+                        )
+                        self.solution_df = self.read_table("solution.csv")
+                    else:
+                        raise
+
+            # Columnar instance arrays (one vectorized pass per file)
+            self.depot_numeric_ids = integer_column(self.depots_df["DepotID"])
+            self.depot_ids = self._standard_ids(
+                self.depots_df, self.depot_numeric_ids, "CD{:02d}"
+            )
+            self.client_ids = [
+                f"C{i:03d}" for i in integer_column(self.clients_df["ClientID"]).tolist()
+            ]
+            self.client_demand_array = integer_column(self.clients_df["Demand"])
+
+            # Client coordinates are optional (Project C lists municipalities
+            # only and needs a distance matrix)
+            self.client_latitudes = self._coordinate_column(self.clients_df, "Latitude")
+            self.client_longitudes = self._coordinate_column(self.clients_df, "Longitude")
+
+            # Interned locations: depots, then clients (Project C appends
+            # stations). Depots are also known by numeric ID and legacy letter
+            # (1, "1", "CDA"); node_ids is the dense node order.
+            self.nodes = NodeTable()
+            self.nodes.add(
+                DEPOT,
+                self.depot_ids,
+                self._coordinate_column(self.depots_df, "Latitude"),
+                self._coordinate_column(self.depots_df, "Longitude"),
+                numeric_ids=self.depot_numeric_ids,
+            )
+            self.client_nodes = self.nodes.add(
+                CLIENT,
+                self.client_ids,
+                self.client_latitudes,
+                self.client_longitudes,
+                demands=self.client_demand_array,
+            )
+            self.node_ids = self.nodes.ids
 
             self.vehicle_specs = {
-                int(row.VehicleID): {
-                    "capacity": int(row.Capacity),
-                    "range": int(row.Range),
-                }
-                for _, row in self.vehicles_df.iterrows()
+                vehicle_id: {"capacity": capacity, "range": vehicle_range}
+                for vehicle_id, capacity, vehicle_range in zip(
+                    integer_column(self.vehicles_df["VehicleID"]).tolist(),
+                    integer_column(self.vehicles_df["Capacity"]).tolist(),
+                    integer_column(self.vehicles_df["Range"]).tolist(),
+                )
             }
 
+            # Objective coefficients; without a parameters file only
+            # feasibility is checked
+            self.cost_parameters = None
+            if parameters_file and os.path.exists(parameters_file):
+                self.cost_parameters = CostParameters.from_file(parameters_file, speed=speed)
+
+            # Precompute all pairwise distances for coordinate-based methods
+            if distance_method in PAIR_FUNCTIONS:
+                with self.profiler.phase("build_distance_engine"):
+                    self.distance_engine = self.build_distance_engine(distance_method)
+
         except Exception as e:
             print(f"Error during initialization: {str(e)}")
             raise
 
-    def load_cache(self):
-        """Load distance cache from file."""
-        try:
-            with open(self.cache_file, "r") as f:
-                self.distance_cache = json.load(f)
-        except FileNotFoundError:
-            self.distance_cache = {}
-
-    def save_cache(self):
-        """Save distance cache to file."""
-        with open(self.cache_file, "w") as f:
-            json.dump(self.distance_cache, f)
+    @staticmethod
+    def _coordinate_column(df, column: str) -> np.ndarray:
+        """Return a coordinate column as floats, or NaN if the file has none."""
+        if column not in df.columns:
+            return np.full(len(df), np.nan)
+        return numeric_column(df[column])
 
-    def load_distance_matrix(self, matrix_file: str) -> None:
+    @staticmethod
+    def _standard_ids(df, numeric_ids, template: str) -> List[str]:
         """
-        Load distance matrix from JSON or CSV file.
+        Return the StandardizedID column, deriving missing IDs from numeric IDs.
 
         Args:
-            matrix_file: Path to distance matrix file (.json or .csv)
+            df: Instance table (depots, clients, ...), Table or DataFrame
+            numeric_ids: Numeric IDs aligned with df rows
+            template: Format for derived IDs, e.g. "CD{:02d}"
+        """
+        derived = [template.format(int(i)) for i in numeric_ids]
+        if "StandardizedID" not in df.columns:
+            return derived
+        standard = df["StandardizedID"].tolist()
+        return [s if isinstance(s, str) and s else d for s, d in zip(standard, derived)]
 
-        Raises:
-            ValueError: If file format is invalid or contains errors
-            FileNotFoundError: If file doesn't exist
+    def build_distance_engine(self, method: str) -> DistanceMatrix:
         """
-        import os
+        Build the all-pairs distance table over the node table.
 
-        if not os.path.exists(matrix_file):
-            raise FileNotFoundError(
-                f"Distance matrix file not found: {matrix_file}\n"
-                "Ensure the file path is correct and the file exists."
-            )
+        Engine indices are node IDs, so interned routes index it directly;
+        every alias of the node table resolves to the same entries.
 
-        # Detect format from extension
-        file_ext = os.path.splitext(matrix_file)[1].lower()
+        Args:
+            method: "haversine" or "geopy"
 
-        try:
-            if file_ext == ".json":
-                self._load_json_matrix(matrix_file)
-            elif file_ext == ".csv":
-                self._load_csv_matrix(matrix_file)
-            else:
-                raise ValueError(
-                    f"Unsupported file format: {file_ext}\n"
-                    "Distance matrix must be .json or .csv"
-                )
-        except json.JSONDecodeError as e:
+        Returns:
+            DistanceMatrix covering every node
+        """
+        nodes = self.nodes
+        if np.isnan(nodes.latitude).any() or np.isnan(nodes.longitude).any():
             raise ValueError(
-                f"Invalid JSON format in {matrix_file}:\n"
-                f"  {str(e)}\n"
-                "Ensure the file is valid JSON."
+                f"{method} distances need Latitude and Longitude for every location.\n"
+                "Use --method matrix with a distance matrix for instances without coordinates."
             )
-        except pd.errors.ParserError as e:
-            raise ValueError(
-                f"Invalid CSV format in {matrix_file}:\n"
-                f"  {str(e)}\n"
-                "Ensure the file is valid CSV."
+
+        return DistanceMatrix.from_coordinates(
+            nodes.ids,
+            nodes.latitude,
+            nodes.longitude,
+            method=method,
+            aliases={alias: nodes.ids[node] for alias, node in nodes.index.items()},
+        )
+
+    def location_index(self) -> Dict:
+        """
+        Map location IDs to their position in node_ids (depots, then clients).
+
+        Numeric depot IDs (as int and as string), legacy depot letters (CDA,
+        CDB, ...) and unpadded spellings resolve to the same node as the
+        StandardizedID. Returns the node table's alias index (do not modify).
+        """
+        return self.nodes.index
+
+    def matrix_nodes(self) -> np.ndarray:
+        """Row of each node in the loaded distance matrix (-1 where absent)."""
+        if self._matrix_nodes is None or len(self._matrix_nodes) != len(self.nodes):
+            index = self.distance_matrix.index
+            self._matrix_nodes = np.array(
+                [index.get(loc_id, -1) for loc_id in self.nodes.ids], dtype=np.intp
             )
+        return self._matrix_nodes
 
-        print(f"Loaded distance matrix from {matrix_file}")
-        if "matrix_type" in self.matrix_metadata:
-            print(f"Matrix type: {self.matrix_metadata['matrix_type']}")
+    def has_sparse_matrix(self) -> bool:
+        """Whether the loaded distance matrix is a SparseDistanceMatrix."""
+        return self.distance_matrix is not None and not self.distance_matrix.is_dense
 
-    def _load_json_matrix(self, matrix_file: str) -> None:
-        """Load distance matrix from JSON file."""
-        with open(matrix_file, "r") as f:
-            data = json.load(f)
+    def matrix_legs(self) -> SparseLegTable:
+        """
+        Node-indexed leg table over a sparse matrix.
 
-        # Extract metadata if present
-        if "metadata" in data:
-            self.matrix_metadata = data["metadata"]
+        Legs the matrix does not store use the haversine distance between
+        the node coordinates (counted in fallback_legs).
+        """
+        if self._matrix_legs is None or len(self._matrix_legs) != len(self.nodes):
+            self._matrix_legs = SparseLegTable(
+                self.distance_matrix,
+                self.matrix_nodes(),
+                self.nodes.latitude,
+                self.nodes.longitude,
+            )
+        return self._matrix_legs
 
-        # Get distances
-        if "distances" not in data:
-            raise ValueError("JSON matrix must contain 'distances' key")
+    def fallback_legs(self) -> int:
+        """Legs computed with the haversine fallback of a sparse matrix so far."""
+        return self._matrix_legs.fallback_legs if self._matrix_legs is not None else 0
 
-        distances = data["distances"]
+    def distance_table(self, lazy: bool = False) -> np.ndarray:
+        """
+        Dense (N, N) distances between all depots and clients.
 
-        # Validate structure
-        if not isinstance(distances, dict):
-            raise ValueError("'distances' must be a dictionary")
+        Rows and columns follow node_ids. Matrix pairs stored only in the
+        reverse direction are mirrored; OSRM distances are fetched for all
+        pairs in batched table requests.
 
-        # Validate and store matrix
-        self.distance_matrix = {}
-        for origin, destinations in distances.items():
-            if not isinstance(destinations, dict):
-                raise ValueError(f"Destinations for {origin} must be a dictionary")
+        Args:
+            lazy: With a sparse matrix, return its node-indexed leg table
+                (indexed like the dense table) instead of materializing it
 
-            self.distance_matrix[origin] = {}
-            for dest, dist in destinations.items():
-                if not isinstance(dist, (int, float)):
-                    raise ValueError(
-                        f"Distance {origin}→{dest} must be numeric, got {type(dist)}"
-                    )
-                if dist < 0:
-                    raise ValueError(
-                        f"Distance {origin}→{dest} cannot be negative: {dist}"
-                    )
-                if not math.isfinite(dist):
-                    raise ValueError(
-                        f"Distance {origin}→{dest} must be finite, got {dist}"
-                    )
+        Raises:
+            ValueError: If the loaded matrix lacks locations or pairs, or a
+                sparse matrix covers too many locations for a dense table
+        """
+        node_ids = self.node_ids
 
-                self.distance_matrix[origin][dest] = dist
+        if self.has_sparse_matrix():
+            legs = self.matrix_legs()
+            if lazy:
+                return legs
+            if len(node_ids) > DENSE_MATRIX_LIMIT:
+                raise ValueError(
+                    f"A dense distance table of {len(node_ids):,} locations is too large.\n"
+                    "Use a dense matrix file or a smaller instance with this validator."
+                )
+            nodes = np.arange(len(node_ids))
+            table = legs[nodes[:, None], nodes[None, :]]
+            missing = np.isnan(table)
+            if missing.any():
+                raise ValueError(
+                    f"Distance matrix is missing {int(missing.sum())} location pairs "
+                    "between locations without coordinates\n"
+                    "Ensure your matrix includes all depots and clients from the CSV files."
+                )
+            return table
 
-    def _load_csv_matrix(self, matrix_file: str) -> None:
-        """Load distance matrix from CSV file."""
-        df = pd.read_csv(matrix_file)
+        if self.distance_engine is not None:
+            idx = self.distance_engine.indices(node_ids)
+            if self.distance_engine.is_dense and np.array_equal(idx, np.arange(len(idx))):
+                return self.distance_engine.distances
+            return self.distance_engine.leg_distances(idx[:, None], idx[None, :])
 
-        # Check for three-column format (Origin, Destination, Distance)
-        if "Origin" in df.columns and "Destination" in df.columns and "Distance" in df.columns:
-            # Validate distance column
-            if not pd.api.types.is_numeric_dtype(df["Distance"]):
-                raise ValueError("Distance column must contain numeric values")
+        if self.distance_method == "matrix":
+            idx = self.matrix_nodes()
+            if (idx < 0).any():
+                missing = [node_ids[k] for k in np.flatnonzero(idx < 0)[:5]]
+                raise ValueError(
+                    f"Distance matrix has no entries for: {', '.join(missing)}\n"
+                    "Ensure your matrix includes all depots and clients from the CSV files."
+                )
+            table = np.asarray(self.distance_matrix.distances[np.ix_(idx, idx)], dtype=float)
+            # Symmetric fallback for pairs only stored in the reverse direction
+            table = np.where(np.isnan(table), table.T, table)
+            np.fill_diagonal(table, np.nan_to_num(np.diag(table)))
+            missing_pairs = int(np.isnan(table).sum())
+            if missing_pairs:
+                raise ValueError(
+                    f"Distance matrix is missing {missing_pairs} location pairs\n"
+                    "Ensure your matrix includes all depots and clients from the CSV files."
+                )
+            return table
 
-            if (df["Distance"] < 0).any():
-                raise ValueError("Distance values cannot be negative")
+        if self.distance_method == "osrm":
+            self.prefetch_osrm_distances(
+                (a, b) for a in node_ids for b in node_ids if a != b
+            )
+        table = np.zeros((len(node_ids), len(node_ids)))
+        for i, a in enumerate(node_ids):
+            for j, b in enumerate(node_ids):
+                if i != j:
+                    table[i, j] = self.calculate_distance(a, b)
+        return table
+
+    def node_distances(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """
+        Distances between aligned arrays of node indices (rows of node_ids).
 
-            # Build matrix from three-column format
-            self.distance_matrix = {}
-            for _, row in df.iterrows():
-                origin = str(row["Origin"])
-                dest = str(row["Destination"])
-                distance = float(row["Distance"])
+        Only the requested legs are computed for coordinate methods and
+        sparse matrices, so it scales past the dense table limit.
+        """
+        if self.distance_engine is not None:
+            idx = self.distance_engine.indices(self.node_ids)
+            return self.distance_engine.leg_distances(idx[origins], idx[destinations])
+        if self.has_sparse_matrix():
+            return self.matrix_legs()[origins, destinations]
+        return self.distance_table()[origins, destinations]
 
-                if origin not in self.distance_matrix:
-                    self.distance_matrix[origin] = {}
+    def load_cache(self):
+        """Open the persistent distance cache."""
+        self.distance_cache = DistanceCache(
+            self.cache_file, max_entries=self.cache_max_entries
+        )
 
-                self.distance_matrix[origin][dest] = distance
+    def save_cache(self):
+        """Write new cache entries and recency updates to disk."""
+        if self.distance_cache is not None:
+            self.distance_cache.flush()
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss statistics of the distance cache (empty if unused)."""
+        if self.distance_cache is None:
+            return {}
+        return self.distance_cache.stats()
+
+    def _coordinates(self, loc) -> tuple:
+        node = self.nodes.lookup(loc)
+        if node < 0:
+            raise KeyError(f"Unknown location: {loc}")
+        return (float(self.nodes.latitude[node]), float(self.nodes.longitude[node]))
 
-        # Check for matrix format (first column is row labels)
-        else:
-            # First column is assumed to be row labels
-            row_labels = df.iloc[:, 0].astype(str).tolist()
-            col_labels = df.columns[1:].astype(str).tolist()
-
-            # Build matrix
-            self.distance_matrix = {}
-            for i, origin in enumerate(row_labels):
-                self.distance_matrix[origin] = {}
-                for j, dest in enumerate(col_labels):
-                    distance = float(df.iloc[i, j + 1])
-                    if distance < 0:
-                        raise ValueError(
-                            f"Distance {origin}→{dest} cannot be negative: {distance}"
-                        )
-                    self.distance_matrix[origin][dest] = distance
+    def load_distance_matrix(self, matrix_file: str) -> None:
+        """
+        Load distance matrix from JSON, CSV or binary NPZ file.
+
+        Args:
+            matrix_file: Path to distance matrix file (.json, .csv or .npz)
+
+        Raises:
+            ValueError: If file format is invalid or contains errors
+            FileNotFoundError: If file doesn't exist
+        """
+        self.distance_matrix, self.matrix_metadata = read_distance_matrix(
+            matrix_file, sparse=self.sparse_matrix
+        )
+        self._matrix_nodes = None
+        self._matrix_legs = None
+
+        print(f"Loaded distance matrix from {matrix_file}")
+        if "matrix_type" in self.matrix_metadata:
+            print(f"Matrix type: {self.matrix_metadata['matrix_type']}")
+        if self.has_sparse_matrix():
+            print(
+                f"Sparse matrix: {self.distance_matrix.nnz:,} stored distances; "
+                "other legs use the haversine formula"
+            )
 
     def normalize_location_id(self, loc_id: str) -> str:
         """
@@ -252,38 +428,25 @@ class SolutionValidator:
 
         Handles conversions:
         - Numeric depot IDs (1, 2, 3) → Standardized (CD01, CD02, CD03)
-        - Old depot IDs (CDA, CDB, CDC) → Standardized (CD01, CD02, CD03)
+        - Legacy depot letters (CDA, CDB, ...) → Standardized (CD01, CD02, ...)
         - Numeric client IDs → Standardized (C001, C002, C003, ...)
+        - Unpadded or lowercase IDs (c1, CD1, e2, P14) → Standardized
+          (C001, CD01, E002, P014), including stations (E) and tolls (P)
         - Already standardized IDs → Return as-is
 
+        Depot numbers and letters resolve through the node table, so they
+        follow the depots of the loaded instance.
+
         Args:
             loc_id: Location ID in any supported format
 
         Returns:
             Standardized location ID
         """
-        # Convert to string if needed
-        loc_id = str(loc_id)
-
-        # Handle depot conversions
-        depot_mappings = {
-            "1": "CD01",
-            "CDA": "CD01",
-            "2": "CD02",
-            "CDB": "CD02",
-            "3": "CD03",
-            "CDC": "CD03",
-        }
-
-        if loc_id in depot_mappings:
-            return depot_mappings[loc_id]
-
-        # Handle numeric client IDs (if all digits and doesn't start with C or CD)
-        if loc_id.isdigit():
-            return f"C{int(loc_id):03d}"
-
-        # Already standardized or unknown format - return as-is
-        return loc_id
+        node = self.nodes.index.get(loc_id)
+        if node is not None:
+            return self.nodes.ids[node]
+        return normalize_id(loc_id)
 
     def matrix_distance(self, loc1: str, loc2: str) -> float:
         """
@@ -309,25 +472,36 @@ class SolutionValidator:
         norm_loc1 = self.normalize_location_id(loc1)
         norm_loc2 = self.normalize_location_id(loc2)
 
-        # Try direct lookup
-        if norm_loc1 in self.distance_matrix and norm_loc2 in self.distance_matrix[norm_loc1]:
-            return self.distance_matrix[norm_loc1][norm_loc2]
-
-        # Try reverse for symmetric matrices
-        if norm_loc2 in self.distance_matrix and norm_loc1 in self.distance_matrix[norm_loc2]:
-            return self.distance_matrix[norm_loc2][norm_loc1]
+        matrix = self.distance_matrix
+        i = matrix.index.get(norm_loc1)
+        j = matrix.index.get(norm_loc2)
+
+        if i is not None and j is not None:
+            # Direct lookup, or the reverse pair for symmetric matrices
+            distance = matrix.pair_distances(np.array([i]), np.array([j]))[0]
+            if not np.isnan(distance):
+                return float(distance)
+
+        # Sparse matrices leave most pairs to the haversine formula
+        if not matrix.is_dense:
+            origin = self.nodes.lookup(loc1)
+            destination = self.nodes.lookup(loc2)
+            if origin >= 0 and destination >= 0:
+                distance = self.matrix_legs().item(origin, destination)
+                if not np.isnan(distance):
+                    return distance
 
         # Build helpful error message
-        available_origins = list(self.distance_matrix.keys())[:10]
+        available_origins = matrix.known_origins()[:10]
         error_msg = (
             f"Distance not found: {norm_loc1} → {norm_loc2}\n"
             f"  Original IDs: {loc1} → {loc2}\n"
         )
 
-        if norm_loc1 not in self.distance_matrix:
+        if not matrix.has_origin(norm_loc1):
             error_msg += f"  Origin '{norm_loc1}' not in matrix. Available origins: {available_origins}"
         else:
-            available_dests = list(self.distance_matrix[norm_loc1].keys())[:10]
+            available_dests = matrix.known_destinations(norm_loc1)[:10]
             error_msg += f"  Destination '{norm_loc2}' not available from '{norm_loc1}'. "
             error_msg += f"Available destinations: {available_dests}"
 
@@ -335,11 +509,8 @@ class SolutionValidator:
 
     def haversine_distance(self, loc1: str, loc2: str) -> float:
         """Calculate the distance between two locations using Haversine formula."""
-        p1 = self.locations[loc1]
-        p2 = self.locations[loc2]
-
-        lat1, lon1 = p1["latitude"], p1["longitude"]
-        lat2, lon2 = p2["latitude"], p2["longitude"]
+        lat1, lon1 = self._coordinates(loc1)
+        lat2, lon2 = self._coordinates(loc2)
 
         lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
 
@@ -357,189 +528,1124 @@ class SolutionValidator:
 
     def geopy_distance(self, loc1: str, loc2: str) -> float:
         """Calculate distance using GeoPy."""
-        p1 = self.locations[loc1]
-        p2 = self.locations[loc2]
+        # Imported on first use: geopy is slow to import and only needed here
+        from geopy.distance import geodesic
 
-        coord1 = (p1["latitude"], p1["longitude"])
-        coord2 = (p2["latitude"], p2["longitude"])
-
-        return geodesic(coord1, coord2).kilometers
+        return geodesic(self._coordinates(loc1), self._coordinates(loc2)).kilometers
 
     def osrm_distance(self, loc1: str, loc2: str) -> float:
-        """Calculate distance using OSRM API."""
-        p1 = self.locations[loc1]
-        p2 = self.locations[loc2]
+        """Calculate distance using the OSRM table service."""
+        # Legs from a prefetched solution are already cached (and counted)
+        coords = (self._coordinates(loc1), self._coordinates(loc2))
+        distance = self.distance_cache.peek("osrm", *coords)
+        if distance is None and (loc1, loc2) not in self.osrm_failed_legs:
+            self.prefetch_osrm_distances([(loc1, loc2)])
+            distance = self.distance_cache.peek("osrm", *coords)
+        if distance is not None:
+            return distance
+
+        print(f"OSRM API failed for {loc1} to {loc2}, falling back to Haversine")
+        return self.haversine_distance(loc1, loc2)
+
+    def prefetch_osrm_distances(self, legs: Iterable) -> None:
+        """
+        Resolve all uncached OSRM legs with batched table requests.
 
-        url = f"http://router.project-osrm.org/route/v1/driving/{p1['longitude']},{p1['latitude']};{p2['longitude']},{p2['latitude']}"
+        Resolved distances go into the distance cache, where osrm_distance
+        picks them up. Legs that OSRM cannot serve are not cached, are
+        remembered in osrm_failed_legs and fall back to Haversine when
+        requested.
 
-        try:
-            response = requests.get(url)
-            data = response.json()
+        Args:
+            legs: (origin, destination) location ID pairs
+        """
+        pending = set()
+        for leg in set(legs):
+            if self.nodes.lookup(leg[0]) < 0 or self.nodes.lookup(leg[1]) < 0:
+                continue
+            coords = (self._coordinates(leg[0]), self._coordinates(leg[1]))
+            if self.distance_cache.get("osrm", *coords) is None:
+                pending.add(leg)
+        if not pending:
+            return
+
+        node_ids = sorted({loc for leg in pending for loc in leg}, key=str)
+        node_index = {loc: k for k, loc in enumerate(node_ids)}
+        coordinates = [self._coordinates(loc) for loc in node_ids]
 
-            if "routes" in data and len(data["routes"]) > 0:
-                # Distance in meters, convert to kilometers
-                return data["routes"][0]["distance"] / 1000
-            else:
-                print(
-                    f"OSRM API failed for {loc1} to {loc2}, falling back to Haversine"
-                )
-                return self.haversine_distance(loc1, loc2)
-        except Exception as e:
+        try:
+            resolved = self.osrm_client.distances(
+                coordinates, [(node_index[a], node_index[b]) for a, b in pending]
+            )
+        except OSRMError as e:
             print(f"Error with OSRM API: {e}, falling back to Haversine")
-            return self.haversine_distance(loc1, loc2)
+            resolved = {}
+
+        self.distance_cache.put_many(
+            "osrm",
+            ((coordinates[i], coordinates[j], distance) for (i, j), distance in resolved.items()),
+        )
+        self.osrm_failed_legs.update(
+            (node_ids[i], node_ids[j])
+            for i, j in ((node_index[a], node_index[b]) for a, b in pending)
+            if (i, j) not in resolved
+        )
 
     def calculate_distance(self, loc1: str, loc2: str) -> float:
-        """Calculate distance using the selected method with caching."""
-        # If using matrix method, skip caching (matrix is already a lookup table)
+        """Calculate distance using the selected method."""
+        self.profiler.count("distance_calls." + self.distance_method)
+
+        # Matrix lookups need no caching (the matrix is already a lookup table)
         if self.distance_method == "matrix":
             return self.matrix_distance(loc1, loc2)
 
-        cache_key = f"{loc1}_{loc2}_{self.distance_method}"
-
-        # Check cache first
-        if cache_key in self.distance_cache:
-            return self.distance_cache[cache_key]
+        # Coordinate-based methods are served from the precomputed table
+        if self.distance_engine is not None:
+            return self.distance_engine.distance(loc1, loc2)
 
-        # Calculate distance based on method
-        if self.distance_method == "haversine":
-            distance = self.haversine_distance(loc1, loc2)
-        elif self.distance_method == "geopy":
-            distance = self.geopy_distance(loc1, loc2)
-        elif self.distance_method == "osrm":
-            distance = self.osrm_distance(loc1, loc2)
-        else:
-            raise ValueError(f"Unknown distance method: {self.distance_method}")
-
-        # Cache the result
-        self.distance_cache[cache_key] = distance
+        # Road distances go through the persistent cache
+        if self.distance_method == "osrm":
+            return self.osrm_distance(loc1, loc2)
 
-        return distance
+        raise ValueError(f"Unknown distance method: {self.distance_method}")
 
-    def _get_column_value(self, row, *column_names):
-        """Get value from row trying multiple column name variations."""
+    @staticmethod
+    def _resolve_column(df, *column_names) -> str:
+        """Return the first of several column name variations present in df."""
         for col_name in column_names:
-            if col_name in row.index:
-                return row[col_name]
+            if col_name in df.columns:
+                return col_name
         # If none found, raise error with all attempted names
         raise KeyError(f"None of these columns found: {column_names}")
 
-    def validate_solution(self) -> Dict:
-        """Validate the solution according to the specified requirements."""
+    @staticmethod
+    def _split_column(series) -> List[List[str]]:
+        """Split a hyphen-separated column into lists (blank cells give [""])."""
+        return [
+            ("" if isinstance(value, float) and math.isnan(value) else str(value)).split("-")
+            for value in series.tolist()
+        ]
+
+    def parse_solution(self, solution_df) -> Dict[str, list]:
+        """
+        Parse a solution table column-wise into per-route lists.
+
+        Handles the InitialLoad/InitLoad, ClientsServed/Clients and
+        DemandsSatisfied/DemandSatisfied column name variations. Without a
+        DepotId column the first stop of each route is taken as its depot.
+
+        Args:
+            solution_df: Solution in verification file format (Table or DataFrame)
+
+        Returns:
+            Dict of aligned lists: vehicle_id, depot_id, initial_load,
+            route_sequence, clients_served, demands_satisfied, vehicle_number
+        """
+        initial_load_col = self._resolve_column(solution_df, "InitialLoad", "InitLoad")
+        clients_served_col = self._resolve_column(solution_df, "ClientsServed", "Clients")
+        demands_col = self._resolve_column(
+            solution_df, "DemandsSatisfied", "DemandSatisfied"
+        )
+
+        vehicle_ids = [str(v) for v in solution_df["VehicleId"].tolist()]
+        route_sequences = self._split_column(solution_df["RouteSequence"])
+
+        # Formats without a DepotId column (Project B) start routes at their depot
+        if "DepotId" in solution_df.columns:
+            depot_ids = [str(d) for d in solution_df["DepotId"].tolist()]
+        else:
+            depot_ids = [route_sequence[0] for route_sequence in route_sequences]
+
+        return {
+            "vehicle_id": vehicle_ids,
+            "depot_id": depot_ids,
+            "initial_load": integer_column(solution_df[initial_load_col]).tolist(),
+            "route_sequence": route_sequences,
+            "clients_served": integer_column(solution_df[clients_served_col]).tolist(),
+            "demands_satisfied": [
+                [int(d) for d in demands if d]
+                for demands in self._split_column(solution_df[demands_col])
+            ],
+            # Standardized vehicle IDs use the "V" prefix (V001, V002, etc.)
+            "vehicle_number": [int(v.replace("V", "")) for v in vehicle_ids],
+        }
+
+    @staticmethod
+    def _report_invalid_locations(
+        vehicle_id: str, route_sequence: list, route_nodes: np.ndarray, errors: list
+    ) -> np.ndarray:
+        """
+        Report unknown stops leg by leg and return the mask of valid legs.
+
+        A leg is reported once, by its origin if that is unknown and by its
+        destination otherwise, so an unknown stop inside a route is reported
+        for both of its legs.
+        """
+        valid = (route_nodes[:-1] >= 0) & (route_nodes[1:] >= 0)
+        for k in np.flatnonzero(~valid):
+            invalid = route_sequence[k] if route_nodes[k] < 0 else route_sequence[k + 1]
+            errors.append(f"Route {vehicle_id} has invalid location: {invalid}")
+        return valid
+
+    def route_distance(
+        self, vehicle_id: str, route_sequence: list, errors: list, route_nodes=None
+    ) -> float:
+        """
+        Sum the leg distances of a route, recording invalid locations.
+
+        Legs touching an unknown location are reported and skipped. With a
+        precomputed distance table all valid legs are resolved in one array
+        lookup; other methods go through calculate_distance leg by leg.
+
+        Args:
+            vehicle_id: Vehicle ID used in error messages
+            route_sequence: Location IDs in visit order
+            errors: List that invalid-location errors are appended to
+            route_nodes: route_sequence already interned with nodes.indices
+
+        Returns:
+            Total route distance in kilometers
+        """
+        if route_nodes is None:
+            route_nodes = self.nodes.indices(route_sequence)
+        origins = route_nodes[:-1]
+        destinations = route_nodes[1:]
+        valid = self._report_invalid_locations(vehicle_id, route_sequence, route_nodes, errors)
+        origins = origins[valid]
+        destinations = destinations[valid]
+
+        self.profiler.count("route_legs", len(origins))
+
+        # Engine indices are node IDs (see build_distance_engine)
+        if self.distance_engine is not None:
+            if not len(origins):
+                return 0.0
+            return float(self.distance_engine.leg_distances(origins, destinations).sum())
+
+        if self.distance_method == "matrix" and self.distance_matrix is not None:
+            return self._matrix_route_distance(vehicle_id, origins, destinations, errors)
+
+        ids = self.nodes.ids
+        valid_legs = [(ids[i], ids[j]) for i, j in zip(origins.tolist(), destinations.tolist())]
+
+        total_distance = 0
+        for from_loc, to_loc in valid_legs:
+            try:
+                distance = self.calculate_distance(from_loc, to_loc)
+                total_distance += distance
+            except Exception as e:
+                errors.append(f"Route {vehicle_id} distance calculation error: {str(e)}")
+
+        return total_distance
+
+    def _matrix_route_distance(
+        self, vehicle_id: str, origin_nodes: np.ndarray, destination_nodes: np.ndarray, errors: list
+    ) -> float:
+        """
+        Sum route legs (node ID arrays) from a loaded matrix with one array lookup.
+
+        Legs missing in both directions go through matrix_distance so the
+        error message explains what is absent.
+        """
+        if not len(origin_nodes):
+            return 0.0
+
+        if self.has_sparse_matrix():
+            distances = self.matrix_legs()[origin_nodes, destination_nodes]
+        else:
+            matrix_nodes = self.matrix_nodes()
+            distances = self.distance_matrix.pair_distances(
+                matrix_nodes[origin_nodes], matrix_nodes[destination_nodes]
+            )
+
+        for k in np.flatnonzero(np.isnan(distances)):
+            try:
+                self.matrix_distance(
+                    self.nodes.ids[origin_nodes[k]], self.nodes.ids[destination_nodes[k]]
+                )
+            except Exception as e:
+                errors.append(f"Route {vehicle_id} distance calculation error: {str(e)}")
+
+        return float(np.nansum(distances))
+
+    def validate_solution(self, solution_df=None, save_cache: bool = True) -> Dict:
+        """
+        Validate the solution according to the specified requirements.
+
+        Routes are priced in the same pass when cost parameters are loaded.
+
+        Args:
+            solution_df: Solution to validate (defaults to the loaded solution file)
+            save_cache: Write the distance cache to disk after validating
+
+        Returns:
+            Dict with "feasible" flag, list of "errors" and, with cost
+            parameters, "costs" (see cost_model.summarize_costs)
+        """
+        if solution_df is None:
+            solution_df = self.solution_df
+        if solution_df is None:
+            raise ValueError("No solution loaded. Pass solution_df or a solution_file.")
+
+        result = self.merge_results([self.validate_chunk(solution_df)], solution_df)
+
+        # Save cache before returning (skip for precomputed distance tables)
+        if save_cache:
+            self.save_cache()
+
+        return result
+
+    def iter_validation(
+        self,
+        solution_file: str = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        max_errors: int = None,
+        include_routes: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Validate a solution file chunk by chunk, yielding results as they are found.
+
+        Only chunk_rows routes are in memory at a time; across chunks just the
+        summed result arrays (client visit counts) and cost totals are kept.
+        Coverage errors come last, after every route has been read.
+
+        Args:
+            solution_file: Solution CSV to stream (defaults to the configured file)
+            chunk_rows: Routes read and checked per chunk
+            max_errors: Stop after this many errors (coverage is then not checked)
+            include_routes: Also yield the cost breakdown of every route
+
+        Yields:
+            Event dicts, each with an "event" key:
+            - "error": message
+            - "route": vehicle_id, row and cost keys (include_routes only)
+            - "difference": vehicle_id, column, reported, computed
+            - "summary" (last): feasible, num_errors, num_routes (read so far),
+              stopped_early, total_cost and, with cost parameters, costs
+              (cost keys summed over the num_routes routes read);
+              with a sparse matrix also matrix_fallback_legs, and any
+              keys check_totals adds and, with report_gap, the "gap" to
+              the lower bounds (after a complete pass)
+        """
+        solution_file = solution_file or self.solution_file
+        summed = self.empty_totals()
+        cost_keys = ("distance_km", "time_min", *COST_COMPONENTS, "total")
+        totals = dict.fromkeys(cost_keys, 0.0)
+        num_errors = 0
+        num_routes = 0
+        fallback_legs = 0
+        stopped_early = False
+        checked = {}
+
+        def errors_left() -> bool:
+            return max_errors is None or num_errors < max_errors
+
+        try:
+            for chunk in self.read_table_chunks(solution_file, chunk_rows):
+                partial = self.validate_chunk(chunk)
+                fallback_legs += partial.get("fallback_legs", 0)
+                for error in partial["errors"]:
+                    if not errors_left():
+                        break
+                    num_errors += 1
+                    yield {"event": "error", "message": error}
+                # Costs cover every route read, including those of a stopping chunk
+                if self.has_costs():
+                    for route in partial["route_costs"]:
+                        for key in cost_keys:
+                            totals[key] += route[key]
+                if not errors_left():
+                    stopped_early = True
+                    num_routes += len(chunk)
+                    break
+
+                self.add_totals(summed, partial)
+                if self.has_costs():
+                    if include_routes:
+                        for route in partial["route_costs"]:
+                            yield {"event": "route", **route, "row": route["row"] + num_routes}
+                    differences = summarize_costs(partial["route_costs"], chunk)["differences"]
+                    for difference in differences:
+                        yield {"event": "difference", **difference}
+
+                num_routes += len(chunk)
+
+            if not stopped_early:
+                with self.profiler.phase("check_coverage"):
+                    checked = self.check_totals(summed)
+                    for error in checked.pop("errors"):
+                        if not errors_left():
+                            stopped_early = True
+                            break
+                        num_errors += 1
+                        yield {"event": "error", "message": error}
+        finally:
+            self.save_cache()
+
+        summary = {
+            "event": "summary",
+            "feasible": num_errors == 0,
+            "num_errors": num_errors,
+            "num_routes": num_routes,
+            "stopped_early": stopped_early,
+            "total_cost": totals["total"] if self.has_costs() else None,
+        }
+        if self.has_costs():
+            summary["costs"] = totals
+        if self.has_sparse_matrix():
+            summary["matrix_fallback_legs"] = fallback_legs
+        summary.update(checked)
+        if self.report_gap and not stopped_early:
+            summary["gap"] = self.solution_gap(num_routes, summary.get("costs"))
+        yield summary
+
+    def validate_chunk(self, solution_df, first_row: int = 0) -> Dict:
+        """validate_routes, through the route memo when one is enabled."""
+        if self.route_memo is None:
+            return self.validate_routes(solution_df, first_row)
+        with self.profiler.phase("route_memo"):
+            return self.route_memo.validate_routes(self, solution_df, first_row)
+
+    def memo_stats(self) -> Dict:
+        """Route memo statistics, or an empty dict when the memo is disabled."""
+        return self.route_memo.stats() if self.route_memo is not None else {}
+
+    def bound_table(self):
+        """
+        Node-indexed distance table for the lower bounds, or None.
+
+        Only tables that are already dense are used; sparse matrices, OSRM
+        and instances above DENSE_MATRIX_LIMIT locations return None and are
+        bounded from the coordinates (see lower_bounds.py).
+        """
+        if self.distance_engine is not None:
+            return self.distance_table() if self.distance_engine.is_dense else None
+        if self.distance_method == "matrix" and not self.has_sparse_matrix():
+            try:
+                return self.distance_table()
+            except ValueError:
+                return None
+        return None
+
+    def lower_bound(self) -> Dict:
+        """Vehicle, distance and cost lower bounds of the instance (see lower_bounds.py)."""
+        if self._lower_bound is None:
+            with self.profiler.phase("lower_bound"):
+                self._lower_bound = instance_bound(self)
+        return self._lower_bound
+
+    def solution_gap(self, num_routes: int, costs: Dict = None) -> Dict:
+        """
+        Quality gap of a solution to the instance lower bounds.
+
+        Args:
+            num_routes: Routes of the solution
+            costs: Summed cost keys of the solution (distance_km, total), if priced
+
+        Returns:
+            Dict as returned by lower_bounds.quality_gap
+        """
+        return quality_gap(
+            self.lower_bound(),
+            num_routes,
+            distance_km=costs["distance_km"] if costs else None,
+            total_cost=costs["total"] if costs else None,
+        )
+
+    def has_costs(self) -> bool:
+        """Whether routes are priced (a parameters file was loaded)."""
+        return self.cost_parameters is not None
+
+    def merge_results(self, partials: Iterable[Dict], solution_df) -> Dict:
+        """
+        Combine validate_routes results of consecutive route chunks.
+
+        Route errors keep their row order, then the coverage checks run on
+        the summed visit counts, so the result matches a single pass.
+
+        Args:
+            partials: validate_routes results in row order
+            solution_df: The whole solution (for reported cost columns)
+
+        Returns:
+            Result dict as returned by validate_solution
+        """
         errors = []
-        visited_clients = set()
+        totals = self.empty_totals()
+        route_costs = []
+        fallback_legs = 0
+        for partial in partials:
+            errors.extend(partial["errors"])
+            self.add_totals(totals, partial)
+            route_costs.extend(partial["route_costs"])
+            fallback_legs += partial.get("fallback_legs", 0)
+
+        with self.profiler.phase("check_coverage"):
+            checked = self.check_totals(totals)
+        errors.extend(checked.pop("errors"))
+
+        result = {"feasible": len(errors) == 0, "errors": errors, **checked}
+        if self.has_sparse_matrix():
+            result["matrix_fallback_legs"] = fallback_legs
+        if self.has_costs():
+            with self.profiler.phase("summarize_costs"):
+                result["costs"] = summarize_costs(route_costs, solution_df)
+        if self.report_gap:
+            costs = result.get("costs")
+            result["gap"] = self.solution_gap(len(solution_df), costs["total"] if costs else None)
+        return result
+
+    def empty_totals(self) -> Dict[str, np.ndarray]:
+        """Summed result arrays before any route is checked (see summed_results)."""
+        return {"visits": np.zeros(len(self.client_ids), dtype=int)}
+
+    def add_totals(self, totals: Dict[str, np.ndarray], partial: Dict) -> None:
+        """Add the summed_results arrays of a validate_routes result to totals."""
+        for key in self.summed_results:
+            totals[key] = totals[key] + partial[key] if key in totals else partial[key]
+
+    def check_totals(self, totals: Dict[str, np.ndarray]) -> Dict:
+        """
+        Cross-route checks on the result arrays summed over every route.
 
-        for idx, route in self.solution_df.iterrows():
-            vehicle_id = route["VehicleId"]
-            depot_id = route["DepotId"]
+        Args:
+            totals: Arrays of summed_results summed across route chunks
 
-            # Handle column name variations for InitialLoad
-            initial_load_str = self._get_column_value(route, "InitialLoad", "InitLoad")
-            initial_load = int(initial_load_str)
+        Returns:
+            Dict with the "errors" found; subclasses may add result keys
+        """
+        return {"errors": self.coverage_errors(totals["visits"])}
 
-            route_sequence = route["RouteSequence"].split("-")
+    def coverage_errors(self, visits: np.ndarray) -> List[str]:
+        """Errors for clients that no route visits."""
+        return [
+            f"Client {self.client_ids[k]} was not visited" for k in np.flatnonzero(visits == 0)
+        ]
 
-            # Handle column name variations for ClientsServed
-            clients_served_str = self._get_column_value(route, "ClientsServed", "Clients")
-            clients_served = int(clients_served_str)
+    def validate_routes(self, solution_df, first_row: int = 0, per_route: bool = False) -> Dict:
+        """
+        Check every route of a solution, or of a chunk of its rows.
 
-            # Handle column name variations for DemandsSatisfied
-            demands_str = self._get_column_value(route, "DemandsSatisfied", "DemandSatisfied")
-            demands_satisfied = [int(d) for d in demands_str.split("-")]
+        Coverage across routes is left to merge_results, so chunks can be
+        checked independently (see parallel.py). All stops of the chunk are
+        interned into node IDs at once; demand, visit and duplicate checks
+        and, with a distance table, route distances run on the flat node
+        array, and the route loop only reports what they flag.
 
-            # Fix: Use "V" prefix instead of "VEH" to match standardized format (V001, V002, etc.)
-            vehicle_number = int(vehicle_id.replace("V", ""))
-            vehicle_spec = self.vehicle_specs[vehicle_number]
+        Args:
+            solution_df: Solution rows to check
+            first_row: Position of the first row in the whole solution
+            per_route: Also return each route's errors and summed-array
+                contributions as "route_results" (see route_memo.py)
 
-            # Check 1: Route starts and ends at depot
-            if route_sequence[0] != depot_id or route_sequence[-1] != depot_id:
-                errors.append(
-                    f"Route {vehicle_id} does not start and end at depot {depot_id}"
+        Returns:
+            Dict with route "errors", client "visits" (counts aligned with
+            client_ids) and any other summed_results arrays, "route_costs"
+            and "fallback_legs" (legs a sparse matrix left to the haversine
+            formula)
+        """
+        errors = []
+        nodes = self.nodes
+        route_costs = []
+        profiler = self.profiler
+        fallback_start = self.fallback_legs()
+
+        with profiler.phase("parse_solution"):
+            routes = self.parse_solution(solution_df)
+            stops = RouteStops(nodes, routes["route_sequence"], routes["demands_satisfied"])
+
+        # Fetch every road distance the solution needs in a few batched requests
+        if self.distance_method == "osrm":
+            with profiler.phase("osrm_prefetch"):
+                self.prefetch_osrm_distances(
+                    leg
+                    for route_sequence in routes["route_sequence"]
+                    for leg in zip(route_sequence, route_sequence[1:])
                 )
 
+        with profiler.phase("check_depot_capacity"):
+            off_depot = stops.off_depot(routes["depot_id"])
+
+        # Route distances in one table lookup (engine indices are node IDs)
+        route_km = None
+        if self.distance_engine is not None:
+            with profiler.phase("check_range"):
+                route_km, num_legs = stops.route_distances(self.distance_engine)
+                profiler.count("route_legs", num_legs)
+        route_distances = np.zeros(len(routes["vehicle_id"]))
+        error_ends = []
+
+        with profiler.phase("check_demands"):
+            visit_routes, visited = stops.visited_clients(self.client_nodes)
+            demand_errors = stops.demand_errors()
+            duplicates = stops.duplicates()
+            route_clients = stops.clients_per_route()
+
+        route_rows = zip(
+            routes["vehicle_id"],
+            routes["depot_id"],
+            routes["initial_load"],
+            routes["route_sequence"],
+            routes["clients_served"],
+            routes["vehicle_number"],
+        )
+
+        for r, (
+            vehicle_id,
+            depot_id,
+            initial_load,
+            route_sequence,
+            clients_served,
+            vehicle_number,
+        ) in enumerate(route_rows):
+            # Routes of a vehicle missing from vehicles.csv skip the vehicle checks
+            vehicle_spec = self.vehicle_specs.get(vehicle_number)
+            if vehicle_spec is None:
+                errors.append(f"Route {vehicle_id}: unknown vehicle")
+
+            # Check 1: Route starts and ends at depot
+            if off_depot[r]:
+                errors.append(f"Route {vehicle_id} does not start and end at depot {depot_id}")
+
             # Check 2: Vehicle capacity
-            if initial_load > vehicle_spec["capacity"]:
+            if vehicle_spec is not None and initial_load > vehicle_spec["capacity"]:
                 errors.append(
                     f"Route {vehicle_id} exceeds capacity: {initial_load} > {vehicle_spec['capacity']}"
                 )
 
             # Check 3: Route range
-            total_distance = 0
-            for i in range(len(route_sequence) - 1):
-                from_loc = route_sequence[i]
-                to_loc = route_sequence[i + 1]
+            with profiler.phase("check_range"):
+                if route_km is None:
+                    total_distance = self.route_distance(
+                        vehicle_id, route_sequence, errors, stops.route_nodes(r)
+                    )
+                else:
+                    if stops.has_unknown[r]:
+                        self._report_invalid_locations(
+                            vehicle_id, route_sequence, stops.route_nodes(r), errors
+                        )
+                    total_distance = float(route_km[r])
+                route_distances[r] = total_distance
 
-                # Check if locations exist before calculating distance
-                if from_loc not in self.locations:
+                if vehicle_spec is not None and total_distance > vehicle_spec["range"]:
                     errors.append(
-                        f"Route {vehicle_id} has invalid location: {from_loc}"
+                        f"Route {vehicle_id} exceeds range: {total_distance:.1f} > {vehicle_spec['range']}"
                     )
-                    continue
-                if to_loc not in self.locations:
-                    errors.append(f"Route {vehicle_id} has invalid location: {to_loc}")
-                    continue
 
-                try:
-                    distance = self.calculate_distance(from_loc, to_loc)
-                    total_distance += distance
-                except Exception as e:
+            if self.cost_parameters is not None and vehicle_spec is not None:
+                route_costs.append(
+                    {
+                        "vehicle_id": vehicle_id,
+                        "row": first_row + r,
+                        **self.route_cost_parameters(vehicle_number).route_costs(total_distance),
+                    }
+                )
+
+            # Check 4: Demand satisfaction, duplicate visits and clients_served
+            for stop, actual, expected in demand_errors.get(r, ()):
+                if actual is None:
                     errors.append(
-                        f"Route {vehicle_id} distance calculation error: {str(e)}"
+                        f"Route {vehicle_id} has missing demand value for client {route_sequence[stop]}"
                     )
+                else:
+                    errors.append(
+                        f"Route {vehicle_id} has incorrect demand for {route_sequence[stop]}: {actual} != {expected}"
+                    )
+
+            if duplicates[r]:
+                errors.append(f"Route {vehicle_id} has duplicate client visits")
 
-            if total_distance > vehicle_spec["range"]:
+            if route_clients[r] != clients_served:
                 errors.append(
-                    f"Route {vehicle_id} exceeds range: {total_distance:.1f} > {vehicle_spec['range']}"
+                    f"Route {vehicle_id} clients_served mismatch: {route_clients[r]} != {clients_served}"
                 )
+            error_ends.append(len(errors))
+
+        # Project checks over the whole chunk; their errors follow each
+        # route's own errors, so the order does not depend on chunking
+        route_errors, route_sums = self.check_routes(routes, stops, route_distances)
+        route_sums["visits"] = (visit_routes, visited, None)
+        if route_errors:
+            by_route = [
+                errors[start:end] + route_errors.get(r, [])
+                for r, (start, end) in enumerate(zip([0] + error_ends, error_ends))
+            ]
+            errors = [error for route in by_route for error in route]
+            error_ends = np.cumsum([len(route) for route in by_route]).tolist()
+
+        fallback_legs = self.fallback_legs() - fallback_start
+        profiler.count("matrix_fallback_legs", fallback_legs)
+        result = {
+            "errors": errors,
+            "route_costs": route_costs,
+            "fallback_legs": fallback_legs,
+            **self.sum_routes(route_sums),
+        }
+        if per_route:
+            result["route_results"] = split_route_results(
+                errors, error_ends, route_sums, len(route_distances)
+            )
+        return result
 
-            # Check 4: Track visited clients and demand satisfaction
-            client_idx = 0
-            for i, loc in enumerate(route_sequence):
-                # Only count locations that start with C and are actual clients (not depots)
-                if loc.startswith("C") and loc not in ["CDA", "CDB", "CDC"]:
-                    if client_idx >= len(demands_satisfied):
-                        errors.append(
-                            f"Route {vehicle_id} has missing demand value for client {loc}"
-                        )
-                        continue
+    def sum_routes(self, route_sums: Dict[str, tuple]) -> Dict[str, np.ndarray]:
+        """
+        Sum per-route contributions into summed_results arrays.
 
-                    visited_clients.add(loc)
-                    expected_demand = self.client_demands.get(loc, 0)
-                    actual_demand = demands_satisfied[client_idx]
+        Args:
+            route_sums: Array name mapped to (route, position, weight)
+                arrays; weight None adds 1 per entry
 
-                    if actual_demand != expected_demand:
-                        errors.append(
-                            f"Route {vehicle_id} has incorrect demand for {loc}: {actual_demand} != {expected_demand}"
-                        )
+        Returns:
+            Array name mapped to an array shaped like its empty_totals entry
+        """
+        empty = self.empty_totals()
+        return {
+            key: np.bincount(positions, weights, minlength=len(empty[key])).astype(
+                empty[key].dtype, copy=False
+            )
+            for key, (_, positions, weights) in route_sums.items()
+        }
 
-                    client_idx += 1
+    def serviceable_clients(self, vehicle_number: int) -> np.ndarray:
+        """Whether the vehicle may serve each client (aligned with client_ids)."""
+        return np.ones(len(self.client_ids), dtype=bool)
 
-            # Check for duplicate client visits
-            route_clients = [
-                loc
-                for loc in route_sequence
-                if loc.startswith("C") and loc not in ["CDA", "CDB", "CDC"]
-            ]
-            if len(route_clients) != len(set(route_clients)):
-                errors.append(f"Route {vehicle_id} has duplicate client visits")
+    def route_cost_parameters(self, vehicle_number: int) -> CostParameters:
+        """Objective coefficients of a vehicle (one set for the whole fleet)."""
+        return self.cost_parameters
 
-            # Verify clients_served count
-            if len(route_clients) != clients_served:
-                errors.append(
-                    f"Route {vehicle_id} clients_served mismatch: {len(route_clients)} != {clients_served}"
-                )
+    def cost_profiles(self) -> Dict[str, CostParameters]:
+        """Objective coefficients by vehicle type ("" for the whole fleet)."""
+        return {"": self.cost_parameters}
+
+    def route_cost_profile(self, vehicle_number: int) -> str:
+        """cost_profiles key a vehicle is priced with."""
+        return ""
+
+    def cost_sweep(self, result: Dict, solution_df=None) -> CostSweep:
+        """
+        Per-route cost features of a validated solution, for sensitivity sweeps.
+
+        Args:
+            result: validate_solution result with "costs"
+            solution_df: The validated solution (defaults to the loaded solution file)
+
+        Returns:
+            CostSweep over the priced routes (see sensitivity.py)
+        """
+        if "costs" not in result:
+            raise ValueError("Cost sensitivity needs priced routes; load a parameters file.")
+        if solution_df is None:
+            solution_df = self.solution_df
+
+        routes = result["costs"]["routes"]
+        vehicle_numbers = self.parse_solution(solution_df)["vehicle_number"]
+        return CostSweep(
+            self.cost_profiles(),
+            [self.route_cost_profile(vehicle_numbers[route["row"]]) for route in routes],
+            routes,
+            fuel_from_records=self.fuel_from_records,
+        )
+
+    def check_routes(
+        self, routes: Dict[str, list], stops: RouteStops, route_km: np.ndarray
+    ) -> Tuple[Dict[int, List[str]], Dict[str, tuple]]:
+        """
+        Project-specific checks over all routes of a chunk at once.
+
+        Runs after the per-route checks of validate_routes. Contributions
+        returned for a summed_results array are summed per chunk (see
+        sum_routes) and across chunks for check_totals.
+
+        Args:
+            routes: parse_solution lists of the chunk
+            stops: The chunk's stops interned into node IDs
+            route_km: Distance of each route in kilometers
+
+        Returns:
+            (errors by route position in the chunk, array name mapped to
+            (route, position, weight) contributions); nothing here
+        """
+        return {}, {}
+
+    def validate_batch(self, solution_files: Iterable[str]) -> Iterator[Dict]:
+        """
+        Validate many solution files against the already loaded instance.
 
-        # Check 5: All clients visited
-        all_clients = set(self.client_demands.keys())
-        missing_clients = all_clients - visited_clients
-        if missing_clients:
-            for client in missing_clients:
-                errors.append(f"Client {client} was not visited")
+        The instance data and distance structures are reused for every file and
+        the distance cache is written once, after the last file.
 
-        # Save cache before returning (skip if using matrix method)
-        if self.distance_method != "matrix":
+        Args:
+            solution_files: Paths to solution CSV files
+
+        Yields:
+            Dict per file with "solution_file", "feasible", "num_errors",
+            "errors" and "total_cost" (None without cost parameters)
+        """
+        try:
+            for solution_file in solution_files:
+                yield self.batch_entry(solution_file)
+        finally:
             self.save_cache()
 
-        return {"feasible": len(errors) == 0, "errors": errors}
+    def batch_entry(self, solution_file: str) -> Dict:
+        """Validate one solution file into a validate_batch result row."""
+        try:
+            solution_df = self.read_table(solution_file)
+            result = self.validate_solution(solution_df, save_cache=False)
+        except Exception as e:
+            result = {
+                "feasible": False,
+                "errors": [f"Could not validate {solution_file}: {str(e)}"],
+            }
+
+        costs = result.get("costs")
+        entry = {
+            "solution_file": solution_file,
+            "feasible": result["feasible"],
+            "num_errors": len(result["errors"]),
+            "errors": result["errors"],
+            "total_cost": costs["total"]["total"] if costs else None,
+        }
+        if "gap" in result:
+            entry["cost_gap"] = result["gap"]["cost_gap"]
+        return entry
+
+
+def resolve_solution_files(pattern: str) -> List[str]:
+    """
+    Expand a --solutions argument into a sorted list of solution files.
+
+    Args:
+        pattern: Directory (all *.csv inside), glob pattern, or single file
+
+    Returns:
+        Sorted list of matching file paths
+
+    Raises:
+        FileNotFoundError: If nothing matches
+    """
+    if os.path.isdir(pattern):
+        files = glob.glob(os.path.join(pattern, "*.csv"))
+    else:
+        files = glob.glob(pattern, recursive=True)
+
+    if not files:
+        raise FileNotFoundError(
+            f"No solution files match: {pattern}\n"
+            "Provide a directory of .csv files or a glob such as 'runs/*.csv'."
+        )
+
+    return sorted(files)
+
+
+def write_batch_results(results: Iterable[Dict], output_file: str = None) -> Dict:
+    """
+    Stream batch results to JSON Lines or CSV and count feasible solutions.
+
+    The format follows the output extension (.csv, otherwise JSON Lines).
+    Without an output file one summary line per solution is printed.
+
+    Args:
+        results: Per-file results from SolutionValidator.validate_batch
+        output_file: Destination path, or None to print to stdout
+
+    Returns:
+        Dict with "total" and "feasible" counts
+    """
+    summary = {"total": 0, "feasible": 0}
+    fieldnames = ["solution_file", "feasible", "num_errors", "errors", "total_cost", "cost_gap"]
+
+    out = open(output_file, "w", newline="") if output_file else None
+    try:
+        writer = None
+        if out and output_file.lower().endswith(".csv"):
+            writer = csv.DictWriter(out, fieldnames=fieldnames)
+            writer.writeheader()
+
+        for result in results:
+            summary["total"] += 1
+            summary["feasible"] += int(result["feasible"])
+
+            if writer:
+                writer.writerow({**result, "errors": " | ".join(result["errors"])})
+            elif out:
+                out.write(json.dumps(result) + "\n")
+            else:
+                status = "FEASIBLE" if result["feasible"] else "INFEASIBLE"
+                cost = result.get("total_cost")
+                cost_note = f", cost {cost:,.0f}" if cost is not None else ""
+                if result.get("cost_gap") is not None:
+                    cost_note += f", gap {result['cost_gap']:.1%}"
+                print(
+                    f"{result['solution_file']}: {status} "
+                    f"({result['num_errors']} errors{cost_note})"
+                )
+    finally:
+        if out:
+            out.close()
+
+    return summary
+
+
+def add_distance_arguments(
+    parser: argparse.ArgumentParser, solution_files: bool = True
+) -> None:
+    """
+    Add the distance method, matrix, OSRM, cache and execution options to a CLI parser.
+
+    Args:
+        parser: Parser to extend
+        solution_files: Also add the options for validating solution files
+            (--workers, --stream, --chunk-rows, --max-errors)
+    """
+    parser.add_argument(
+        "--method",
+        type=str,
+        choices=["haversine", "geopy", "osrm", "matrix"],
+        default="haversine",
+        help="Distance calculation method",
+    )
+    parser.add_argument(
+        "--matrix",
+        type=str,
+        default=None,
+        help="Path to distance matrix file (.json, .csv or .npz). Required when --method matrix is used.",
+    )
+    parser.add_argument(
+        "--sparse-matrix",
+        action="store_true",
+        help="Read a JSON/CSV matrix that lists only some pairs (e.g. k nearest) into sparse "
+        "arrays; unlisted legs use the haversine distance (sparse .npz files are detected)",
+    )
+    parser.add_argument(
+        "--osrm-url",
+        type=str,
+        default=DEFAULT_OSRM_URL,
+        help=f"OSRM server for --method osrm (default: {DEFAULT_OSRM_URL})",
+    )
+    parser.add_argument(
+        "--osrm-budget",
+        type=int,
+        default=None,
+        help="Maximum OSRM HTTP requests per run; unresolved legs fall back to Haversine",
+    )
+    parser.add_argument(
+        "--osrm-timeout",
+        type=float,
+        default=10.0,
+        help="Timeout in seconds for each OSRM request",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default="distance_cache.sqlite",
+        help="Path to SQLite distance cache (used by --method osrm)",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="Least recently used cache entries beyond this limit are evicted",
+    )
+    parser.add_argument(
+        "--route-memo",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Reuse the results of up to N routes already seen in earlier solutions "
+        "(batch mode and the validation server; 0 disables the memo)",
+    )
+    parser.add_argument(
+        "--gap",
+        action="store_true",
+        help="Report the gap of each solution to lower bounds on its vehicles, "
+        "distance and cost (minimum trips, spanning tree plus depot returns)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Write phase timings, counters, cache and OSRM statistics to this JSON file "
+        "(phases run in --workers processes are not included)",
+    )
+    if not solution_files:
+        return
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for batch mode and large solutions (0: all CPUs)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Validate the solution in chunks with bounded memory, printing one JSON "
+        "event per line (errors, differences, summary); --verbose adds route costs",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help=f"Routes per chunk in --stream mode (default: {DEFAULT_CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        help="With --stream, stop after this many errors",
+    )
+
+
+def add_sweep_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the cost sensitivity options (see sensitivity.py) to a CLI parser."""
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="NAME=VALUES",
+        help="Price the solution under every combination of these parameter values, "
+        "e.g. C_dist=2000:3000:11 or 'fuel_efficiency@small van=35,40,45' (repeatable)",
+    )
+    parser.add_argument(
+        "--sweep-ranges",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Also sweep every parameter given as a _min/_max range, with N values each",
+    )
+    parser.add_argument(
+        "--sweep-output",
+        type=str,
+        default=None,
+        help="Write the swept scenarios (parameter values, cost components, total) to this CSV",
+    )
+
+
+def check_distance_arguments(parser: argparse.ArgumentParser, args) -> None:
+    """Reject inconsistent distance options parsed by add_distance_arguments."""
+    # Validate matrix argument
+    if args.method == "matrix" and not args.matrix:
+        parser.error("--matrix argument is required when using --method matrix")
+
+    if args.matrix and args.method != "matrix":
+        print(
+            "WARNING: --matrix provided but method is not 'matrix'. Matrix file will be ignored.\n"
+        )
+    if args.sparse_matrix and args.method != "matrix":
+        parser.error("--sparse-matrix requires --method matrix")
+
+    stream = getattr(args, "stream", False)
+    if getattr(args, "max_errors", None) is not None and not stream:
+        parser.error("--max-errors requires --stream")
+    if stream and getattr(args, "solutions", None):
+        parser.error("--stream validates one solution; it cannot be combined with --solutions")
+    if getattr(args, "chunk_rows", 1) < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.route_memo < 0:
+        parser.error("--route-memo must be 0 or more")
+
+    sweeping = getattr(args, "sweep", None) or getattr(args, "sweep_ranges", None)
+    if sweeping and (stream or getattr(args, "solutions", None)):
+        parser.error("--sweep and --sweep-ranges price one solution; drop --stream and --solutions")
+    if getattr(args, "sweep_ranges", None) is not None and args.sweep_ranges < 1:
+        parser.error("--sweep-ranges must be at least 1")
+    if getattr(args, "sweep_output", None) and not sweeping:
+        parser.error("--sweep-output requires --sweep or --sweep-ranges")
+
+
+def distance_options(args) -> Dict:
+    """Validator keyword arguments for the options of add_distance_arguments."""
+    return {
+        "distance_method": args.method,
+        "cache_file": args.cache,
+        "cache_max_entries": args.cache_max_entries,
+        "matrix_file": args.matrix,
+        "sparse_matrix": args.sparse_matrix,
+        "osrm_url": args.osrm_url,
+        "osrm_request_budget": args.osrm_budget,
+        "osrm_timeout": args.osrm_timeout,
+        "route_memo": args.route_memo,
+        "report_gap": args.gap,
+        "profiler": Profiler() if args.profile else None,
+    }
+
+
+def write_profile(args, validator: SolutionValidator) -> None:
+    """Write the validator's profile to --profile, if requested."""
+    if args.profile:
+        validator.profiler.write(args.profile, validator)
+        print(f"Profile written to: {args.profile}")
+
+
+def print_result(result: Dict, validator: SolutionValidator, verbose: bool = False) -> None:
+    """Print the objective breakdown, feasibility verdict and errors of a result."""
+    if "costs" in result:
+        print_costs(result["costs"])
+
+    if "matrix_fallback_legs" in result:
+        print(
+            f"\nSparse matrix: {result['matrix_fallback_legs']:,} legs not stored in the "
+            "matrix used the haversine distance"
+        )
+
+    if "gap" in result:
+        print_gap(result["gap"])
+
+    if result["feasible"]:
+        print("\n✓ SOLUTION IS FEASIBLE!")
+        print("All routes satisfy the requirements.")
+    else:
+        print("\n✗ SOLUTION IS INFEASIBLE!")
+        print("Errors found:")
+        for error in result["errors"]:
+            print(f"  - {error}")
+
+    if verbose:
+        stats = validator.cache_stats()
+        if stats:
+            print(
+                f"\nDistance cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} entries, "
+                f"{stats['evictions']} evicted"
+            )
+        print_memo_stats(validator)
+        print("\nValidation completed successfully!")
+
+
+def run_sweep(args, validator: SolutionValidator, result: Dict) -> None:
+    """Price the validated solution under the --sweep and --sweep-ranges scenarios."""
+    if not (args.sweep or args.sweep_ranges):
+        return
+    if "costs" not in result:
+        print(f"\nNo cost sensitivity: {args.parameters} was not found")
+        return
+
+    start = time.perf_counter()
+    sweep = validator.cost_sweep(result)
+    axes = [sweep.resolve(parse_axis(spec), args.parameters) for spec in args.sweep]
+    unused = []
+    if args.sweep_ranges:
+        ranges, unused = range_axes(args.parameters, sweep, args.sweep_ranges)
+        swept = {axis.name for axis in axes}
+        axes += [axis for axis in ranges if axis.name not in swept]
+    scenarios = sweep.run(axes)
+    print_sweep(scenarios, result["costs"]["total"]["total"], time.perf_counter() - start, unused)
+
+    if args.sweep_output:
+        write_sweep(scenarios, args.sweep_output)
+        print(f"Scenarios written to: {args.sweep_output}")
+
+
+def print_memo_stats(validator: SolutionValidator) -> None:
+    """Print the route memo hit rate, if the memo is enabled."""
+    stats = validator.memo_stats()
+    if stats:
+        print(
+            f"\nRoute memo: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} routes, "
+            f"{stats['evictions']} evicted"
+        )
 
 
 def main():
@@ -550,52 +1656,70 @@ def main():
 Distance Calculation Methods:
   haversine : Great-circle distance (fast, approximate)
   geopy     : Geodesic distance (accurate, slower)
-  osrm      : Road network distance via OSRM API (realistic, requires internet)
+  osrm      : Road network distance via the OSRM table service (realistic, requires
+              internet or a local server given with --osrm-url)
   matrix    : Precomputed distance matrix from file (fastest, requires --matrix)
+              (.json, .csv, or memory-mapped .npz written by matrix_io.py; sparse
+              k-nearest matrices fall back to haversine for the pairs they omit)
 
 Examples:
   python base_case_verification.py --method haversine
   python base_case_verification.py --method matrix --matrix distances.json
   python base_case_verification.py --solution verificacion_caso1.csv --verbose
+  python base_case_verification.py --solutions "runs/*.csv" --output results.jsonl
+  python base_case_verification.py --solutions "runs/*.csv" --workers 0
+  python base_case_verification.py --profile profile.json
+  python base_case_verification.py --solution huge.csv --stream --max-errors 10
+  python base_case_verification.py --sweep fuel_price=14000:18000:9 --sweep-ranges 5
         """,
     )
     parser.add_argument(
-        "--method",
+        "--solution",
         type=str,
-        choices=["haversine", "geopy", "osrm", "matrix"],
-        default="haversine",
-        help="Distance calculation method",
+        default="verificacion_caso1.csv",
+        help="Path to solution file (default: verificacion_caso1.csv, fallback: solution.csv)",
     )
     parser.add_argument(
-        "--matrix",
+        "--solutions",
         type=str,
         default=None,
-        help="Path to distance matrix file (.json or .csv). Required when --method matrix is used.",
+        help="Batch mode: directory or glob of solution files validated in one process",
     )
     parser.add_argument(
-        "--solution",
+        "--output",
         type=str,
-        default="verificacion_caso1.csv",
-        help="Path to solution file (default: verificacion_caso1.csv, fallback: solution.csv)",
+        default=None,
+        help="Batch mode result table (.jsonl or .csv). Default: print one line per file",
     )
     parser.add_argument(
-        "--cache",
+        "--parameters",
         type=str,
-        default="distance_cache.json",
-        help="Path to cache file (ignored when using matrix method)",
+        default="parameters_base.csv",
+        help="Cost parameters file; routes are priced when it exists",
     )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=DEFAULT_SPEED,
+        help=f"Average speed in km/h for route times (default: {DEFAULT_SPEED:g})",
+    )
+    add_distance_arguments(parser)
+    add_sweep_arguments(parser)
     parser.add_argument("--verbose", action="store_true", help="Show detailed output")
 
     args = parser.parse_args()
+    check_distance_arguments(parser, args)
 
-    # Validate matrix argument
-    if args.method == "matrix" and not args.matrix:
-        parser.error("--matrix argument is required when using --method matrix")
+    if args.output and not args.solutions:
+        parser.error("--output requires --solutions")
 
-    if args.matrix and args.method != "matrix":
-        print(
-            "WARNING: --matrix provided but method is not 'matrix'. Matrix file will be ignored.\n"
-        )
+    if args.solutions:
+        run_batch(args, parameters_file=args.parameters, speed=args.speed)
+        return
+
+    if args.stream:
+        run_stream(args, args.solution, parameters_file=args.parameters, speed=args.speed)
+        return
 
     try:
         print(
@@ -604,35 +1728,99 @@ Examples:
 
         if args.method == "matrix":
             print(f"Using distance matrix from: {args.matrix}")
-        else:
-            print("Note: TotalDistance, TotalTime, and FuelCost columns are ignored")
 
         print(f"Reading solution from: {args.solution}\n")
 
         validator = SolutionValidator(
-            distance_method=args.method,
-            cache_file=args.cache,
-            matrix_file=args.matrix,
+            **distance_options(args),
             solution_file=args.solution,
+            parameters_file=args.parameters,
+            speed=args.speed,
         )
-        result = validator.validate_solution()
-
-        if result["feasible"]:
-            print("\n✓ SOLUTION IS FEASIBLE!")
-            print("All routes satisfy the requirements.")
-        else:
-            print("\n✗ SOLUTION IS INFEASIBLE!")
-            print("Errors found:")
-            for error in result["errors"]:
-                print(f"  - {error}")
+        with ParallelValidator(validator, args.workers) as parallel:
+            result = parallel.validate_solution()
 
-        if args.verbose:
-            print("\nValidation completed successfully!")
+        print_result(result, validator, verbose=args.verbose)
+        run_sweep(args, validator, result)
+        write_profile(args, validator)
 
     except Exception as e:
         print(f"\nError during validation: {str(e)}")
-        import sys
+        sys.exit(1)
+
+
+def run_stream(
+    args, solution_file: str, validator_class=SolutionValidator, **validator_options
+) -> None:
+    """
+    Stream-validate one solution file, printing each event as a JSON line.
 
+    Args:
+        args: Parsed CLI arguments (distance options, --chunk-rows, --max-errors)
+        solution_file: Solution CSV to validate
+        validator_class: SolutionValidator or a project-specific subclass
+        **validator_options: Extra constructor arguments for validator_class
+    """
+    try:
+        # Status lines would break the JSON Lines output on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            validator = validator_class(
+                **distance_options(args),
+                **validator_options,
+                solution_file=solution_file,
+                load_solution=False,
+            )
+        events = validator.iter_validation(
+            chunk_rows=args.chunk_rows,
+            max_errors=args.max_errors,
+            include_routes=args.verbose,
+        )
+        for event in events:
+            print(json.dumps(event), flush=True)
+        with contextlib.redirect_stdout(sys.stderr):
+            write_profile(args, validator)
+
+    except Exception as e:
+        print(f"\nError during streaming validation: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_batch(args, validator_class=SolutionValidator, **validator_options) -> None:
+    """
+    Validate every file matched by --solutions with a single loaded instance.
+
+    Args:
+        args: Parsed CLI arguments (distance options, --solutions, --output)
+        validator_class: SolutionValidator or a project-specific subclass
+        **validator_options: Extra constructor arguments for validator_class
+    """
+    try:
+        solution_files = resolve_solution_files(args.solutions)
+        print(
+            f"Validating {len(solution_files)} solution files with "
+            f"{args.method} distance calculation..."
+        )
+
+        validator = validator_class(
+            **distance_options(args),
+            **validator_options,
+            load_solution=False,
+        )
+        with ParallelValidator(validator, args.workers) as parallel:
+            summary = write_batch_results(
+                parallel.validate_batch(solution_files), args.output
+            )
+
+        print(f"\n{summary['feasible']}/{summary['total']} solutions are feasible")
+        if args.output:
+            print(f"Results written to: {args.output}")
+        if parallel.workers == 1:
+            # With several workers each process keeps its own memo
+            print_memo_stats(validator)
+        write_profile(args, validator)
+
+    except Exception as e:
+        print(f"\nError during batch validation: {str(e)}")
         sys.exit(1)
 
 
@@ -0,0 +1,434 @@
+"""
+Benchmarks for the solution validator.
+
+Generates synthetic instances and solutions in the CSV schemas of
+Proyecto_Caso_Base (100 to 100k clients) and measures, per instance size:
+- SolutionValidator construction (CSV ingestion and distance engine)
+- load_distance_matrix for JSON, CSV (square and three-column) and NPZ files
+- calculate_distance per method (haversine, geopy, matrix)
+- validate_solution on a solution that serves every client
+- k-nearest neighbor lists (k=20) from the spatial index
+- a cold run of the base_case_verification.py CLI (haversine), including
+  interpreter startup and imports, as other tooling invokes it
+
+Each phase reports its best wall time over --repeat runs, throughput and the
+peak Python memory of one extra run traced with tracemalloc. Everything runs
+offline: OSRM is not benchmarked.
+
+Usage:
+  python benchmark_validation.py
+  python benchmark_validation.py --clients 100 1000 --repeat 5
+  python benchmark_validation.py --clients 100000 --output benchmark.jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from base_case_verification import SolutionValidator
+from distance_matrix import pairwise_matrix
+from matrix_io import convert_distance_matrix
+from spatial_index import DEFAULT_NEIGHBORS, SpatialIndex
+
+# Bogotá bounding box used for synthetic coordinates
+LAT_RANGE = (4.45, 4.85)
+LON_RANGE = (-74.25, -73.95)
+
+DEFAULT_CLIENTS = (100, 1_000, 10_000, 100_000)
+
+# Matrix files grow with N²: larger instances skip the matrix phases
+DEFAULT_MAX_MATRIX_LOCATIONS = 2_000
+
+# calculate_distance calls timed per method
+DEFAULT_DISTANCE_CALLS = 10_000
+
+# Cold start goal for the CLI on a base-case-sized instance (seconds)
+CLI_COLD_START_TARGET = 0.25
+
+VALIDATOR_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "base_case_verification.py"
+)
+
+
+def write_instance(directory: str, num_clients: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Write clients.csv, depots.csv and vehicles.csv for a synthetic instance.
+
+    Args:
+        directory: Output directory
+        num_clients: Number of clients to generate
+        seed: Random seed
+
+    Returns:
+        DataFrame with StandardizedID, Latitude and Longitude of all locations
+    """
+    rng = np.random.default_rng(seed)
+
+    client_ids = np.arange(1, num_clients + 1)
+    clients = pd.DataFrame(
+        {
+            "ClientID": client_ids,
+            "StandardizedID": [f"C{i:03d}" for i in client_ids],
+            "LocationID": client_ids + 1,
+            "Latitude": rng.uniform(*LAT_RANGE, num_clients),
+            "Longitude": rng.uniform(*LON_RANGE, num_clients),
+            "Demand": rng.integers(5, 30, num_clients),
+        }
+    )
+    depots = pd.DataFrame(
+        {
+            "DepotID": [1],
+            "StandardizedID": ["CD01"],
+            "LocationID": [1],
+            "Longitude": [float(np.mean(LON_RANGE))],
+            "Latitude": [float(np.mean(LAT_RANGE))],
+        }
+    )
+    num_vehicles = max(1, num_clients // 3)
+    vehicle_ids = np.arange(1, num_vehicles + 1)
+    vehicles = pd.DataFrame(
+        {
+            "VehicleID": vehicle_ids,
+            "StandardizedID": [f"V{i:03d}" for i in vehicle_ids],
+            "Capacity": rng.integers(100, 150, num_vehicles),
+            "Range": rng.integers(150, 250, num_vehicles),
+        }
+    )
+
+    clients.to_csv(os.path.join(directory, "clients.csv"), index=False)
+    depots.to_csv(os.path.join(directory, "depots.csv"), index=False)
+    vehicles.to_csv(os.path.join(directory, "vehicles.csv"), index=False)
+
+    return pd.concat(
+        [
+            depots[["StandardizedID", "Latitude", "Longitude"]],
+            clients[["StandardizedID", "Latitude", "Longitude"]],
+        ],
+        ignore_index=True,
+    )
+
+
+def write_solution(directory: str, solution_file: str = "verificacion_caso1.csv") -> str:
+    """
+    Write a solution serving every client of the instance in directory.
+
+    Clients are assigned in ID order, an equal share per vehicle, so every
+    route fits the synthetic capacities.
+
+    Returns:
+        Path of the written solution file
+    """
+    clients = pd.read_csv(os.path.join(directory, "clients.csv"))
+    vehicles = pd.read_csv(os.path.join(directory, "vehicles.csv"))
+    per_route = math.ceil(len(clients) / len(vehicles))
+
+    client_ids = clients["StandardizedID"].to_numpy()
+    demands = clients["Demand"].to_numpy()
+    rows = []
+    for route, start in enumerate(range(0, len(clients), per_route)):
+        stop = start + per_route
+        rows.append(
+            {
+                "VehicleId": vehicles["StandardizedID"].iloc[route],
+                "DepotId": "CD01",
+                "InitialLoad": int(demands[start:stop].sum()),
+                "RouteSequence": "-".join(["CD01", *client_ids[start:stop], "CD01"]),
+                "ClientsServed": len(client_ids[start:stop]),
+                "DemandsSatisfied": "-".join(map(str, demands[start:stop])),
+            }
+        )
+
+    path = os.path.join(directory, solution_file)
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def write_csv_matrices(directory: str, locations: pd.DataFrame) -> dict:
+    """
+    Write the haversine matrix of the locations in both CSV layouts.
+
+    Returns:
+        Dict mapping layout name ("square", "three-column") to file path
+    """
+    ids = locations["StandardizedID"].tolist()
+    distances = np.round(
+        pairwise_matrix(locations["Latitude"], locations["Longitude"]), 3
+    )
+
+    square_path = os.path.join(directory, "matrix_square.csv")
+    pd.DataFrame(distances, index=ids, columns=ids).to_csv(square_path)
+
+    three_column_path = os.path.join(directory, "matrix_three_column.csv")
+    pd.DataFrame(
+        {
+            "Origin": np.repeat(ids, len(ids)),
+            "Destination": np.tile(ids, len(ids)),
+            "Distance": distances.ravel(),
+        }
+    ).to_csv(three_column_path, index=False)
+
+    return {"square": square_path, "three-column": three_column_path}
+
+
+def write_matrix_files(directory: str, locations: pd.DataFrame) -> dict:
+    """
+    Write the haversine matrix of the locations in every supported format.
+
+    Returns:
+        Dict mapping format name ("json", "square", "three-column", "npz") to path
+    """
+    matrix_files = write_csv_matrices(directory, locations)
+
+    ids = locations["StandardizedID"].tolist()
+    distances = np.round(
+        pairwise_matrix(locations["Latitude"], locations["Longitude"]), 3
+    )
+    json_path = os.path.join(directory, "matrix.json")
+    with open(json_path, "w") as f:
+        json.dump(
+            {
+                "metadata": {"method": "haversine", "units": "km"},
+                "distances": {
+                    origin: dict(zip(ids, row)) for origin, row in zip(ids, distances.tolist())
+                },
+            },
+            f,
+        )
+
+    npz_path = os.path.join(directory, "matrix.npz")
+    convert_distance_matrix(matrix_files["square"], npz_path)
+
+    return {"json": json_path, **matrix_files, "npz": npz_path}
+
+
+def measure(function: Callable, repeat: int) -> Dict[str, float]:
+    """
+    Best wall time of repeat calls plus the peak traced memory of one more.
+
+    Returns:
+        Dict with "seconds" (best run) and "peak_mb" (tracemalloc peak)
+    """
+    timings = []
+    # Status lines printed by the validator (matrix loads) are silenced
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_mb": peak / 1e6}
+
+
+def benchmark_instance(
+    num_clients: int,
+    repeat: int,
+    max_matrix_locations: int = DEFAULT_MAX_MATRIX_LOCATIONS,
+    distance_calls: int = DEFAULT_DISTANCE_CALLS,
+) -> List[Dict]:
+    """
+    Run every benchmark phase on a synthetic instance of num_clients clients.
+
+    Args:
+        num_clients: Instance size
+        repeat: Timed runs per phase (best one is reported)
+        max_matrix_locations: Largest instance for which matrix files are
+            written and the matrix phases run
+        distance_calls: calculate_distance calls per method
+
+    Returns:
+        One result dict per phase: clients, phase, seconds, unit, per_second, peak_mb
+    """
+    results = []
+
+    def record(phase: str, function: Callable, units: int, unit: str) -> None:
+        stats = measure(function, repeat)
+        results.append(
+            {
+                "clients": num_clients,
+                "phase": phase,
+                "seconds": stats["seconds"],
+                "unit": unit,
+                "per_second": units / stats["seconds"] if stats["seconds"] else math.inf,
+                "peak_mb": stats["peak_mb"],
+            }
+        )
+        print(
+            f"  {phase:<36} {stats['seconds']:9.4f} s  "
+            f"{results[-1]['per_second']:>14,.0f} {unit}/s  {stats['peak_mb']:9.1f} MB"
+        )
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        locations = write_instance(directory, num_clients)
+        solution_file = write_solution(directory)
+        num_locations = len(locations)
+        num_routes = len(pd.read_csv(solution_file))
+        matrix_files = {}
+        if num_locations <= max_matrix_locations:
+            matrix_files = write_matrix_files(directory, locations)
+
+        os.chdir(directory)
+        try:
+            print(f"\n{num_clients:,} clients, {num_routes:,} routes (best of {repeat}):")
+
+            record(
+                "construct (haversine)",
+                lambda: SolutionValidator(distance_method="haversine"),
+                num_locations,
+                "locations",
+            )
+
+            # Random legs between instance locations, shared by all methods
+            rng = np.random.default_rng(1)
+            ids = locations["StandardizedID"].to_numpy()
+            legs = list(
+                zip(
+                    ids[rng.integers(0, num_locations, distance_calls)].tolist(),
+                    ids[rng.integers(0, num_locations, distance_calls)].tolist(),
+                )
+            )
+
+            validators = {
+                method: SolutionValidator(distance_method=method, load_solution=False)
+                for method in ("haversine", "geopy")
+            }
+            if matrix_files:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    validators["matrix"] = SolutionValidator(
+                        distance_method="matrix",
+                        matrix_file=matrix_files["npz"],
+                        load_solution=False,
+                    )
+                for matrix_format, path in matrix_files.items():
+                    record(
+                        f"load_distance_matrix ({matrix_format})",
+                        lambda path=path: validators["matrix"].load_distance_matrix(path),
+                        num_locations**2,
+                        "pairs",
+                    )
+                # Validate against the in-memory (not memory-mapped) matrix
+                with contextlib.redirect_stdout(io.StringIO()):
+                    validators["matrix"].load_distance_matrix(matrix_files["json"])
+            else:
+                print(
+                    f"  (matrix phases skipped: {num_locations:,} locations > "
+                    f"--max-matrix-locations {max_matrix_locations:,})"
+                )
+
+            for method, validator in validators.items():
+                record(
+                    f"calculate_distance ({method})",
+                    lambda validator=validator: [
+                        validator.calculate_distance(a, b) for a, b in legs
+                    ],
+                    len(legs),
+                    "calls",
+                )
+
+            solution_df = pd.read_csv(solution_file)
+            for method, validator in validators.items():
+                record(
+                    f"validate_solution ({method})",
+                    lambda validator=validator: validator.validate_solution(
+                        solution_df, save_cache=False
+                    ),
+                    num_routes,
+                    "routes",
+                )
+
+            record(
+                f"neighbor lists (k={DEFAULT_NEIGHBORS})",
+                lambda: SpatialIndex(
+                    ids, locations["Latitude"], locations["Longitude"]
+                ).neighbors(min(DEFAULT_NEIGHBORS, num_locations - 1)),
+                num_locations,
+                "locations",
+            )
+
+            record(
+                "cli cold start (haversine)",
+                lambda: subprocess.run(
+                    [sys.executable, VALIDATOR_SCRIPT, "--solution", solution_file],
+                    stdout=subprocess.DEVNULL,
+                    check=True,
+                ),
+                num_routes,
+                "routes",
+            )
+            if num_clients <= 100 and results[-1]["seconds"] > CLI_COLD_START_TARGET:
+                print(f"  (cli cold start above the {CLI_COLD_START_TARGET} s target)")
+        finally:
+            os.chdir(original_dir)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solution validator benchmarks")
+    parser.add_argument(
+        "--clients",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_CLIENTS),
+        help="Instance sizes to benchmark (default: 100 1000 10000 100000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument(
+        "--max-matrix-locations",
+        type=int,
+        default=DEFAULT_MAX_MATRIX_LOCATIONS,
+        help="Skip matrix file phases above this many locations (files grow with N²)",
+    )
+    parser.add_argument(
+        "--distance-calls",
+        type=int,
+        default=DEFAULT_DISTANCE_CALLS,
+        help="calculate_distance calls timed per method",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write one JSON line per measurement to this file",
+    )
+    args = parser.parse_args()
+
+    results = []
+    for num_clients in args.clients:
+        results.extend(
+            benchmark_instance(
+                num_clients,
+                args.repeat,
+                max_matrix_locations=args.max_matrix_locations,
+                distance_calls=args.distance_calls,
+            )
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"\nResults written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
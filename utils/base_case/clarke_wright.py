@@ -0,0 +1,451 @@
+"""
+Clarke-Wright savings construction heuristic for base case and Project A instances.
+
+Builds a feasible set of routes in seconds, even for 10,000+ clients, and
+writes it as a verification file: a baseline for the quality gap
+(base_case_verification.py --gap) and a warm start for solvers or
+improvement heuristics.
+
+1. Every client is assigned a depot: the nearest one, visiting clients
+   with the most to lose first so depot inventories (Project A) are met.
+2. Every client starts on its own route from its depot. Merging the route
+   ending at i with the route starting at j saves
+   s(i, j) = d(i, depot) + d(depot, j) - d(i, j).
+3. Candidate pairs (the K nearest clients of every client, or all pairs on
+   small instances) are sorted by saving once, with vectorized distances.
+   Routes are joined end to end in that order whenever some vehicle can
+   still serve the merged route within its Capacity, Range and, on
+   Project A, the clients' VehicleSizeRestriction, and the fleet still has
+   as many vehicles of each capacity as routes that need them.
+4. Routes get vehicles largest load first, each the smallest unused
+   vehicle that fits (best fit). A route left without one is cut, in
+   visiting order, into pieces that unused vehicles can serve.
+
+Route lengths are kept in both directions, so asymmetric distance matrices
+are handled and each route is written in its shorter orientation.
+
+Usage (from an instance directory):
+  python ../../utils/base_case/clarke_wright.py
+  python ../../utils/base_case/clarke_wright.py --project a --output baseline_caso3.csv
+  python ../../utils/base_case/clarke_wright.py --method matrix --matrix distances.npz
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from base_case_verification import SolutionValidator
+from model_export import add_instance_arguments, load_validator, write_solution_csv
+from spatial_index import SpatialIndex
+
+# Nearest clients per client whose pairs are candidate merges
+DEFAULT_NEIGHBORS = 30
+
+# Up to this many clients every client pair is a candidate merge
+ALL_PAIRS_LIMIT = 1500
+
+# Errors listed when checking the written solution
+MAX_LISTED_ERRORS = 10
+
+# Written unless --output is given; never a verificacion_caso*.csv submission file
+DEFAULT_OUTPUT = "clarke_wright_solution.csv"
+
+
+def assign_depots(
+    to_client: np.ndarray, from_client: np.ndarray, demand: np.ndarray, inventory: np.ndarray
+) -> np.ndarray:
+    """
+    Depot of every client: the nearest one with inventory left.
+
+    Clients whose second-best depot is furthest behind (largest regret)
+    are assigned first, so clients with a clear choice keep it.
+
+    Args:
+        to_client: (num_depots, num_clients) depot-to-client distances
+        from_client: (num_clients, num_depots) client-to-depot distances
+        demand: (num_clients,) client demands
+        inventory: (num_depots,) units each depot can ship (inf if unlimited)
+
+    Returns:
+        (num_clients,) depot index of every client; clients no depot can
+        supply go to their nearest depot
+    """
+    round_trip = to_client.T + from_client
+    round_trip = np.where(np.isnan(round_trip), np.inf, round_trip)
+    nearest = round_trip.argmin(axis=1)
+    if np.all(np.isinf(inventory)):
+        return nearest
+
+    ranked = np.sort(round_trip, axis=1)
+    regret = ranked[:, 1] - ranked[:, 0] if ranked.shape[1] > 1 else np.zeros(len(ranked))
+    left = np.array(inventory, dtype=float)
+    depots = nearest.copy()
+    for client in np.argsort(-regret, kind="stable").tolist():
+        for depot in np.argsort(round_trip[client], kind="stable").tolist():
+            if demand[client] <= left[depot]:
+                depots[client] = depot
+                left[depot] -= demand[client]
+                break
+    return depots
+
+
+def candidate_pairs(
+    validator: SolutionValidator, clients: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unordered client pairs (positions i < j in clients) considered for merging.
+
+    Args:
+        validator: Validator of the instance
+        clients: Node indices of the clients
+        k: Nearest clients per client (0 for all pairs)
+
+    Raises:
+        ValueError: If K nearest clients are needed and coordinates are missing
+    """
+    n = len(clients)
+    if k == 0 or n <= max(ALL_PAIRS_LIMIT, k + 1):
+        first, second = np.triu_indices(n, 1)
+        return first, second
+
+    latitudes = validator.nodes.latitude[clients]
+    longitudes = validator.nodes.longitude[clients]
+    if np.isnan(latitudes).any() or np.isnan(longitudes).any():
+        raise ValueError(
+            f"Nearest-client candidates need coordinates for all {n:,} clients.\n"
+            "Add coordinates to clients.csv or pass --neighbors 0 to try every pair."
+        )
+    index = SpatialIndex(np.arange(n), latitudes, longitudes)
+    _, neighbors = index.neighbors(min(k, n - 1))
+    first = np.repeat(np.arange(n), neighbors.shape[1])
+    second = neighbors.ravel()
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    pairs = np.unique(low * n + high)
+    return pairs // n, pairs % n
+
+
+class _Fleet:
+    """Vehicle limits, with the vehicles able to serve each set of clients."""
+
+    def __init__(self, validator: SolutionValidator, numbers: List[int]):
+        self.numbers = np.array(numbers)
+        specs = validator.vehicle_specs
+        self.capacity = np.array([specs[n]["capacity"] for n in numbers], dtype=float)
+        self.range = np.array([specs[n]["range"] for n in numbers], dtype=float)
+
+        # Clients with the same serviceable vehicles share a class
+        # (compared as packed bytes: np.unique over boolean rows is slow for big fleets)
+        serves = np.array([validator.serviceable_clients(n) for n in numbers], dtype=bool)
+        packed = np.ascontiguousarray(np.packbits(serves, axis=0).T)
+        keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+        _, first, self.client_class = np.unique(keys, return_index=True, return_inverse=True)
+        self.client_class = self.client_class.ravel()
+        columns = serves[:, first].T
+        self.masks: List[np.ndarray] = []
+        self.max_capacity: List[float] = []
+        self.max_range: List[float] = []
+        self._mask_ids: Dict[bytes, int] = {}
+        self._joined: Dict[Tuple[int, int], int] = {}
+        self.class_mask = [self.mask_id(column) for column in columns]
+
+        # Capacity levels: routes needing a level or above must not outnumber
+        # the vehicles that reach it (Hall's condition on capacity alone)
+        self.levels = np.unique(self.capacity)
+        self.supply = len(self.capacity) - np.searchsorted(np.sort(self.capacity), self.levels)
+        self.need = np.zeros(len(self.levels), dtype=np.intp)
+
+    def level(self, load: float) -> int:
+        """Index of the smallest vehicle capacity that carries the load."""
+        return min(int(np.searchsorted(self.levels, load)), len(self.levels) - 1)
+
+    def add_route(self, level: int, count: int = 1) -> None:
+        """Count a route (or remove one, with count -1) needing a capacity level."""
+        self.need[: level + 1] += count
+
+    def has_vehicle(self, a: int, b: int, merged: int) -> bool:
+        """Whether routes at levels a and b can become one route at level merged."""
+        low = max(a, b) + 1
+        return bool(np.all(self.need[low : merged + 1] < self.supply[low : merged + 1]))
+
+    def best_fit(self, mask: int, load: float, length: float, allowed: np.ndarray) -> int:
+        """Smallest allowed vehicle of the set that can serve a route (-1 if none)."""
+        usable = self.masks[mask] & allowed & (self.capacity >= load) & (self.range >= length)
+        candidates = np.flatnonzero(usable)
+        if len(candidates) == 0:
+            return -1
+        return int(candidates[np.lexsort((self.range[candidates], self.capacity[candidates]))[0]])
+
+    def mask_id(self, mask: np.ndarray) -> int:
+        """Id of a set of vehicles (boolean mask over the fleet)."""
+        key = mask.tobytes()
+        if key not in self._mask_ids:
+            self._mask_ids[key] = len(self.masks)
+            self.masks.append(mask)
+            self.max_capacity.append(float(self.capacity[mask].max(initial=-np.inf)))
+            self.max_range.append(float(self.range[mask].max(initial=-np.inf)))
+        return self._mask_ids[key]
+
+    def join(self, a: int, b: int) -> int:
+        """Id of the vehicles in both sets a and b."""
+        if a == b:
+            return a
+        key = (a, b) if a < b else (b, a)
+        if key not in self._joined:
+            self._joined[key] = self.mask_id(self.masks[a] & self.masks[b])
+        return self._joined[key]
+
+    def fits(self, mask: int, load: float, length: float) -> bool:
+        """Whether a vehicle of the set can carry the load over the length."""
+        if load > self.max_capacity[mask] or length > self.max_range[mask]:
+            return False
+        return bool(
+            np.any(self.masks[mask] & (self.capacity >= load) & (self.range >= length))
+        )
+
+
+def savings_routes(
+    validator: SolutionValidator, neighbors: int = DEFAULT_NEIGHBORS
+) -> List[Tuple[str, str, List[str]]]:
+    """
+    Routes of the Clarke-Wright savings heuristic.
+
+    Args:
+        validator: Validator of the instance (loaded without a solution)
+        neighbors: Nearest clients per client that are candidate merges
+            (0 for all pairs; small instances always use all pairs)
+
+    Returns:
+        (vehicle ID, depot ID, client IDs) per route, by vehicle
+    """
+    node_ids = validator.node_ids
+    clients = np.arange(validator.client_nodes.start, validator.client_nodes.stop)
+    depots = np.arange(len(validator.depot_ids))
+    n = len(clients)
+    if n == 0:
+        return []
+    demand = np.asarray(validator.client_demand_array, dtype=float)
+
+    to_client = validator.node_distances(depots[:, None], clients[None, :])
+    from_client = validator.node_distances(clients[:, None], depots[None, :])
+    inventory = np.asarray(
+        getattr(validator, "depot_capacity", np.full(len(depots), np.inf)), dtype=float
+    )
+    depot_of = assign_depots(to_client, from_client, demand, inventory)
+    out_leg = to_client[depot_of, np.arange(n)]
+    back_leg = from_client[np.arange(n), depot_of]
+
+    fleet = _Fleet(validator, sorted(validator.vehicle_specs))
+
+    # Savings of joining i and j, averaged over both directions
+    first, second = candidate_pairs(validator, clients, neighbors)
+    same_depot = depot_of[first] == depot_of[second]
+    first, second = first[same_depot], second[same_depot]
+    forward = validator.node_distances(clients[first], clients[second])
+    backward = validator.node_distances(clients[second], clients[first])
+    savings = (
+        back_leg[first] + out_leg[second] - forward + back_leg[second] + out_leg[first] - backward
+    ) / 2
+    keep = np.flatnonzero(savings > 0)
+    order = keep[np.argsort(-savings[keep], kind="stable")]
+
+    # Routes are chains of clients: ends e0/e1, length from e0 to e1 (fwd)
+    # and back (bwd); clients link to up to two neighbors on their chain
+    route_of = list(range(n))
+    members = [[c] for c in range(n)]
+    end0 = list(range(n))
+    end1 = list(range(n))
+    fwd = (out_leg + back_leg).tolist()
+    bwd = list(fwd)
+    load = demand.tolist()
+    mask = [fleet.class_mask[k] for k in fleet.client_class.tolist()]
+    level = [fleet.level(units) for units in load]
+    for route_level in level:
+        fleet.add_route(route_level)
+    links = [[] for _ in range(n)]
+    out_list, back_list = out_leg.tolist(), back_leg.tolist()
+    top_capacity = max(fleet.max_capacity)
+
+    for i, j, d_ij, d_ji in zip(
+        first[order].tolist(),
+        second[order].tolist(),
+        forward[order].tolist(),
+        backward[order].tolist(),
+    ):
+        a, b = route_of[i], route_of[j]
+        if a == b or len(links[i]) > 1 or len(links[j]) > 1:
+            continue
+        merged_load = load[a] + load[b]
+        if merged_load > top_capacity:
+            continue
+
+        # Route a oriented to end at i, route b to start at j
+        a_to_i, i_to_a = (fwd[a], bwd[a]) if end1[a] == i else (bwd[a], fwd[a])
+        j_to_b, b_to_j = (fwd[b], bwd[b]) if end0[b] == j else (bwd[b], fwd[b])
+        start = end0[a] if end1[a] == i else end1[a]
+        finish = end1[b] if end0[b] == j else end0[b]
+        new_fwd = a_to_i - back_list[i] + d_ij + j_to_b - out_list[j]
+        new_bwd = b_to_j - back_list[j] + d_ji + i_to_a - out_list[i]
+        merged_mask = fleet.join(mask[a], mask[b])
+        if not fleet.fits(merged_mask, merged_load, min(new_fwd, new_bwd)):
+            continue
+        merged_level = fleet.level(merged_load)
+        if not fleet.has_vehicle(level[a], level[b], merged_level):
+            continue
+        fleet.add_route(level[a], -1)
+        fleet.add_route(level[b], -1)
+        fleet.add_route(merged_level)
+
+        links[i].append(j)
+        links[j].append(i)
+        if len(members[a]) < len(members[b]):
+            a, b = b, a
+        for c in members[b]:
+            route_of[c] = a
+        members[a].extend(members[b])
+        members[b] = []
+        end0[a], end1[a] = start, finish
+        fwd[a], bwd[a] = new_fwd, new_bwd
+        load[a], mask[a], level[a] = merged_load, merged_mask, merged_level
+
+    # Vehicles by best fit, largest loads first
+    routes = sorted({route_of[c] for c in range(n)}, key=lambda r: -load[r])
+    free = np.ones(len(fleet.numbers), dtype=bool)
+    assigned = []
+    left_over = []
+    for r in routes:
+        chain, previous, client = [], -1, end0[r]
+        while client != -1:
+            chain.append(client)
+            following = [c for c in links[client] if c != previous]
+            previous, client = client, following[0] if following else -1
+        if bwd[r] < fwd[r]:
+            chain.reverse()
+        vehicle = fleet.best_fit(mask[r], load[r], min(fwd[r], bwd[r]), free)
+        if vehicle < 0:
+            left_over.append(chain)
+            continue
+        free[vehicle] = False
+        assigned.append((vehicle, chain))
+
+    # Routes left without a free vehicle are cut into pieces free vehicles can serve
+    reused = unserviceable = 0
+    client_mask = [fleet.class_mask[k] for k in fleet.client_class.tolist()]
+    for chain in left_over:
+        legs = validator.node_distances(clients[chain[:-1]], clients[chain[1:]]).tolist()
+        pieces = [[chain[0]]]
+        piece_mask, piece_load, inner = client_mask[chain[0]], demand[chain[0]], 0.0
+        for leg, client in zip(legs, chain[1:]):
+            merged_mask = fleet.join(piece_mask, client_mask[client])
+            length = out_list[pieces[-1][0]] + inner + leg + back_list[client]
+            merged_load = piece_load + demand[client]
+            if fleet.best_fit(merged_mask, merged_load, length, free) >= 0:
+                pieces[-1].append(client)
+                piece_mask, piece_load, inner = merged_mask, merged_load, inner + leg
+                continue
+            pieces.append([client])
+            piece_mask, piece_load, inner = client_mask[client], demand[client], 0.0
+
+        for piece in pieces:
+            stops = clients[piece]
+            piece_mask = client_mask[piece[0]]
+            for client in piece[1:]:
+                piece_mask = fleet.join(piece_mask, client_mask[client])
+            length = (
+                out_list[piece[0]]
+                + float(validator.node_distances(stops[:-1], stops[1:]).sum())
+                + back_list[piece[-1]]
+            )
+            piece_load = float(demand[piece].sum())
+            vehicle = fleet.best_fit(piece_mask, piece_load, length, free)
+            if vehicle < 0:
+                vehicle = fleet.best_fit(piece_mask, piece_load, length, ~free)
+                reused += 1
+            if vehicle < 0:
+                # Clients no vehicle can serve: the validator reports them
+                vehicle = int(np.argmax(fleet.capacity))
+                reused -= 1
+                unserviceable += 1
+            free[vehicle] = False
+            assigned.append((vehicle, piece))
+
+    if reused:
+        print(f"Warning: {reused} routes reuse a vehicle (the fleet is too small)")
+    if unserviceable:
+        print(f"Warning: {unserviceable} routes exceed the capacity or range of every vehicle")
+    assigned.sort(key=lambda route: fleet.numbers[route[0]])
+    return [
+        (
+            f"V{fleet.numbers[vehicle]:03d}",
+            node_ids[depots[depot_of[chain[0]]]],
+            [node_ids[clients[c]] for c in chain],
+        )
+        for vehicle, chain in assigned
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build routes with the Clarke-Wright savings heuristic and write them "
+        "as a verification file"
+    )
+    add_instance_arguments(parser)
+    parser.add_argument(
+        "--neighbors",
+        type=int,
+        default=DEFAULT_NEIGHBORS,
+        metavar="K",
+        help=f"Candidate merges with the K nearest clients of every client "
+        f"(default: {DEFAULT_NEIGHBORS}; 0 tries every pair; instances up to "
+        f"{ALL_PAIRS_LIMIT:,} clients always try every pair)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help=f"Verification file to write (default: {DEFAULT_OUTPUT})",
+    )
+    args = parser.parse_args()
+
+    if args.neighbors < 0:
+        parser.error("--neighbors must be 0 or more")
+
+    try:
+        validator = load_validator(parser, args)
+        output = args.output or DEFAULT_OUTPUT
+
+        start = time.perf_counter()
+        routes = savings_routes(validator, args.neighbors)
+        elapsed = time.perf_counter() - start
+        write_solution_csv(validator, routes, output)
+        print(
+            f"Wrote {len(routes):,} routes for {len(validator.client_ids):,} clients "
+            f"to {output} ({elapsed:.2f} s)"
+        )
+
+        # Check the written file with the validator already loaded
+        summary = {}
+        errors = []
+        for event in validator.iter_validation(output):
+            if event["event"] == "error" and len(errors) < MAX_LISTED_ERRORS:
+                errors.append(event["message"])
+            elif event["event"] == "summary":
+                summary = event
+        if summary.get("feasible"):
+            total = summary.get("total_cost")
+            cost = f", total cost {total:,.0f} COP" if total is not None else ""
+            print(f"✓ Solution is feasible{cost}")
+        else:
+            print(f"✗ Solution has {summary.get('num_errors', len(errors))} errors:")
+            for error in errors:
+                print(f"  - {error}")
+
+    except Exception as e:
+        print(f"\nError: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
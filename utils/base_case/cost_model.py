@@ -0,0 +1,311 @@
+"""
+Cost model for the unified objective function of all projects:
+
+    min Z = Σ(C_fixed × y_v) + Σ(C_dist × d_v) + Σ(C_time × t_v) + C_fuel + C_special
+
+CostParameters holds the coefficients of one vehicle type and is read once
+from a parameters_[type].csv file (base, urban, rural or national). The
+validators price each route in the same pass that sums its distance, and
+compare the result with the distance, time and cost columns reported in the
+verification file.
+
+Usage:
+  from cost_model import CostParameters
+  parameters = CostParameters.from_file("parameters_urban.csv", vehicle_type="small van")
+  parameters.route_costs(distance_km=42.0, time_min=95.0)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from csv_table import numeric_column, read_table
+
+LITERS_PER_GALLON = 3.785411784
+
+# Average speed (km/h) used for route times when the data gives none
+DEFAULT_SPEED = 40.0
+
+# Objective terms per route; tolls are the C_special term of Project C
+COST_COMPONENTS = ("fixed", "distance", "time", "fuel", "tolls")
+
+# Verification file columns holding reported values, by route cost key
+# (times are reported in minutes)
+REPORTED_COLUMNS = {
+    "distance_km": ("TotalDistance", "Distance"),
+    "time_min": ("TotalTime", "Time"),
+    "fuel": ("FuelCost",),
+    "tolls": ("TollCost",),
+    "total": ("TotalCost", "Cost"),
+}
+
+# Reported values further than this fraction from the recomputed value are
+# listed as differences (at least 1 unit: km, minute or COP)
+DIFFERENCE_TOLERANCE = 0.01
+
+
+def read_parameters(parameters_file: str, column: str = "Value") -> Dict[str, str]:
+    """
+    Read a parameters_[type].csv file (Parameter,Value,Unit,Description).
+
+    Lines starting with # are notes and are skipped.
+
+    Args:
+        parameters_file: Path to the parameters file
+        column: Column to map each parameter to ("Value" or "Unit")
+
+    Returns:
+        Dict mapping parameter name to its raw value string
+    """
+    table = read_table(parameters_file, comment="#")
+    return {
+        name.strip(): value.strip()
+        for name, value in zip(table["Parameter"].tolist(), table[column].tolist())
+    }
+
+
+def _type_suffixes(vehicle_type: Optional[str]) -> List[str]:
+    """
+    Parameter name suffixes to try for a vehicle type, most specific first.
+
+    "small van" matches fuel_efficiency_van_small_*, "4x4" and "truck" match
+    C_fixed_truck; the unsuffixed name is the fallback for every type.
+    """
+    if not vehicle_type:
+        return [""]
+    words = str(vehicle_type).lower().replace("4x4", "truck").split()
+    suffixes = ["_" + "_".join(words), "_" + "_".join(reversed(words))]
+    return list(dict.fromkeys(suffixes)) + [""]
+
+
+def _typical_value(parameters: Dict[str, str], name: str) -> Optional[float]:
+    """Value of name, or the midpoint of name_min and name_max, if defined."""
+    if name in parameters:
+        return float(parameters[name])
+    if f"{name}_min" in parameters and f"{name}_max" in parameters:
+        return (float(parameters[f"{name}_min"]) + float(parameters[f"{name}_max"])) / 2
+    return None
+
+
+def parameter_sources(parameters: Dict[str, str], vehicle_type: Optional[str] = None) -> Dict[str, str]:
+    """
+    Parameter each objective coefficient of a vehicle type is read from.
+
+    Type-specific names (C_fixed_drone, fuel_efficiency_van_small) take
+    precedence over generic ones (C_fixed, fuel_price); fuel efficiency
+    falls back to the typical and full-load values. Electric vehicles take
+    their efficiency from energy_consumption (kWh/km) and their price from
+    energy_price. Ranges are named without their _min/_max suffix.
+
+    Args:
+        parameters: read_parameters dict
+        vehicle_type: Vehicle type as written in vehicles.csv, if any
+
+    Returns:
+        CostParameters field (fixed, distance, time, fuel_price,
+        fuel_efficiency) mapped to a parameter name; coefficients without
+        a parameter are left out
+    """
+    suffixes = _type_suffixes(vehicle_type)
+
+    def first(names: List[str]) -> Optional[str]:
+        return next((name for name in names if _typical_value(parameters, name) is not None), None)
+
+    sources = {
+        "fixed": first([f"C_fixed{suffix}" for suffix in suffixes]),
+        "distance": first([f"C_dist{suffix}" for suffix in suffixes]),
+        "time": first([f"C_time{suffix}" for suffix in suffixes]),
+        "fuel_price": first([f"fuel_price{suffix}" for suffix in suffixes]),
+        "fuel_efficiency": first(
+            [f"fuel_efficiency{suffix}" for suffix in suffixes[:-1]]
+            + ["fuel_efficiency_typical", "fuel_efficiency_full"]
+        ),
+    }
+
+    # Electric vehicles: km per kWh from the consumption range
+    consumption = first([f"energy_consumption{suffix}" for suffix in suffixes[:-1]])
+    if consumption and _typical_value(parameters, consumption):
+        sources["fuel_price"] = first([f"energy_price{suffix}" for suffix in suffixes])
+        sources["fuel_efficiency"] = consumption
+
+    return {field: name for field, name in sources.items() if name is not None}
+
+
+def coefficient_value(name: str, value, units: Dict[str, str]):
+    """
+    Convert a parameter value (or array of values) to the coefficient it sources.
+
+    Fuel efficiencies in km/L become km/gallon and energy consumption
+    (kWh/km) becomes an efficiency in km/kWh; other values are unchanged.
+    """
+    if name.startswith("energy_consumption"):
+        return 1 / value
+    unit = units.get(name, units.get(f"{name}_min", ""))
+    if name.startswith("fuel_efficiency") and unit.lower() == "km/l":
+        return value * LITERS_PER_GALLON
+    return value
+
+
+@dataclass(frozen=True)
+class CostParameters:
+    """
+    Objective coefficients for one vehicle type.
+
+    Attributes:
+        fixed: Activation cost per used vehicle (COP)
+        distance: Cost per km (COP/km)
+        time: Cost per hour of operation (COP/hour)
+        fuel_price: Price per unit of energy (COP/gallon, or COP/kWh for drones)
+        fuel_efficiency: Distance per unit of energy (km/gallon or km/kWh)
+        speed: Average speed used for travel times (km/h)
+    """
+
+    fixed: float = 0.0
+    distance: float = 0.0
+    time: float = 0.0
+    fuel_price: float = 0.0
+    fuel_efficiency: float = math.inf
+    speed: float = DEFAULT_SPEED
+
+    @classmethod
+    def from_file(
+        cls,
+        parameters_file: str,
+        vehicle_type: Optional[str] = None,
+        speed: float = DEFAULT_SPEED,
+    ) -> "CostParameters":
+        """
+        Load the coefficients of a vehicle type from a parameters file.
+
+        Type-specific names (C_fixed_drone, fuel_efficiency_van_small_min)
+        take precedence over generic ones (C_fixed, fuel_price); see
+        parameter_sources. Ranges use their midpoint; Project C uses its
+        full-load band, and km/L values are converted to km/gallon. Drones
+        are priced by energy: energy_price (COP/kWh) over energy_consumption
+        (kWh/km). Missing coefficients are 0, so the base case only prices
+        fuel.
+
+        Args:
+            parameters_file: parameters_[base|urban|rural|national].csv
+            vehicle_type: Vehicle type as written in vehicles.csv, if any
+            speed: Average speed in km/h for travel times
+        """
+        parameters = read_parameters(parameters_file)
+        units = read_parameters(parameters_file, column="Unit")
+        values = {
+            field: coefficient_value(name, _typical_value(parameters, name), units)
+            for field, name in parameter_sources(parameters, vehicle_type).items()
+        }
+        return cls(
+            fixed=values.get("fixed", 0.0),
+            distance=values.get("distance", 0.0),
+            time=values.get("time", 0.0),
+            fuel_price=values.get("fuel_price", 0.0),
+            fuel_efficiency=values.get("fuel_efficiency") or math.inf,
+            speed=speed,
+        )
+
+    def travel_time(self, distance_km: float) -> float:
+        """Minutes needed to cover distance_km at the average speed."""
+        return distance_km / self.speed * 60
+
+    def route_costs(
+        self,
+        distance_km: float,
+        time_min: Optional[float] = None,
+        fuel: Optional[float] = None,
+        tolls: float = 0.0,
+    ) -> Dict[str, float]:
+        """
+        Objective terms of one used vehicle.
+
+        Args:
+            distance_km: Route distance
+            time_min: Route time in minutes (default: travel_time(distance_km))
+            fuel: Fuel cost when known from refueling records (default:
+                distance_km / fuel_efficiency × fuel_price)
+            tolls: Toll (C_special) cost of the route
+
+        Returns:
+            Dict with distance_km, time_min, each of COST_COMPONENTS and total
+        """
+        if time_min is None:
+            time_min = self.travel_time(distance_km)
+        if fuel is None:
+            fuel = distance_km / self.fuel_efficiency * self.fuel_price
+        costs = {
+            "fixed": self.fixed,
+            "distance": self.distance * distance_km,
+            "time": self.time * time_min / 60,
+            "fuel": float(fuel),
+            "tolls": float(tolls),
+        }
+        costs["total"] = sum(costs.values())
+        return {"distance_km": float(distance_km), "time_min": float(time_min), **costs}
+
+
+def summarize_costs(route_costs: List[Dict], solution_df) -> Dict:
+    """
+    Total the route costs and compare them with the reported columns.
+
+    Args:
+        route_costs: Dicts from CostParameters.route_costs, each with the
+            "vehicle_id" and "row" (position in solution_df) of its route
+        solution_df: Verification table (Table or DataFrame) with any of
+            REPORTED_COLUMNS
+
+    Returns:
+        Dict with "routes", "total" (sum of every numeric key) and
+        "differences" (vehicle_id, column, reported, computed per mismatch)
+    """
+    keys = ("distance_km", "time_min", *COST_COMPONENTS, "total")
+    total = {key: float(sum(route[key] for route in route_costs)) for key in keys}
+
+    differences = []
+    for key, columns in REPORTED_COLUMNS.items():
+        column = next((c for c in columns if c in solution_df.columns), None)
+        if column is None:
+            continue
+        reported = numeric_column(solution_df[column])
+        for route in route_costs:
+            value = reported[route["row"]]
+            computed = route[key]
+            if np.isnan(value):
+                continue
+            if abs(value - computed) > DIFFERENCE_TOLERANCE * max(abs(computed), 100):
+                differences.append(
+                    {
+                        "vehicle_id": route["vehicle_id"],
+                        "column": column,
+                        "reported": float(value),
+                        "computed": computed,
+                    }
+                )
+
+    return {"routes": route_costs, "total": total, "differences": differences}
+
+
+def print_costs(costs: Dict, max_differences: int = 20) -> None:
+    """Print the per-route objective breakdown, its total and reported differences."""
+    columns = (*COST_COMPONENTS, "total")
+    print("\nObjective breakdown (COP):")
+    print(f"{'Vehicle':<8}{'Km':>10}" + "".join(f"{c.capitalize():>14}" for c in columns))
+    for route in costs["routes"] + [{"vehicle_id": "Total", **costs["total"]}]:
+        print(
+            f"{route['vehicle_id']:<8}{route['distance_km']:>10.1f}"
+            + "".join(f"{route[c]:>14,.0f}" for c in columns)
+        )
+
+    differences = costs["differences"]
+    if differences:
+        print(f"\nReported values that differ from the recomputed ones ({len(differences)}):")
+        for difference in differences[:max_differences]:
+            print(
+                f"  - {difference['vehicle_id']} {difference['column']}: "
+                f"reported {difference['reported']:,.1f}, "
+                f"computed {difference['computed']:,.1f}"
+            )
+        if len(differences) > max_differences:
+            print(f"  ... {len(differences) - max_differences} more")
@@ -0,0 +1,200 @@
+"""
+Pandas-free CSV tables for the validator's startup path.
+
+Importing pandas takes longer than validating a base case solution, so
+SolutionValidator reads its instance, solution and parameters files with the
+standard library csv module into a Table: string column arrays with the
+small DataFrame subset the validators use (columns, len, column access,
+iloc row slices). Code that reads tables accepts either a Table or a
+pd.DataFrame; the project validators keep reading DataFrames.
+
+Usage:
+  from csv_table import numeric_column, read_table
+  clients = read_table("clients.csv")
+  demands = numeric_column(clients["Demand"])
+"""
+
+import csv
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class Table:
+    """
+    Column-oriented CSV contents.
+
+    Args:
+        data: Column name mapped to an array of cell strings, all of one length
+    """
+
+    def __init__(self, data: Dict[str, np.ndarray]):
+        self.data = data
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.data)
+
+    @property
+    def iloc(self) -> "_RowSlicer":
+        """Row slices, as in DataFrame.iloc[start:stop]."""
+        return _RowSlicer(self)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.data.values()))) if self.data else 0
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.data
+
+    def get(self, column: str, default=None):
+        return self.data.get(column, default)
+
+
+class _RowSlicer:
+    def __init__(self, table: Table):
+        self.table = table
+
+    def __getitem__(self, rows: slice) -> Table:
+        return Table({column: values[rows] for column, values in self.table.data.items()})
+
+
+def read_table(source, comment: Optional[str] = None) -> Table:
+    """
+    Read a CSV file with a header row into a Table.
+
+    Blank lines are skipped, short rows are padded with empty cells and every
+    cell stays a string; convert columns with numeric_column or astype.
+
+    Args:
+        source: CSV file path, or an open text stream (e.g. io.StringIO)
+        comment: Skip rows whose first cell starts with this character
+
+    Returns:
+        Table with one string array per header column
+
+    Raises:
+        FileNotFoundError: If source is a path that does not exist
+        ValueError: If there is no header row
+    """
+    if hasattr(source, "read"):
+        rows = _read_rows(source, comment)
+    else:
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            rows = _read_rows(f, comment)
+    if not rows:
+        raise ValueError(f"{_source_name(source)} is empty: expected a CSV header row")
+    return _build_table(rows[0], rows[1:])
+
+
+def iter_tables(source, chunk_rows: int) -> Iterator[Table]:
+    """
+    Read a CSV file as consecutive Tables of at most chunk_rows rows.
+
+    Only one chunk is held in memory at a time, so files of any length can
+    be processed with bounded memory.
+
+    Args:
+        source: CSV file path, or an open text stream
+        chunk_rows: Maximum rows per Table
+
+    Yields:
+        Tables with the header columns, in file order
+
+    Raises:
+        ValueError: If there is no header row
+    """
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+
+    stream = source if hasattr(source, "read") else open(source, newline="", encoding="utf-8-sig")
+    try:
+        rows = (row for row in csv.reader(stream) if row and any(row))
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"{_source_name(source)} is empty: expected a CSV header row")
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                yield _build_table(header, chunk)
+                chunk = []
+        if chunk:
+            yield _build_table(header, chunk)
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def read_dataframe_chunks(source, chunk_rows: int):
+    """pandas counterpart of iter_tables (DataFrames of chunk_rows rows)."""
+    import pandas as pd
+
+    return pd.read_csv(source, chunksize=chunk_rows)
+
+
+def _source_name(source) -> str:
+    return source if isinstance(source, str) else getattr(source, "name", "CSV input")
+
+
+def _read_rows(stream, comment: Optional[str]) -> List[List[str]]:
+    """Non-blank, non-comment rows of a CSV stream."""
+    return [
+        row
+        for row in csv.reader(stream)
+        if row and any(row) and not (comment and row[0].lstrip().startswith(comment))
+    ]
+
+
+def _build_table(header: List[str], rows: List[List[str]]) -> Table:
+    """Table from a header and data rows (padded or cut to the header width)."""
+    width = len(header)
+    body = [row[:width] + [""] * (width - len(row)) for row in rows]
+    columns = zip(*body) if body else [()] * width
+    return Table(
+        {name: np.array(values, dtype=str) for name, values in zip(header, columns)}
+    )
+
+
+def numeric_column(values) -> np.ndarray:
+    """
+    Convert a column to floats; blank and non-numeric cells become NaN.
+
+    Args:
+        values: Table column, pandas Series or any sequence
+
+    Returns:
+        Float array of the same length
+    """
+    values = np.asarray(values)
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        pass
+
+    numbers = np.full(len(values), np.nan)
+    for k, value in enumerate(values.tolist()):
+        try:
+            numbers[k] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return numbers
+
+
+def integer_column(values) -> np.ndarray:
+    """
+    Convert a column of whole numbers (also written as 8.0) to ints.
+
+    Raises:
+        ValueError: If a cell is blank or not a number
+    """
+    numbers = numeric_column(values)
+    if np.isnan(numbers).any():
+        k = int(np.flatnonzero(np.isnan(numbers))[0])
+        raise ValueError(
+            f"Expected a number in every row, got {np.asarray(values)[k]!r} in row {k + 1}"
+        )
+    return numbers.astype(int)
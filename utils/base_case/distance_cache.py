@@ -0,0 +1,197 @@
+"""
+Persistent distance cache backed by SQLite.
+
+Entries are keyed by distance method and endpoint coordinates rounded to
+COORDINATE_PRECISION decimals, so the same location ID in two instances
+(C001 in Bogotá vs C001 in La Guajira) never shares an entry. Legs are
+directed (road distances differ by direction), so each direction has its own
+row. The store is bounded: once it holds more than max_entries rows the least
+recently used ones are evicted.
+New entries and recency updates are buffered and written in one transaction
+per flush, never by rewriting the whole file.
+"""
+
+import os
+import sqlite3
+from typing import Dict, Iterable, Optional, Tuple
+
+# Rounding applied to coordinates in keys (6 decimals is ~0.1 m)
+COORDINATE_PRECISION = 6
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+_SQLITE_HEADER = b"SQLite format 3\x00"
+
+Coordinate = Tuple[float, float]
+CacheKey = Tuple[str, int, int, int, int]
+
+
+class DistanceCache:
+    """
+    SQLite distance store with LRU eviction and hit/miss statistics.
+
+    Args:
+        path: Database file (created if missing)
+        max_entries: Row limit enforced on flush
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                if f.read(len(_SQLITE_HEADER)) != _SQLITE_HEADER:
+                    raise ValueError(
+                        f"{path} is not a distance cache database.\n"
+                        "Legacy JSON caches keyed by location ID are no longer read; "
+                        "delete the file or pass --cache with a new path."
+                    )
+
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._pending: Dict[CacheKey, float] = {}
+        self._touched: Dict[CacheKey, None] = {}
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS distances (
+                method TEXT NOT NULL,
+                lat1 INTEGER NOT NULL,
+                lon1 INTEGER NOT NULL,
+                lat2 INTEGER NOT NULL,
+                lon2 INTEGER NOT NULL,
+                distance REAL NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (method, lat1, lon1, lat2, lon2)
+            ) WITHOUT ROWID
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS distances_last_used ON distances (last_used)"
+        )
+        self.conn.commit()
+
+        row = self.conn.execute("SELECT MAX(last_used) FROM distances").fetchone()
+        self._clock = row[0] or 0
+
+    @staticmethod
+    def make_key(method: str, origin: Coordinate, destination: Coordinate) -> CacheKey:
+        """
+        Build the cache key for a directed leg.
+
+        Coordinates are stored as fixed-point integers.
+        """
+        scale = 10**COORDINATE_PRECISION
+        a = (round(origin[0] * scale), round(origin[1] * scale))
+        b = (round(destination[0] * scale), round(destination[1] * scale))
+        return (method, a[0], a[1], b[0], b[1])
+
+    def _lookup(self, key: CacheKey) -> Optional[float]:
+        distance = self._pending.get(key)
+        if distance is None:
+            row = self.conn.execute(
+                "SELECT distance FROM distances "
+                "WHERE method=? AND lat1=? AND lon1=? AND lat2=? AND lon2=?",
+                key,
+            ).fetchone()
+            distance = row[0] if row else None
+        return distance
+
+    def peek(self, method: str, origin: Coordinate, destination: Coordinate) -> Optional[float]:
+        """Like get, but without touching statistics or recency."""
+        return self._lookup(self.make_key(method, origin, destination))
+
+    def get(self, method: str, origin: Coordinate, destination: Coordinate) -> Optional[float]:
+        """Return the cached distance for a leg, or None on a miss."""
+        key = self.make_key(method, origin, destination)
+        distance = self._lookup(key)
+
+        if distance is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched[key] = None
+        return distance
+
+    def put(
+        self, method: str, origin: Coordinate, destination: Coordinate, distance: float
+    ) -> None:
+        """Buffer a distance; it is written on the next flush."""
+        self._pending[self.make_key(method, origin, destination)] = float(distance)
+
+    def put_many(
+        self, method: str, entries: Iterable[Tuple[Coordinate, Coordinate, float]]
+    ) -> None:
+        for origin, destination, distance in entries:
+            self.put(method, origin, destination, distance)
+
+    def flush(self) -> None:
+        """Write buffered entries and recency updates atomically, then evict."""
+        if not self._pending and not self._touched:
+            return
+
+        self._clock += 1
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO distances "
+                "(method, lat1, lon1, lat2, lon2, distance, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key + (distance, self._clock) for key, distance in self._pending.items()),
+            )
+            self.conn.executemany(
+                "UPDATE distances SET last_used=? "
+                "WHERE method=? AND lat1=? AND lon1=? AND lat2=? AND lon2=?",
+                ((self._clock,) + key for key in self._touched if key not in self._pending),
+            )
+            self._evict()
+
+        self._pending.clear()
+        self._touched.clear()
+
+    def _evict(self) -> None:
+        """Delete the least recently used rows above max_entries."""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM distances").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        cursor = self.conn.execute(
+            "DELETE FROM distances WHERE (method, lat1, lon1, lat2, lon2) IN ("
+            "SELECT method, lat1, lon1, lat2, lon2 FROM distances "
+            "ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += cursor.rowcount
+
+    def __len__(self) -> int:
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM distances").fetchone()
+        unsaved = 0
+        for key in self._pending:
+            row = self.conn.execute(
+                "SELECT 1 FROM distances "
+                "WHERE method=? AND lat1=? AND lon1=? AND lat2=? AND lon2=?",
+                key,
+            ).fetchone()
+            unsaved += row is None
+        return count + unsaved
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this session plus the current store size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
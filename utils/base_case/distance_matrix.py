@@ -0,0 +1,618 @@
+"""
+Vectorized distance matrix engine for the solution validator.
+
+Builds all pairwise distances between instance locations at once with NumPy
+broadcasting and exposes them through a compact integer ID table, so route
+legs become array indexing instead of per-pair trigonometry.
+
+For instances too large for an N×N table, SparseDistanceMatrix keeps only
+selected pairs (each location's k nearest neighbors plus complete depot and
+station rows) in CSR arrays, and SparseLegTable answers the other legs with
+haversine distances.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+# WGS-84 ellipsoid, the default model of geopy.distance.geodesic
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+
+# Above this many locations the dense N×N table is not materialized and leg
+# distances are computed on demand from the coordinate arrays instead.
+DENSE_MATRIX_LIMIT = 4000
+
+# Rows per block when filling a dense matrix (bounds temporary memory)
+_BLOCK_ROWS = 256
+
+
+def haversine_pairs(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Element-wise haversine distance in kilometers.
+
+    Args:
+        lat1, lon1: Origin coordinates in degrees (broadcastable arrays)
+        lat2, lon2: Destination coordinates in degrees (broadcastable arrays)
+
+    Returns:
+        Array of great-circle distances in kilometers
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2)
+    )
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def geodesic_pairs(
+    lat1, lon1, lat2, lon2, tolerance: float = 1e-12, max_iterations: int = 200
+) -> np.ndarray:
+    """
+    Element-wise geodesic distance on the WGS-84 ellipsoid in kilometers.
+
+    Batched Vincenty inverse solution. Pairs that do not converge (nearly
+    antipodal points) are resolved with geopy, which is only imported then.
+
+    Args:
+        lat1, lon1: Origin coordinates in degrees (broadcastable arrays)
+        lat2, lon2: Destination coordinates in degrees (broadcastable arrays)
+        tolerance: Convergence threshold on the auxiliary longitude (radians)
+        max_iterations: Iteration limit before falling back to geopy
+
+    Returns:
+        Array of geodesic distances in kilometers
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (lat1, lon1, lat2, lon2))
+    )
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (v.ravel() for v in (lat1, lon1, lat2, lon2))
+    a = WGS84_A_KM
+    f = WGS84_F
+    b = (1 - f) * a
+
+    L = np.radians(lon2 - lon1)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    converged = np.zeros(L.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iterations):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt(
+                (cosU2 * sin_lam) ** 2
+                + (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2
+            )
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(
+                sin_sigma == 0, 0.0, cosU1 * cosU2 * sin_lam / sin_sigma
+            )
+            cos2_alpha = 1 - sin_alpha**2
+            # Equatorial lines have cos2_alpha == 0
+            cos_2sigma_m = np.where(
+                cos2_alpha == 0, 0.0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha
+            )
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma
+                + C
+                * sin_sigma
+                * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m**2))
+            )
+            converged = np.abs(lam - lam_prev) < tolerance
+            if converged.all():
+                break
+
+    u_sq = cos2_alpha * (a**2 - b**2) / b**2
+    A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = (
+        B
+        * sin_sigma
+        * (
+            cos_2sigma_m
+            + B
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m**2)
+                - B
+                / 6
+                * cos_2sigma_m
+                * (-3 + 4 * sin_sigma**2)
+                * (-3 + 4 * cos_2sigma_m**2)
+            )
+        )
+    )
+    distances = b * A * (sigma - delta_sigma)
+    distances = np.where(sin_sigma == 0, 0.0, distances)
+
+    failed = ~converged | ~np.isfinite(distances)
+    if failed.any():
+        from geopy.distance import geodesic
+
+        for pos in np.flatnonzero(failed):
+            distances[pos] = geodesic(
+                (lat1[pos], lon1[pos]), (lat2[pos], lon2[pos])
+            ).kilometers
+
+    return distances.reshape(shape)
+
+
+PAIR_FUNCTIONS = {
+    "haversine": haversine_pairs,
+    "geopy": geodesic_pairs,
+}
+
+
+def pairwise_matrix(latitudes, longitudes, method: str = "haversine") -> np.ndarray:
+    """
+    Build the dense N×N distance matrix for a set of coordinates.
+
+    Args:
+        latitudes: Array of N latitudes in degrees
+        longitudes: Array of N longitudes in degrees
+        method: "haversine" or "geopy" (batched geodesic)
+
+    Returns:
+        (N, N) float array of distances in kilometers
+    """
+    if method not in PAIR_FUNCTIONS:
+        raise ValueError(f"Unknown distance method: {method}")
+    pair_function = PAIR_FUNCTIONS[method]
+
+    lat = np.asarray(latitudes, dtype=float)
+    lon = np.asarray(longitudes, dtype=float)
+    n = lat.shape[0]
+    matrix = np.empty((n, n), dtype=float)
+
+    for start in range(0, n, _BLOCK_ROWS):
+        stop = min(start + _BLOCK_ROWS, n)
+        matrix[start:stop] = pair_function(
+            lat[start:stop, None], lon[start:stop, None], lat[None, :], lon[None, :]
+        )
+
+    return matrix
+
+
+class DistanceMatrix:
+    """
+    Distance table indexed through a compact integer ID table.
+
+    Every location gets a dense integer index; legacy aliases (numeric IDs,
+    "CDA", ...) resolve to the same index as their StandardizedID. Distances
+    are held in a dense (N, N) array, or — for instances above
+    DENSE_MATRIX_LIMIT locations built from coordinates — computed on demand
+    for the requested legs only.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        distances: Optional[np.ndarray] = None,
+        aliases: Optional[Dict[Hashable, str]] = None,
+        latitudes: Optional[np.ndarray] = None,
+        longitudes: Optional[np.ndarray] = None,
+        method: Optional[str] = None,
+    ):
+        self.ids = [str(loc_id) for loc_id in ids]
+        self.index: Dict[Hashable, int] = {
+            loc_id: i for i, loc_id in enumerate(self.ids)
+        }
+        for alias, target in (aliases or {}).items():
+            self.index[alias] = self.index[str(target)]
+
+        self.distances = distances
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.method = method
+
+        if distances is None and (latitudes is None or method is None):
+            raise ValueError(
+                "DistanceMatrix needs either a distance array or coordinates and a method"
+            )
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        ids: Sequence[str],
+        latitudes: Iterable[float],
+        longitudes: Iterable[float],
+        method: str = "haversine",
+        aliases: Optional[Dict[Hashable, str]] = None,
+        dense_limit: int = DENSE_MATRIX_LIMIT,
+    ) -> "DistanceMatrix":
+        """
+        Build a distance table from coordinate arrays.
+
+        Args:
+            ids: Location IDs in index order
+            latitudes: Latitudes in degrees, aligned with ids
+            longitudes: Longitudes in degrees, aligned with ids
+            method: "haversine" or "geopy"
+            aliases: Optional mapping of alternative IDs to entries of ids
+            dense_limit: Largest instance for which the N×N table is built
+
+        Returns:
+            DistanceMatrix over the given locations
+        """
+        if method not in PAIR_FUNCTIONS:
+            raise ValueError(f"Unknown distance method: {method}")
+
+        lat = np.asarray(list(latitudes), dtype=float)
+        lon = np.asarray(list(longitudes), dtype=float)
+        distances = None
+        if len(lat) <= dense_limit:
+            distances = pairwise_matrix(lat, lon, method)
+
+        return cls(
+            ids,
+            distances=distances,
+            aliases=aliases,
+            latitudes=lat,
+            longitudes=lon,
+            method=method,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, loc_id) -> bool:
+        return loc_id in self.index
+
+    @property
+    def is_dense(self) -> bool:
+        return self.distances is not None
+
+    def lookup(self, loc_id) -> int:
+        """Return the integer index of a location ID or alias."""
+        return self.index[loc_id]
+
+    def indices(self, loc_ids: Iterable) -> np.ndarray:
+        """Translate a sequence of location IDs into an integer index array."""
+        index = self.index
+        return np.fromiter((index[loc_id] for loc_id in loc_ids), dtype=np.intp)
+
+    def leg_distances(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """
+        Distances for aligned arrays of origin/destination indices.
+
+        Args:
+            origins: Integer index array
+            destinations: Integer index array of the same shape
+
+        Returns:
+            Float array of distances in kilometers
+        """
+        if self.distances is not None:
+            return self.distances[origins, destinations]
+
+        return PAIR_FUNCTIONS[self.method](
+            self.latitudes[origins],
+            self.longitudes[origins],
+            self.latitudes[destinations],
+            self.longitudes[destinations],
+        )
+
+    def route_legs(self, route: Sequence) -> np.ndarray:
+        """Distances of consecutive legs along a route of location IDs."""
+        idx = self.indices(route)
+        return self.leg_distances(idx[:-1], idx[1:])
+
+    def pair_distances(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """
+        Stored distances for aligned index arrays, NaN where unknown.
+
+        Pairs stored only in the reverse direction are mirrored; negative
+        indices (locations absent from the matrix) give NaN.
+        """
+        origins = np.asarray(origins, dtype=np.intp)
+        destinations = np.asarray(destinations, dtype=np.intp)
+        distances = np.full(origins.shape, np.nan)
+        known = (origins >= 0) & (destinations >= 0)
+        distances[known] = self.distances[origins[known], destinations[known]]
+
+        # Symmetric fallback for pairs only stored in the reverse direction
+        reverse = known & np.isnan(distances)
+        distances[reverse] = self.distances[destinations[reverse], origins[reverse]]
+        return distances
+
+    def distance(self, loc1, loc2) -> float:
+        """Distance between two location IDs (or aliases) in kilometers."""
+        i = self.index[loc1]
+        j = self.index[loc2]
+        if self.distances is not None:
+            return float(self.distances[i, j])
+        return float(self.leg_distances(np.array([i]), np.array([j]))[0])
+
+    @classmethod
+    def from_entries(
+        cls, origins: Sequence, destinations: Sequence, values: Sequence[float]
+    ) -> "DistanceMatrix":
+        """
+        Build a dense table from aligned (origin, destination, distance) columns.
+
+        Locations are indexed in order of first appearance; pairs that are not
+        listed are stored as NaN.
+
+        Args:
+            origins: Origin IDs
+            destinations: Destination IDs, aligned with origins
+            values: Distances, aligned with origins
+
+        Returns:
+            DistanceMatrix over every ID that appears in either column
+        """
+        index = dict.fromkeys(origins)
+        index.update(dict.fromkeys(destinations))
+        ids = [str(loc_id) for loc_id in index]
+        for i, loc_id in enumerate(index):
+            index[loc_id] = i
+
+        origin_idx = np.fromiter((index[o] for o in origins), dtype=np.intp)
+        destination_idx = np.fromiter((index[d] for d in destinations), dtype=np.intp)
+
+        distances = np.full((len(ids), len(ids)), np.nan)
+        distances[origin_idx, destination_idx] = np.asarray(values, dtype=float)
+
+        return cls(ids, distances=distances)
+
+    def has_origin(self, loc_id) -> bool:
+        """Check whether any distance is known from a location."""
+        i = self.index.get(loc_id)
+        return i is not None and bool(np.isfinite(self.distances[i]).any())
+
+    def known_origins(self) -> List[str]:
+        """IDs that have at least one known outgoing distance."""
+        rows = np.isfinite(self.distances).any(axis=1)
+        return [self.ids[i] for i in np.flatnonzero(rows)]
+
+    def known_destinations(self, loc_id) -> List[str]:
+        """IDs with a known distance from the given location."""
+        row = np.isfinite(self.distances[self.index[loc_id]])
+        return [self.ids[j] for j in np.flatnonzero(row)]
+
+
+class SparseDistanceMatrix:
+    """
+    Distances for selected location pairs in compressed sparse row arrays.
+
+    Row i lists its known destinations in indices[indptr[i]:indptr[i + 1]]
+    (ascending) with the distances in data. Lookups of many legs at once go
+    through one binary search over the flattened (row, column) keys.
+
+    Args:
+        ids: Location IDs in index order
+        indptr: (N + 1,) row offsets into indices and data
+        indices: Destination index of each stored distance
+        data: Stored distances in kilometers
+    """
+
+    def __init__(
+        self, ids: Sequence[str], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray
+    ):
+        self.ids = [str(loc_id) for loc_id in ids]
+        self.index: Dict[Hashable, int] = {loc_id: i for i, loc_id in enumerate(self.ids)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data)
+        if len(self.indptr) != len(self.ids) + 1 or len(self.indices) != len(self.data):
+            raise ValueError("Sparse matrix arrays do not match its ids")
+
+        rows = np.repeat(np.arange(len(self.ids), dtype=np.int64), np.diff(self.indptr))
+        self._keys = rows * len(self.ids) + self.indices
+
+    @classmethod
+    def from_entries(
+        cls, origins: Sequence, destinations: Sequence, values: Sequence[float], ids=None
+    ) -> "SparseDistanceMatrix":
+        """
+        Build from aligned (origin, destination, distance) columns.
+
+        Locations are indexed in order of first appearance unless ids is
+        given; a pair listed twice keeps its last distance.
+        """
+        if ids is None:
+            index = dict.fromkeys(origins)
+            index.update(dict.fromkeys(destinations))
+            ids = list(index)
+        index = {loc_id: i for i, loc_id in enumerate(ids)}
+
+        rows = np.fromiter((index[o] for o in origins), dtype=np.int64, count=len(origins))
+        columns = np.fromiter(
+            (index[d] for d in destinations), dtype=np.int64, count=len(destinations)
+        )
+        return cls._from_coo(ids, rows, columns, np.asarray(values, dtype=float))
+
+    @classmethod
+    def _from_coo(cls, ids, rows, columns, values) -> "SparseDistanceMatrix":
+        """CSR arrays from unordered (row, column, value) triplets."""
+        n = len(ids)
+        keys = rows * n + columns
+        # Stable sort, then keep the last of repeated keys
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        keys = keys[last]
+        indptr = np.searchsorted(keys, np.arange(n + 1, dtype=np.int64) * n)
+        return cls(ids, indptr, keys % max(n, 1), values[order][last])
+
+    @classmethod
+    def from_dense(
+        cls, matrix: "DistanceMatrix", k: int, full_rows: Iterable[str] = ()
+    ) -> "SparseDistanceMatrix":
+        """
+        Keep each location's k nearest destinations of a dense matrix.
+
+        Args:
+            matrix: Dense DistanceMatrix
+            k: Destinations kept per row (the location itself excluded)
+            full_rows: IDs whose rows are kept complete (depots, stations)
+        """
+        if not matrix.is_dense:
+            raise ValueError("from_dense needs a dense distance matrix")
+        n = len(matrix)
+        full = np.zeros(n, dtype=bool)
+        full[[matrix.index[loc_id] for loc_id in full_rows]] = True
+        k = min(k, n - 1)
+
+        rows, columns, values = [], [], []
+        for start in range(0, n, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, n)
+            block = np.array(matrix.distances[start:stop], dtype=float)
+            ranked = np.where(np.isnan(block), np.inf, block)
+            ranked[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            keep = np.zeros(block.shape, dtype=bool)
+            if k > 0:
+                nearest = np.argpartition(ranked, k - 1, axis=1)[:, :k]
+                np.put_along_axis(keep, nearest, True, axis=1)
+            keep |= full[start:stop, None]
+            keep &= np.isfinite(block)
+
+            block_rows, block_columns = np.nonzero(keep)
+            rows.append(block_rows + start)
+            columns.append(block_columns)
+            values.append(block[block_rows, block_columns])
+
+        return cls._from_coo(
+            matrix.ids,
+            np.concatenate(rows).astype(np.int64),
+            np.concatenate(columns).astype(np.int64),
+            np.concatenate(values),
+        )
+
+    def keep_nearest(self, k: int, full_rows: Iterable[str] = ()) -> "SparseDistanceMatrix":
+        """Copy that keeps only the k nearest destinations of rows not in full_rows."""
+        n = len(self.ids)
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        columns = self.indices.astype(np.int64)
+        full = np.zeros(n, dtype=bool)
+        full[[self.index[loc_id] for loc_id in full_rows]] = True
+
+        # Rank the destinations of each row by distance, the location itself last
+        ranked = np.where(rows == columns, np.inf, self.data)
+        order = np.lexsort((ranked, rows))
+        rank = np.arange(len(order)) - self.indptr[rows[order]]
+        keep = np.zeros(len(order), dtype=bool)
+        keep[order] = (rank < k) & np.isfinite(ranked[order])
+        keep |= full[rows]
+        return self._from_coo(self.ids, rows[keep], columns[keep], self.data[keep])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, loc_id) -> bool:
+        return loc_id in self.index
+
+    @property
+    def is_dense(self) -> bool:
+        return False
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored distances."""
+        return len(self.data)
+
+    def _find(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """Stored distances (NaN where absent) for index arrays known to be valid."""
+        keys = origins.astype(np.int64) * len(self.ids) + destinations
+        positions = np.searchsorted(self._keys, keys)
+        positions = np.minimum(positions, max(len(self._keys) - 1, 0))
+        found = (
+            self._keys[positions] == keys if len(self._keys) else np.zeros(keys.shape, bool)
+        )
+        distances = np.full(keys.shape, np.nan)
+        distances[found] = self.data[positions[found]]
+        return distances
+
+    def pair_distances(self, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """
+        Stored distances for aligned index arrays, NaN where unknown.
+
+        Pairs stored only in the reverse direction are mirrored; negative
+        indices (locations absent from the matrix) give NaN.
+        """
+        origins = np.asarray(origins, dtype=np.intp)
+        destinations = np.asarray(destinations, dtype=np.intp)
+        distances = np.full(origins.shape, np.nan)
+        known = (origins >= 0) & (destinations >= 0)
+        distances[known] = self._find(origins[known], destinations[known])
+
+        reverse = known & np.isnan(distances)
+        distances[reverse] = self._find(destinations[reverse], origins[reverse])
+        return distances
+
+    def distance(self, loc1, loc2) -> float:
+        """Stored distance between two location IDs (NaN when not stored)."""
+        i = self.index[loc1]
+        j = self.index[loc2]
+        return float(self.pair_distances(np.array([i]), np.array([j]))[0])
+
+    def has_origin(self, loc_id) -> bool:
+        """Check whether any distance is stored from a location."""
+        i = self.index.get(loc_id)
+        return i is not None and bool(self.indptr[i + 1] > self.indptr[i])
+
+    def known_origins(self) -> List[str]:
+        """IDs that have at least one stored outgoing distance."""
+        return [self.ids[i] for i in np.flatnonzero(np.diff(self.indptr) > 0)]
+
+    def known_destinations(self, loc_id) -> List[str]:
+        """IDs with a stored distance from the given location."""
+        i = self.index[loc_id]
+        return [self.ids[j] for j in self.indices[self.indptr[i] : self.indptr[i + 1]]]
+
+
+class SparseLegTable:
+    """
+    Node-indexed distances from a sparse matrix with a haversine fallback.
+
+    Supports table[origins, destinations] with (broadcastable) node index
+    arrays like a dense table. Legs the matrix does not store are computed
+    from the node coordinates and counted in fallback_legs; legs between
+    nodes without coordinates stay NaN.
+
+    Args:
+        matrix: SparseDistanceMatrix (or dense DistanceMatrix)
+        rows: Matrix index of each node (-1 where absent)
+        latitudes, longitudes: Node coordinates in degrees (NaN if unknown)
+    """
+
+    def __init__(self, matrix, rows: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray):
+        self.matrix = matrix
+        self.rows = np.asarray(rows, dtype=np.intp)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.fallback_legs = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, key) -> np.ndarray:
+        origins, destinations = np.broadcast_arrays(*(np.asarray(k) for k in key))
+        distances = self.matrix.pair_distances(self.rows[origins], self.rows[destinations])
+        distances[origins == destinations] = 0.0
+
+        missing = np.isnan(distances)
+        if missing.any():
+            o = origins[missing]
+            d = destinations[missing]
+            fallback = haversine_pairs(
+                self.latitudes[o], self.longitudes[o], self.latitudes[d], self.longitudes[d]
+            )
+            distances[missing] = fallback
+            self.fallback_legs += int(np.isfinite(fallback).sum())
+        return distances
+
+    def item(self, origin: int, destination: int) -> float:
+        return float(self[np.array([origin]), np.array([destination])][0])
@@ -0,0 +1,434 @@
+"""
+Incremental solution validation for local search.
+
+IncrementalValidator loads a solution once and keeps per-route state: node
+sequence, load, distance and prefix sums of leg distances in both travel
+directions. Moves are evaluated from the legs they change plus prefix-sum
+differences for the segments they keep or reverse, so checking a move costs a
+handful of table lookups instead of a full validate_solution pass.
+
+Moves (positions index the route sequence, depot endpoints included, so the
+first client of a route is position 1):
+
+  two_opt(r, i, j)                         reverse r[i..j]
+  relocate(r1, i, r2, j)                   move r1[i] to just before r2[j]
+  swap(r1, i, r2, j)                       exchange r1[i] and r2[j]
+  cross_exchange(r1, i1, j1, r2, i2, j2)   exchange r1[i1..j1] and r2[i2..j2]
+
+Usage:
+  incremental = IncrementalValidator(SolutionValidator())
+  delta = incremental.evaluate("relocate", 0, 3, 2, 1)
+  if delta["feasible"] and delta["distance_delta"] < 0:
+      incremental.apply("relocate", 0, 3, 2, 1)
+  ...
+  incremental.undo()
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from csv_table import Table
+
+MOVES = ("two_opt", "relocate", "swap", "cross_exchange")
+
+
+class _LazyTable:
+    """Index-compatible view over a DistanceMatrix that computes legs on demand."""
+
+    def __init__(self, matrix, node_indices: np.ndarray):
+        self.matrix = matrix
+        self.node_indices = node_indices
+
+    def __getitem__(self, key):
+        origins, destinations = key
+        return self.matrix.leg_distances(
+            self.node_indices[origins], self.node_indices[destinations]
+        )
+
+    def item(self, origin: int, destination: int) -> float:
+        return float(self[np.array([origin]), np.array([destination])][0])
+
+
+class _RouteState:
+    """Node sequence of one route with its cached totals and prefix sums."""
+
+    __slots__ = (
+        "vehicle_id",
+        "capacity",
+        "range",
+        "nodes",
+        "forward",
+        "backward",
+        "load_prefix",
+        "distance",
+        "load",
+        "feasible",
+    )
+
+
+class IncrementalValidator:
+    """
+    Per-route solution state with O(changed legs) move evaluation.
+
+    Feasibility covers the structural checks of validate_solution: vehicle
+    capacity and range per route, and every client visited exactly once by
+    routes that start and end at the same depot. Loads are the demands of the
+    clients on each route; the reported InitialLoad/DemandsSatisfied columns
+    are not part of the state.
+
+    Args:
+        validator: SolutionValidator with the instance and distance method loaded
+        solution_df: Initial solution as read by validator.read_table (defaults
+            to the validator's solution)
+    """
+
+    def __init__(self, validator, solution_df: Optional[Table] = None):
+        if solution_df is None:
+            solution_df = validator.solution_df
+        if solution_df is None:
+            raise ValueError("No solution loaded. Pass solution_df or a solution_file.")
+
+        self.validator = validator
+
+        # Nodes are depots first, then clients, both in instance order
+        self.node_ids = list(validator.depot_ids) + list(validator.client_ids)
+        self.num_depots = len(validator.depot_ids)
+        self.node_index = validator.location_index()
+
+        self.demand = [0] * self.num_depots + validator.client_demand_array.tolist()
+        self.table, self.symmetric = self._build_table()
+        self._leg = self.table.item
+
+        routes = validator.parse_solution(solution_df)
+        self.routes: List[_RouteState] = []
+        self.errors: List[str] = []
+        for vehicle_id, route_sequence, vehicle_number in zip(
+            routes["vehicle_id"], routes["route_sequence"], routes["vehicle_number"]
+        ):
+            unknown = [loc for loc in route_sequence if loc not in self.node_index]
+            if unknown:
+                raise ValueError(
+                    f"Route {vehicle_id} has invalid location: {unknown[0]}\n"
+                    "Incremental validation needs every stop to be a known depot or client."
+                )
+            nodes = [self.node_index[loc] for loc in route_sequence]
+            if (
+                len(nodes) < 2
+                or nodes[0] != nodes[-1]
+                or nodes[0] >= self.num_depots
+                or any(node < self.num_depots for node in nodes[1:-1])
+            ):
+                self.errors.append(
+                    f"Route {vehicle_id} must start and end at the same depot "
+                    "with only clients in between"
+                )
+            spec = validator.vehicle_specs[vehicle_number]
+            self.routes.append(
+                self._route_state(vehicle_id, spec["capacity"], spec["range"], nodes)
+            )
+
+        # Coverage: moves only permute clients, so this is fixed after loading
+        visits = np.bincount(
+            [node for route in self.routes for node in route.nodes[1:-1]],
+            minlength=len(self.node_ids),
+        )[self.num_depots :]
+        for k in np.flatnonzero(visits == 0):
+            self.errors.append(f"Client {validator.client_ids[k]} was not visited")
+        for k in np.flatnonzero(visits > 1):
+            self.errors.append(
+                f"Client {validator.client_ids[k]} is visited {visits[k]} times"
+            )
+
+        self.route_of = [-1] * len(self.node_ids)
+        for r, route in enumerate(self.routes):
+            self._assign(r, route)
+
+        self.infeasible_routes = sum(not route.feasible for route in self.routes)
+        self.total_distance = float(sum(route.distance for route in self.routes))
+        self._undo_stack: List[List[Tuple[int, _RouteState]]] = []
+
+    def _build_table(self):
+        """Distance table over node indices and whether it is symmetric."""
+        engine = self.validator.distance_engine
+        if engine is not None and not engine.is_dense:
+            return _LazyTable(engine, engine.indices(self.node_ids)), True
+        if self.validator.has_sparse_matrix():
+            # Sparse matrices mirror reverse pairs and fall back to haversine
+            return self.validator.distance_table(lazy=True), True
+        if engine is not None:
+            return self.validator.distance_table(), True
+
+        table = self.validator.distance_table()
+        return table, bool(np.array_equal(table, table.T))
+
+    def _route_state(
+        self, vehicle_id: str, capacity: int, vehicle_range: int, nodes: List[int]
+    ) -> _RouteState:
+        """Build a route state, computing its prefix sums in one array pass."""
+        route = _RouteState()
+        route.vehicle_id = vehicle_id
+        route.capacity = capacity
+        route.range = vehicle_range
+        route.nodes = nodes
+
+        idx = np.asarray(nodes, dtype=np.intp)
+        legs = self.table[idx[:-1], idx[1:]]
+        route.forward = np.concatenate(([0.0], np.cumsum(legs))).tolist()
+        if self.symmetric:
+            route.backward = route.forward
+        else:
+            legs = self.table[idx[1:], idx[:-1]]
+            route.backward = np.concatenate(([0.0], np.cumsum(legs))).tolist()
+
+        demand = self.demand
+        route.load_prefix = np.concatenate(
+            ([0], np.cumsum([demand[node] for node in nodes]))
+        ).tolist()
+        route.distance = route.forward[-1]
+        route.load = route.load_prefix[-1]
+        route.feasible = route.load <= capacity and route.distance <= vehicle_range
+        return route
+
+    def _assign(self, r: int, route: _RouteState) -> None:
+        for node in route.nodes[1:-1]:
+            self.route_of[node] = r
+
+    @property
+    def coverage_ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def feasible(self) -> bool:
+        return self.coverage_ok and self.infeasible_routes == 0
+
+    def route_sequences(self) -> List[List[str]]:
+        """Current routes as lists of StandardizedIDs."""
+        return [[self.node_ids[node] for node in route.nodes] for route in self.routes]
+
+    # ------------------------------------------------------------------
+    # Move deltas: each returns [(route, distance_delta, load_delta), ...]
+    # with one entry per changed route
+    # ------------------------------------------------------------------
+
+    def _check_interior(self, r: int, *positions: int) -> List[int]:
+        nodes = self.routes[r].nodes
+        for position in positions:
+            if not 1 <= position <= len(nodes) - 2:
+                raise IndexError(
+                    f"Position {position} is not a client position of route "
+                    f"{self.routes[r].vehicle_id} (1..{len(nodes) - 2})"
+                )
+        return nodes
+
+    def _delta_two_opt(self, r: int, i: int, j: int):
+        if j < i:
+            i, j = j, i
+        route = self.routes[r]
+        n = self._check_interior(r, i, j)
+        leg = self._leg
+        delta = (
+            leg(n[i - 1], n[j])
+            + (route.backward[j] - route.backward[i])
+            + leg(n[i], n[j + 1])
+            - leg(n[i - 1], n[i])
+            - (route.forward[j] - route.forward[i])
+            - leg(n[j], n[j + 1])
+        )
+        return [(r, delta, 0)]
+
+    def _delta_relocate(self, r1: int, i: int, r2: int, j: int):
+        n1 = self._check_interior(r1, i)
+        n2 = self.routes[r2].nodes
+        if not 1 <= j <= len(n2) - 1:
+            raise IndexError(
+                f"Insertion position {j} is outside route "
+                f"{self.routes[r2].vehicle_id} (1..{len(n2) - 1})"
+            )
+        if r1 == r2 and j in (i, i + 1):
+            return [(r1, 0.0, 0)]
+
+        leg = self._leg
+        u = n1[i]
+        removal = leg(n1[i - 1], n1[i + 1]) - leg(n1[i - 1], u) - leg(u, n1[i + 1])
+        insertion = leg(n2[j - 1], u) + leg(u, n2[j]) - leg(n2[j - 1], n2[j])
+        if r1 == r2:
+            return [(r1, removal + insertion, 0)]
+        demand = self.demand[u]
+        return [(r1, removal, -demand), (r2, insertion, demand)]
+
+    def _delta_swap(self, r1: int, i: int, r2: int, j: int):
+        if r1 == r2 and j < i:
+            i, j = j, i
+        n1 = self._check_interior(r1, i)
+        n2 = self._check_interior(r2, j)
+        leg = self._leg
+        u, v = n1[i], n2[j]
+
+        if r1 == r2:
+            if i == j:
+                return [(r1, 0.0, 0)]
+            if j == i + 1:
+                delta = (
+                    leg(n1[i - 1], v)
+                    + leg(v, u)
+                    + leg(u, n1[j + 1])
+                    - leg(n1[i - 1], u)
+                    - leg(u, v)
+                    - leg(v, n1[j + 1])
+                )
+                return [(r1, delta, 0)]
+
+        delta1 = (
+            leg(n1[i - 1], v) + leg(v, n1[i + 1]) - leg(n1[i - 1], u) - leg(u, n1[i + 1])
+        )
+        delta2 = (
+            leg(n2[j - 1], u) + leg(u, n2[j + 1]) - leg(n2[j - 1], v) - leg(v, n2[j + 1])
+        )
+        if r1 == r2:
+            return [(r1, delta1 + delta2, 0)]
+        load_delta = self.demand[v] - self.demand[u]
+        return [(r1, delta1, load_delta), (r2, delta2, -load_delta)]
+
+    def _delta_cross_exchange(self, r1: int, i1: int, j1: int, r2: int, i2: int, j2: int):
+        if r1 == r2:
+            raise ValueError("cross_exchange needs two different routes")
+        route1, route2 = self.routes[r1], self.routes[r2]
+        n1 = self._check_interior(r1, i1, j1)
+        n2 = self._check_interior(r2, i2, j2)
+        if j1 < i1 or j2 < i2:
+            raise ValueError("cross_exchange segments must satisfy i <= j")
+
+        leg = self._leg
+        segment1 = route1.forward[j1] - route1.forward[i1]
+        segment2 = route2.forward[j2] - route2.forward[i2]
+        delta1 = (
+            leg(n1[i1 - 1], n2[i2])
+            + segment2
+            + leg(n2[j2], n1[j1 + 1])
+            - leg(n1[i1 - 1], n1[i1])
+            - segment1
+            - leg(n1[j1], n1[j1 + 1])
+        )
+        delta2 = (
+            leg(n2[i2 - 1], n1[i1])
+            + segment1
+            + leg(n1[j1], n2[j2 + 1])
+            - leg(n2[i2 - 1], n2[i2])
+            - segment2
+            - leg(n2[j2], n2[j2 + 1])
+        )
+        load1 = route1.load_prefix[j1 + 1] - route1.load_prefix[i1]
+        load2 = route2.load_prefix[j2 + 1] - route2.load_prefix[i2]
+        return [(r1, delta1, load2 - load1), (r2, delta2, load1 - load2)]
+
+    # ------------------------------------------------------------------
+    # Move application: each returns {route: new node list}
+    # ------------------------------------------------------------------
+
+    def _nodes_two_opt(self, r: int, i: int, j: int):
+        if j < i:
+            i, j = j, i
+        n = self.routes[r].nodes
+        return {r: n[:i] + n[i : j + 1][::-1] + n[j + 1 :]}
+
+    def _nodes_relocate(self, r1: int, i: int, r2: int, j: int):
+        n1 = list(self.routes[r1].nodes)
+        u = n1.pop(i)
+        if r1 == r2:
+            n1.insert(j if j <= i else j - 1, u)
+            return {r1: n1}
+        n2 = self.routes[r2].nodes
+        return {r1: n1, r2: n2[:j] + [u] + n2[j:]}
+
+    def _nodes_swap(self, r1: int, i: int, r2: int, j: int):
+        n1 = list(self.routes[r1].nodes)
+        n2 = n1 if r1 == r2 else list(self.routes[r2].nodes)
+        n1[i], n2[j] = n2[j], n1[i]
+        return {r1: n1, r2: n2}
+
+    def _nodes_cross_exchange(self, r1: int, i1: int, j1: int, r2: int, i2: int, j2: int):
+        n1, n2 = self.routes[r1].nodes, self.routes[r2].nodes
+        return {
+            r1: n1[:i1] + n2[i2 : j2 + 1] + n1[j1 + 1 :],
+            r2: n2[:i2] + n1[i1 : j1 + 1] + n2[j2 + 1 :],
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def evaluate(self, move: str, *args: int) -> Dict:
+        """
+        Evaluate a move without changing the state.
+
+        Args:
+            move: One of MOVES
+            *args: Route indices and positions of the move (see module docstring)
+
+        Returns:
+            Dict with "feasible" (whole solution after the move) and
+            "distance_delta" (change of total distance in kilometers)
+        """
+        if move not in MOVES:
+            raise ValueError(f"Unknown move: {move}. Choose from {', '.join(MOVES)}")
+
+        changes = getattr(self, f"_delta_{move}")(*args)
+
+        distance_delta = 0.0
+        infeasible = self.infeasible_routes
+        for r, route_distance_delta, load_delta in changes:
+            route = self.routes[r]
+            distance_delta += route_distance_delta
+            infeasible -= not route.feasible
+            infeasible += not (
+                route.load + load_delta <= route.capacity
+                and route.distance + route_distance_delta <= route.range
+            )
+
+        return {
+            "feasible": self.coverage_ok and infeasible == 0,
+            "distance_delta": float(distance_delta),
+        }
+
+    def apply(self, move: str, *args: int) -> Dict:
+        """
+        Apply a move; it can be reverted with undo.
+
+        Touched routes are rebuilt from their new node sequences, so the state
+        never accumulates rounding drift from evaluated deltas.
+
+        Returns:
+            The evaluate result of the move
+        """
+        result = self.evaluate(move, *args)
+        new_nodes = getattr(self, f"_nodes_{move}")(*args)
+        self._undo_stack.append(self._replace(new_nodes))
+        return result
+
+    def _replace(self, new_nodes: Dict[int, List[int]]) -> List[Tuple[int, _RouteState]]:
+        previous = []
+        for r, nodes in new_nodes.items():
+            old = self.routes[r]
+            route = self._route_state(old.vehicle_id, old.capacity, old.range, nodes)
+            previous.append((r, old))
+            self._install(r, route)
+        return previous
+
+    def _install(self, r: int, route: _RouteState) -> None:
+        old = self.routes[r]
+        self.infeasible_routes += (not route.feasible) - (not old.feasible)
+        self.total_distance += route.distance - old.distance
+        self.routes[r] = route
+        self._assign(r, route)
+
+    def undo(self) -> None:
+        """Revert the most recently applied move."""
+        if not self._undo_stack:
+            raise IndexError("No applied move to undo")
+        for r, route in self._undo_stack.pop():
+            self._install(r, route)
+
+    def commit(self) -> None:
+        """Forget the undo history (keeps memory flat in long searches)."""
+        self._undo_stack.clear()
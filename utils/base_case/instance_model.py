@@ -0,0 +1,313 @@
+"""
+Compact integer-indexed instance model.
+
+Every location of an instance (depots, clients and, in Project C, stations)
+is interned once into a dense integer node ID. Coordinates, demands and a
+node kind code live in flat arrays indexed by node ID, and a single alias
+table maps every accepted spelling of a location to its node:
+
+- StandardizedIDs: CD01, C001, E001
+- numeric depot IDs (1 and "1") and legacy depot letters (CDA = depot 1,
+  CDB = depot 2, ...)
+- unpadded or lowercase IDs (CD1, c1, e2) and bare client numbers ("7"
+  when no depot 7 exists), resolved through normalize_id
+
+Route checks translate a route into node IDs once and work on integer
+arrays from there (distance table lookups, kind masks, visit counts).
+
+Usage:
+  nodes = NodeTable()
+  nodes.add(DEPOT, ["CD01"], [4.6], [-74.1], numeric_ids=[1])
+  nodes.add(CLIENT, ["C001", "C002"], lats, lons, demands=[10, 5])
+  nodes.indices(["CDA", "C1", "C002", "X9"])  # -> [0, 1, 2, -1]
+"""
+
+import re
+import string
+from itertools import chain
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Node kind codes (NodeTable.kind)
+DEPOT, CLIENT, STATION, TOLL = 0, 1, 2, 3
+NODE_KINDS = ("depot", "client", "station", "toll")
+
+# Prefixed location IDs: depots (CD), clients (C), stations (E) and tolls (P),
+# with the zero padding of their StandardizedIDs
+_PREFIXED_ID = re.compile(r"^(CD|C|E|P)0*(\d+)$", re.IGNORECASE)
+_ID_WIDTH = {"CD": 2, "C": 3, "E": 3, "P": 3}
+
+
+def normalize_id(loc_id) -> str:
+    """
+    Standardize the spelling of a location ID without an instance.
+
+    Unpadded or lowercase prefixed IDs (c1, CD1, e2, P14) become C001, CD01,
+    E002, P014 and bare numbers become client IDs (7 → C007). Depot numbers
+    and legacy depot letters depend on the instance and are resolved by
+    NodeTable. Anything else is returned unchanged.
+    """
+    loc_id = str(loc_id)
+    if loc_id.isdigit():
+        return f"C{int(loc_id):03d}"
+
+    match = _PREFIXED_ID.match(loc_id)
+    if match:
+        prefix = match.group(1).upper()
+        return f"{prefix}{int(match.group(2)):0{_ID_WIDTH[prefix]}d}"
+
+    return loc_id
+
+
+class NodeTable:
+    """
+    Interned locations with flat attribute arrays.
+
+    Attributes:
+        ids: StandardizedID per node, in node order
+        index: Every known alias mapped to its node
+        kind: Node kind code per node (DEPOT, CLIENT, STATION)
+        latitude, longitude: Coordinates per node (NaN when unknown)
+        demand: Demand per node (0 for non-clients)
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[Hashable, int] = {}
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.latitude = np.zeros(0)
+        self.longitude = np.zeros(0)
+        self.demand = np.zeros(0, dtype=int)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(
+        self,
+        kind: int,
+        ids: Sequence[str],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        demands: Optional[Sequence[int]] = None,
+        numeric_ids: Optional[Sequence[int]] = None,
+    ) -> range:
+        """
+        Append locations of one kind.
+
+        Args:
+            kind: DEPOT, CLIENT or STATION
+            ids: StandardizedIDs
+            latitudes, longitudes: Coordinates aligned with ids (NaN if unknown)
+            demands: Client demands aligned with ids (default 0)
+            numeric_ids: Numeric depot IDs; registers the number (int and
+                string) and the legacy letter alias (1 → CDA) of each depot
+
+        Returns:
+            Node IDs of the added locations
+        """
+        first = len(self.ids)
+        nodes = range(first, first + len(ids))
+        self.ids.extend(ids)
+
+        for node, loc_id in zip(nodes, ids):
+            self.index.setdefault(loc_id, node)
+            self.index.setdefault(normalize_id(loc_id), node)
+        if numeric_ids is not None:
+            for node, number in zip(nodes, (int(n) for n in numeric_ids)):
+                self.index.setdefault(number, node)
+                self.index.setdefault(str(number), node)
+                if 1 <= number <= len(string.ascii_uppercase):
+                    self.index.setdefault("CD" + string.ascii_uppercase[number - 1], node)
+
+        if demands is None:
+            demands = np.zeros(len(ids), dtype=int)
+        self.kind = np.concatenate([self.kind, np.full(len(ids), kind, dtype=np.int8)])
+        self.latitude = np.concatenate([self.latitude, np.asarray(latitudes, dtype=float)])
+        self.longitude = np.concatenate([self.longitude, np.asarray(longitudes, dtype=float)])
+        self.demand = np.concatenate([self.demand, np.asarray(demands, dtype=int)])
+        return nodes
+
+    def lookup(self, loc_id) -> int:
+        """Node of a location ID in any accepted spelling, or -1 if unknown."""
+        node = self.index.get(loc_id)
+        if node is None:
+            node = self.index.get(normalize_id(loc_id), -1)
+        return node
+
+    def indices(self, loc_ids: Iterable) -> np.ndarray:
+        """Nodes of several location IDs (-1 for unknown ones)."""
+        index = self.index
+        lookup = self.lookup
+        return np.array(
+            [index[loc] if loc in index else lookup(loc) for loc in loc_ids], dtype=np.intp
+        )
+
+    def standard_id(self, loc_id) -> str:
+        """StandardizedID of a known location, or the normalized spelling otherwise."""
+        node = self.lookup(loc_id)
+        return self.ids[node] if node >= 0 else normalize_id(loc_id)
+
+    def nodes_of_kind(self, kind: int) -> np.ndarray:
+        """Node IDs of one kind, in node order."""
+        return np.flatnonzero(self.kind == kind)
+
+
+class RouteStops:
+    """
+    The stops of many routes interned into one flat node array.
+
+    Route-level checks run on the flat array at once; results are per route
+    (arrays aligned with the routes) or per flagged stop.
+
+    Client stops are client nodes and unknown IDs starting with "C" (which
+    expect a demand of 0). The first len(demands[r]) client stops of route r
+    are checked against its demands and count as visits; any further client
+    stops lack a demand value.
+
+    Args:
+        nodes: NodeTable of the instance
+        sequences: Stop IDs of each route, in visit order
+        demands: Delivered demand per client stop of each route
+    """
+
+    def __init__(self, nodes: NodeTable, sequences: Sequence[list], demands: Sequence[list]):
+        self.nodes = nodes
+        self.sequences = sequences
+        num_routes = len(sequences)
+
+        lengths = np.fromiter(map(len, sequences), dtype=np.intp, count=num_routes)
+        self.starts = np.concatenate([[0], np.cumsum(lengths)]).astype(np.intp)
+        self.route_of = np.repeat(np.arange(num_routes), lengths)
+
+        flat = list(chain.from_iterable(sequences))
+        self.stop_nodes = nodes.indices(flat)
+        known = self.stop_nodes >= 0
+        unknown = np.flatnonzero(~known)
+        self.has_unknown = np.bincount(self.route_of[unknown], minlength=num_routes) > 0
+
+        is_client = np.zeros(len(flat), dtype=bool)
+        is_client[known] = nodes.kind[self.stop_nodes[known]] == CLIENT
+        is_client[unknown] = [str(flat[k]).startswith("C") for k in unknown]
+
+        # Client stops with their route and position among the route's client stops
+        self.client_stops = np.flatnonzero(is_client)
+        self.client_route = self.route_of[self.client_stops]
+        clients_before = np.concatenate([[0], np.cumsum(is_client)])[self.starts[:-1]]
+        rank = np.cumsum(is_client)[self.client_stops] - 1 - clients_before[self.client_route]
+
+        demand_counts = np.fromiter(map(len, demands), dtype=np.intp, count=num_routes)
+        self.demands = np.array(list(chain.from_iterable(demands)))
+        self.demand_position = (
+            np.concatenate([[0], np.cumsum(demand_counts)])[self.client_route] + rank
+        ).astype(np.intp)
+        self.checked = rank < demand_counts[self.client_route]
+
+    def route_nodes(self, r: int) -> np.ndarray:
+        """Node IDs of the stops of route r (-1 for unknown stops)."""
+        return self.stop_nodes[self.starts[r] : self.starts[r + 1]]
+
+    def clients_per_route(self) -> List[int]:
+        """Number of client stops of each route."""
+        return np.bincount(self.client_route, minlength=len(self.sequences)).tolist()
+
+    def visits(self, client_nodes: range) -> np.ndarray:
+        """Checked visits per client (aligned with client_nodes)."""
+        _, visited = self.visited_clients(client_nodes)
+        return np.bincount(visited, minlength=len(client_nodes))
+
+    def visited_clients(self, client_nodes: range) -> tuple:
+        """
+        Checked visits of known clients, in stop order.
+
+        Returns:
+            (route of each visit, client position in client_nodes)
+        """
+        stops = self.client_stops[self.checked]
+        visited = self.stop_nodes[stops]
+        known = visited >= 0
+        return self.route_of[stops[known]], visited[known] - client_nodes.start
+
+    def off_depot(self, depot_ids: Sequence) -> np.ndarray:
+        """Whether each route fails to start and end at its depot."""
+        depot_nodes = self.nodes.indices(depot_ids)
+        first = self.stop_nodes[self.starts[:-1]]
+        last = self.stop_nodes[self.starts[1:] - 1]
+        off = (first != depot_nodes) | (last != depot_nodes)
+
+        # Unknown depots can only match by exact spelling
+        for r in np.flatnonzero(depot_nodes < 0):
+            sequence = self.sequences[r]
+            off[r] = sequence[0] != depot_ids[r] or sequence[-1] != depot_ids[r]
+        return off
+
+    def route_distances(self, engine) -> tuple:
+        """
+        Sum the legs between known stops of every route.
+
+        Args:
+            engine: DistanceMatrix indexed by node ID
+
+        Returns:
+            (distance per route, number of legs summed)
+        """
+        origins = self.stop_nodes[:-1]
+        destinations = self.stop_nodes[1:]
+        valid = (
+            (self.route_of[:-1] == self.route_of[1:]) & (origins >= 0) & (destinations >= 0)
+        )
+        distances = np.bincount(
+            self.route_of[:-1][valid],
+            weights=engine.leg_distances(origins[valid], destinations[valid]),
+            minlength=len(self.sequences),
+        )
+        return distances, int(valid.sum())
+
+    def demand_errors(self) -> Dict[int, list]:
+        """
+        Client stops with a wrong or missing demand, by route.
+
+        Returns:
+            Route mapped to (stop position in the route, actual, expected)
+            tuples: wrong demands in stop order, then stops without a demand
+            value (actual and expected None)
+        """
+        stops = self.client_stops[self.checked]
+        stop_nodes = self.stop_nodes[stops]
+        expected = np.where(stop_nodes >= 0, self.nodes.demand[stop_nodes], 0)
+        actual = self.demands[self.demand_position[self.checked]]
+        wrong = np.flatnonzero(actual != expected)
+
+        errors: Dict[int, list] = {}
+        routes = self.client_route[self.checked]
+        for k in wrong.tolist():
+            r = int(routes[k])
+            errors.setdefault(r, []).append(
+                (int(stops[k] - self.starts[r]), actual[k].item(), expected[k].item())
+            )
+        missing = ~self.checked
+        for stop, r in zip(self.client_stops[missing].tolist(), self.client_route[missing].tolist()):
+            errors.setdefault(r, []).append((stop - int(self.starts[r]), None, None))
+        return errors
+
+    def duplicates(self) -> np.ndarray:
+        """Whether each route visits a client stop more than once."""
+        num_routes = len(self.sequences)
+        stop_nodes = self.stop_nodes[self.client_stops]
+        known = stop_nodes >= 0
+
+        keys = np.sort(self.client_route[known] * len(self.nodes) + stop_nodes[known])
+        repeated = keys[1:][keys[1:] == keys[:-1]] // max(len(self.nodes), 1)
+        duplicate = np.bincount(repeated, minlength=num_routes) > 0
+
+        # Unknown client IDs are compared by spelling
+        for r in np.unique(self.client_route[~known]).tolist():
+            in_route = self.client_route == r
+            route_clients = [
+                node if node >= 0 else self.sequences[r][stop - self.starts[r]]
+                for stop, node in zip(
+                    self.client_stops[in_route].tolist(), stop_nodes[in_route].tolist()
+                )
+            ]
+            duplicate[r] = len(route_clients) != len(set(route_clients))
+        return duplicate
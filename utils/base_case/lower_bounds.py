@@ -0,0 +1,272 @@
+"""
+Lower bounds on the vehicles, distance and cost of any solution of an instance.
+
+Computed once per loaded validator from the instance data, they turn the
+feasibility verdict into a quality figure: the gap between a solution and
+the bound is at least its distance from the optimum.
+
+- Vehicles: the fewest trips whose capacities cover the total demand
+  (largest vehicles first). Without resupply every route is one trip.
+- Distance: merge all depots into one root. Dropping the last leg of every
+  trip leaves a spanning tree of the root and the clients, and the dropped
+  legs return to the depot from distinct clients, so any solution is at
+  least the minimum spanning tree plus the m cheapest client-depot legs,
+  with m the trip bound. Legs through stations, tolls or resupply
+  stops are assumed to be no shorter than the direct leg.
+- Cost: one activation per route at the cheapest fixed cost, for the
+  vehicle bound (a route that resupplies pays it once for all its trips),
+  plus the distance bound at the cheapest per-km cost (distance and fuel). Time, tolls and fuel
+  bought at stations are left at 0.
+
+The spanning tree is grown with Prim's algorithm, a few array passes per
+client. Distances come from the validator's dense table when it has one.
+Larger coordinate instances use squared unit-sphere chord lengths, which
+order pairs like haversine distances: one matrix-vector product per client
+and no trigonometry per pair.
+
+Usage:
+  bound = validator.lower_bound()        # computed once, then cached
+  quality_gap(bound, num_routes=12, distance_km=830.5, total_cost=4.2e6)
+"""
+
+import math
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from distance_matrix import EARTH_RADIUS_KM
+from spatial_index import km_to_chord, unit_vectors
+
+# Geodesic and road distances are at least this fraction of the haversine
+# distance (WGS-84 meridian arcs near the equator are 0.56% shorter)
+SPHERE_TO_ELLIPSOID_MIN = 0.994
+
+
+def minimum_trips(demands: np.ndarray, capacities: np.ndarray) -> int:
+    """
+    Fewest trips whose capacities cover the total demand.
+
+    Each vehicle counts once, largest first; if the whole fleet falls
+    short, further trips are priced at the largest capacity (a vehicle
+    making several trips).
+    """
+    total = float(np.sum(demands))
+    if total <= 0:
+        return 0
+    capacities = np.sort(np.asarray(capacities, dtype=float))[::-1]
+    covered = np.cumsum(capacities)
+    if covered[-1] >= total:
+        return int(np.searchsorted(covered, total) + 1)
+    return len(capacities) + math.ceil((total - covered[-1]) / capacities[0])
+
+
+def spanning_tree_edges(root: np.ndarray, rows: Callable[[int], np.ndarray]) -> np.ndarray:
+    """
+    Minimum spanning tree of a root and n nodes with Prim's algorithm.
+
+    Args:
+        root: (n,) edge weights between the root and each node
+        rows: rows(u) gives the (n,) edge weights between node u and every
+            node (inf for missing edges)
+
+    Returns:
+        (n,) weight of the tree edge that joined each node, in rows units
+        (inf where a node cannot be reached); NaN weights count as missing
+    """
+    key = np.array(root, dtype=float)
+    edges = np.full(len(key), np.inf)
+    # inf for nodes already in the tree (cheaper than a masked update)
+    joined = np.zeros(len(key))
+    for _ in range(len(key)):
+        u = int(key.argmin())
+        if not np.isfinite(key[u]):
+            break
+        edges[u] = key[u]
+        joined[u] = np.inf
+        key[u] = np.inf
+        row = rows(u) + joined
+        np.fmin(key, row, out=key)
+    return edges
+
+
+def squared_chord_km(squared_chords: np.ndarray) -> np.ndarray:
+    """Great-circle kilometers of squared unit-sphere chord lengths."""
+    chords = np.sqrt(np.maximum(squared_chords, 0.0))
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chords / 2, 0.0, 1.0))
+
+
+def _dense_rows(table: np.ndarray, depots: np.ndarray, clients: np.ndarray):
+    """Root and row function over a node-indexed table (either leg direction)."""
+    table = np.where(np.isnan(table), np.inf, table)
+    depot_legs = np.minimum(table[np.ix_(depots, clients)], table[np.ix_(clients, depots)].T)
+    client_table = table[np.ix_(clients, clients)]
+
+    def rows(u: int) -> np.ndarray:
+        return np.minimum(client_table[u], client_table[:, u])
+
+    return depot_legs.min(axis=0), rows
+
+
+def _chord_rows(validator, depots: np.ndarray, clients: np.ndarray):
+    """
+    Root and row function in squared chord lengths, with sparse matrix entries if any.
+
+    A squared chord is 2 - 2 p.q for unit vectors p and q, so each row is one
+    matrix-vector product. Nodes without coordinates give NaN (no edge).
+    """
+    nodes = validator.nodes
+    points = unit_vectors(nodes.latitude, nodes.longitude)
+    client_axes = np.ascontiguousarray(points[clients].T)
+    client_points = points[clients]
+
+    def chords(origin: np.ndarray) -> np.ndarray:
+        row = origin @ client_axes
+        row *= -2.0
+        row += 2.0
+        return row
+
+    # Stored sparse matrix entries replace the haversine fallback; a pair
+    # stored in both directions keeps the shorter one
+    indptr = np.zeros(len(nodes) + 1, dtype=np.intp)
+    columns, values = np.zeros(0, dtype=np.intp), np.zeros(0)
+    if validator.has_sparse_matrix():
+        matrix = validator.distance_matrix
+        matrix_nodes = validator.matrix_nodes()
+        node_of = np.full(len(matrix), -1, dtype=np.intp)
+        node_of[matrix_nodes[matrix_nodes >= 0]] = np.flatnonzero(matrix_nodes >= 0)
+        position = np.full(len(nodes) + 1, -1, dtype=np.intp)
+        position[clients] = np.arange(len(clients))
+
+        origins = node_of[np.repeat(np.arange(len(matrix)), np.diff(matrix.indptr))]
+        destinations = node_of[matrix.indices]
+        lengths = np.tile(km_to_chord(matrix.data) ** 2, 2)
+        sources = np.concatenate([origins, destinations])
+        targets = position[np.concatenate([destinations, origins])]
+        keep = (sources >= 0) & (targets >= 0)
+        sources, targets, lengths = sources[keep], targets[keep], lengths[keep]
+
+        order = np.lexsort((lengths, targets, sources))
+        sources, targets, lengths = sources[order], targets[order], lengths[order]
+        first = np.ones(len(sources), dtype=bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, columns, values = sources[first], targets[first], lengths[first]
+        indptr = np.searchsorted(sources, np.arange(len(nodes) + 1))
+
+    def with_stored(u: int, row: np.ndarray) -> np.ndarray:
+        start, stop = indptr[u], indptr[u + 1]
+        row[columns[start:stop]] = values[start:stop]
+        return row
+
+    root = np.full(len(clients), np.inf)
+    for depot in depots.tolist():
+        np.fmin(root, with_stored(depot, chords(points[depot])), out=root)
+
+    def rows(u: int) -> np.ndarray:
+        return with_stored(int(clients[u]), chords(client_points[u]))
+
+    return root, rows
+
+
+def instance_bound(validator) -> Dict:
+    """
+    Vehicle, distance and cost lower bounds of a validator's instance.
+
+    Args:
+        validator: Loaded SolutionValidator (or project subclass)
+
+    Returns:
+        Dict with "vehicles" (routes), "trips", "distance_km" (None when the
+        legs cannot be bounded) and "cost" (None without cost parameters or
+        a distance bound)
+    """
+    capacities = [spec["capacity"] for spec in validator.vehicle_specs.values()]
+    trips = minimum_trips(validator.client_demand_array, capacities)
+    vehicles = min(trips, 1) if validator.resupply_allowed else trips
+
+    depots = np.arange(len(validator.depot_ids))
+    clients = np.arange(validator.client_nodes.start, validator.client_nodes.stop)
+    table = validator.bound_table()
+    scale = 1.0
+    if table is not None:
+        root, rows = _dense_rows(table, depots, clients)
+        to_km = None
+    elif not validator.has_sparse_matrix() and (
+        validator.distance_method == "matrix" or np.isnan(validator.nodes.latitude[clients]).any()
+    ):
+        # Incomplete dense matrix, or no coordinates to bound the legs with
+        root = None
+    else:
+        root, rows = _chord_rows(validator, depots, clients)
+        to_km = squared_chord_km
+        if validator.distance_method not in ("haversine", "matrix"):
+            scale = SPHERE_TO_ELLIPSOID_MIN
+
+    distance_km = None
+    if root is not None and len(clients):
+        tree = spanning_tree_edges(root, rows)
+        returns = np.sort(root)[:trips]
+        if to_km is not None:
+            tree, returns = to_km(tree), to_km(returns)
+        distance_km = float(scale * (tree.sum() + returns.sum()))
+        if not np.isfinite(distance_km):
+            distance_km = None
+
+    cost = None
+    if validator.has_costs() and distance_km is not None:
+        profiles = list(validator.cost_profiles().values())
+        per_km = min(
+            profile.distance
+            + (0.0 if validator.fuel_from_records else profile.fuel_price / profile.fuel_efficiency)
+            for profile in profiles
+        )
+        cost = vehicles * min(profile.fixed for profile in profiles) + per_km * distance_km
+
+    return {"vehicles": vehicles, "trips": trips, "distance_km": distance_km, "cost": cost}
+
+
+def quality_gap(
+    bound: Dict,
+    num_routes: int,
+    distance_km: Optional[float] = None,
+    total_cost: Optional[float] = None,
+) -> Dict:
+    """
+    Relative gaps of a solution to the instance bounds.
+
+    A gap is (solution - bound) / solution: 0 proves the solution optimal
+    for that measure, and the optimum lies within the gap.
+
+    Returns:
+        Dict with the bounds ("vehicle_bound", "distance_bound_km",
+        "cost_bound") and "vehicle_gap", "distance_gap", "cost_gap"
+        (None where the solution value or the bound is unknown)
+    """
+
+    def gap(value, lower) -> Optional[float]:
+        if value is None or lower is None or value <= 0:
+            return None
+        return (value - lower) / value
+
+    return {
+        "vehicle_bound": bound["vehicles"],
+        "distance_bound_km": bound["distance_km"],
+        "cost_bound": bound["cost"],
+        "vehicle_gap": gap(num_routes, bound["vehicles"]),
+        "distance_gap": gap(distance_km, bound["distance_km"]),
+        "cost_gap": gap(total_cost, bound["cost"]),
+    }
+
+
+def print_gap(gap: Dict) -> None:
+    """Print the solution's gaps to the lower bounds."""
+    print("\nQuality gap to the instance lower bounds:")
+    lines = (
+        ("Vehicles", gap["vehicle_bound"], gap["vehicle_gap"], "{:,}"),
+        ("Distance", gap["distance_bound_km"], gap["distance_gap"], "{:,.1f} km"),
+        ("Cost", gap["cost_bound"], gap["cost_gap"], "{:,.0f} COP"),
+    )
+    for label, bound, relative, template in lines:
+        if bound is None:
+            continue
+        note = f"gap {relative:.1%}" if relative is not None else "no solution value"
+        print(f"  {label:<10}bound {template.format(bound):>18}   {note}")
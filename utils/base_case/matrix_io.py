@@ -0,0 +1,511 @@
+"""
+Distance matrix file formats.
+
+Reads the JSON and CSV formats documented in the README, plus a compact
+binary format: an uncompressed .npz archive holding
+
+  distances.npy  (N, N) float array, NaN for missing pairs
+  ids.npy        (N,) StandardizedIDs in index order
+  metadata.npy   JSON-encoded matrix_metadata fields
+
+and optionally granular neighbor lists (--neighbors K): the K nearest
+other locations of every location by matrix distance, as positions in ids
+(neighbors.npy) with their distances (neighbor_distances.npy). The layout
+matches the neighbor files of spatial_index.py.
+
+The distances member is memory-mapped straight from the archive, so loading
+is zero-copy and independent of matrix size.
+
+Sparse matrices (--sparse K) keep each location's K nearest destinations
+plus complete depot and station rows, in compressed sparse row members
+(indptr.npy, indices.npy, data.npy) instead of distances.npy. The validator
+computes the legs they do not store with the haversine formula. JSON and CSV
+files that list only some pairs can be read straight into the sparse form
+(read_distance_matrix(path, sparse=True), --sparse-matrix in the CLIs).
+
+Usage (convert an existing matrix):
+  python matrix_io.py distances.json distances.npz
+  python matrix_io.py distances.csv distances.npz --dtype float32
+  python matrix_io.py distances.json distances.npz --neighbors 20
+  python matrix_io.py knn_pairs.csv sparse.npz --sparse 20
+"""
+
+import argparse
+import json
+import os
+import struct
+import zipfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from distance_matrix import DistanceMatrix, SparseDistanceMatrix
+
+NPZ_FORMAT_VERSION = "npz-1.0"
+SPARSE_NPZ_FORMAT_VERSION = "sparse-npz-1.0"
+
+# Rows kept complete in sparse matrices by default: depots and stations
+DEFAULT_FULL_ROW_PREFIXES = ("CD", "E")
+
+# Size of the fixed part of a ZIP local file header
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+# Matrix rows per block when ranking neighbors (bounds temporary memory)
+_NEIGHBOR_BLOCK_ROWS = 1024
+
+
+def read_distance_matrix(matrix_file: str, sparse: bool = False) -> Tuple[DistanceMatrix, Dict]:
+    """
+    Load a distance matrix from JSON, CSV or NPZ file.
+
+    Args:
+        matrix_file: Path to distance matrix file (.json, .csv or .npz)
+        sparse: Store the listed pairs of a JSON/CSV file in a
+            SparseDistanceMatrix instead of an N×N array (sparse NPZ files
+            are detected from their members)
+
+    Returns:
+        Tuple of (DistanceMatrix or SparseDistanceMatrix, metadata dict)
+
+    Raises:
+        ValueError: If file format is invalid or contains errors
+        FileNotFoundError: If file doesn't exist
+    """
+    if not os.path.exists(matrix_file):
+        raise FileNotFoundError(
+            f"Distance matrix file not found: {matrix_file}\n"
+            "Ensure the file path is correct and the file exists."
+        )
+
+    # Detect format from extension
+    file_ext = os.path.splitext(matrix_file)[1].lower()
+
+    try:
+        if file_ext == ".json":
+            return _read_json_matrix(matrix_file, sparse)
+        elif file_ext == ".csv":
+            return _read_csv_matrix(matrix_file, sparse), {}
+        elif file_ext == ".npz":
+            return read_npz_matrix(matrix_file)
+        else:
+            raise ValueError(
+                f"Unsupported file format: {file_ext}\n"
+                "Distance matrix must be .json, .csv or .npz"
+            )
+    except json.JSONDecodeError as e:
+        raise ValueError(
+            f"Invalid JSON format in {matrix_file}:\n"
+            f"  {str(e)}\n"
+            "Ensure the file is valid JSON."
+        )
+
+
+def _read_json_matrix(matrix_file: str, sparse: bool = False) -> Tuple[DistanceMatrix, Dict]:
+    """Load distance matrix from JSON file."""
+    with open(matrix_file, "r") as f:
+        data = json.load(f)
+
+    # Extract metadata if present
+    metadata = data.get("metadata", {})
+
+    # Get distances
+    if "distances" not in data:
+        raise ValueError("JSON matrix must contain 'distances' key")
+
+    distances = data["distances"]
+
+    # Validate structure
+    if not isinstance(distances, dict):
+        raise ValueError("'distances' must be a dictionary")
+
+    # Flatten the nested dictionaries into aligned columns
+    origins = []
+    destinations = []
+    values = []
+    for origin, row in distances.items():
+        if not isinstance(row, dict):
+            raise ValueError(f"Destinations for {origin} must be a dictionary")
+        origins.extend([origin] * len(row))
+        destinations.extend(row.keys())
+        values.extend(row.values())
+
+    return _build_matrix(origins, destinations, values, sparse), metadata
+
+
+def _build_matrix(origins, destinations, values, sparse: bool = False) -> DistanceMatrix:
+    """
+    Validate distance columns and build the indexed matrix.
+
+    Raises:
+        ValueError: If any distance is non-numeric, negative or not finite
+    """
+    distances = np.array(values)
+    if distances.dtype.kind not in "biuf":
+        for origin, dest, dist in zip(origins, destinations, values):
+            if isinstance(dist, bool) or not isinstance(dist, (int, float)):
+                raise ValueError(
+                    f"Distance {origin}→{dest} must be numeric, got {type(dist)}"
+                )
+    distances = distances.astype(float)
+
+    negative = np.flatnonzero(distances < 0)
+    if negative.size:
+        k = negative[0]
+        raise ValueError(
+            f"Distance {origins[k]}→{destinations[k]} cannot be negative: {distances[k]}"
+        )
+
+    non_finite = np.flatnonzero(~np.isfinite(distances))
+    if non_finite.size:
+        k = non_finite[0]
+        raise ValueError(
+            f"Distance {origins[k]}→{destinations[k]} must be finite, got {distances[k]}"
+        )
+
+    matrix_class = SparseDistanceMatrix if sparse else DistanceMatrix
+    return matrix_class.from_entries(origins, destinations, distances)
+
+
+def _read_csv_matrix(matrix_file: str, sparse: bool = False) -> DistanceMatrix:
+    """Load distance matrix from CSV file."""
+    # pandas is only needed for CSV matrices, so it is imported here
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(matrix_file)
+    except pd.errors.ParserError as e:
+        raise ValueError(
+            f"Invalid CSV format in {matrix_file}:\n"
+            f"  {str(e)}\n"
+            "Ensure the file is valid CSV."
+        )
+
+    # Check for three-column format (Origin, Destination, Distance)
+    if "Origin" in df.columns and "Destination" in df.columns and "Distance" in df.columns:
+        # Validate distance column
+        if not pd.api.types.is_numeric_dtype(df["Distance"]):
+            raise ValueError("Distance column must contain numeric values")
+
+        if (df["Distance"] < 0).any():
+            raise ValueError("Distance values cannot be negative")
+
+        matrix_class = SparseDistanceMatrix if sparse else DistanceMatrix
+        return matrix_class.from_entries(
+            df["Origin"].astype(str).tolist(),
+            df["Destination"].astype(str).tolist(),
+            df["Distance"].to_numpy(dtype=float),
+        )
+
+    # Matrix format: first column is assumed to be row labels
+    row_labels = df.iloc[:, 0].astype(str).tolist()
+    col_labels = df.columns[1:].astype(str).tolist()
+    distances = df.iloc[:, 1:].to_numpy(dtype=float)
+
+    negative = np.argwhere(distances < 0)
+    if negative.size:
+        i, j = negative[0]
+        raise ValueError(
+            f"Distance {row_labels[i]}→{col_labels[j]} cannot be negative: "
+            f"{distances[i, j]}"
+        )
+
+    if row_labels == col_labels:
+        return DistanceMatrix(row_labels, distances=distances)
+
+    return DistanceMatrix.from_entries(
+        np.repeat(row_labels, len(col_labels)).tolist(),
+        col_labels * len(row_labels),
+        distances.ravel(),
+    )
+
+
+def _memmap_npz_member(npz_file: str, member: str) -> np.ndarray:
+    """
+    Memory-map an uncompressed .npy member of an .npz archive in place.
+
+    Raises:
+        ValueError: If the member is compressed (it can only be copied)
+    """
+    with zipfile.ZipFile(npz_file) as archive:
+        info = archive.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{member} in {npz_file} is compressed and cannot be mapped")
+
+    with open(npz_file, "rb") as f:
+        # The local header repeats the name and may carry its own extra field
+        f.seek(info.header_offset)
+        local_header = f.read(_ZIP_LOCAL_HEADER_SIZE)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    return np.memmap(
+        npz_file,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def read_npz_matrix(matrix_file: str, mmap: bool = True) -> Tuple[DistanceMatrix, Dict]:
+    """
+    Load a binary distance matrix written by write_npz_matrix.
+
+    Args:
+        matrix_file: Path to .npz file
+        mmap: Memory-map the distances instead of reading them into memory
+
+    Returns:
+        Tuple of (DistanceMatrix, metadata dict)
+    """
+    with np.load(matrix_file, allow_pickle=False) as archive:
+        if "indptr" in archive.files:
+            return _read_sparse_npz(archive)
+        for member in ("distances", "ids"):
+            if member not in archive.files:
+                raise ValueError(f"NPZ matrix must contain '{member}' array")
+        ids = archive["ids"].tolist()
+        metadata = {}
+        if "metadata" in archive.files:
+            metadata = json.loads(str(archive["metadata"]))
+        if not mmap:
+            distances = archive["distances"]
+
+    if mmap:
+        try:
+            distances = _memmap_npz_member(matrix_file, "distances.npy")
+        except ValueError:
+            # Compressed archives (np.savez_compressed) have to be read in full
+            with np.load(matrix_file, allow_pickle=False) as archive:
+                distances = archive["distances"]
+
+    if distances.shape != (len(ids), len(ids)):
+        raise ValueError(
+            f"NPZ matrix shape {distances.shape} does not match {len(ids)} ids"
+        )
+
+    return DistanceMatrix(ids, distances=distances), metadata
+
+
+def matrix_neighbors(matrix: DistanceMatrix, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k nearest other locations of every location by matrix distance.
+
+    Missing pairs (NaN) are never neighbors; rows with fewer than k known
+    distances are padded with -1 and infinite distances.
+
+    Args:
+        matrix: Matrix with a dense distance array
+        k: Neighbors per location (at most len(matrix) - 1)
+
+    Returns:
+        (neighbors, distances) of shape (len(matrix), k), nearest first
+    """
+    if not matrix.is_dense:
+        raise ValueError("Neighbor lists need a dense distance matrix")
+    n = len(matrix)
+    if not 1 <= k < n:
+        raise ValueError(f"k must be between 1 and {n - 1}, got {k}")
+
+    neighbors = np.zeros((n, k), dtype=np.intp)
+    distances = np.zeros((n, k))
+    for start in range(0, n, _NEIGHBOR_BLOCK_ROWS):
+        stop = min(start + _NEIGHBOR_BLOCK_ROWS, n)
+        rows = np.arange(stop - start)[:, None]
+        block = np.array(matrix.distances[start:stop], dtype=float)
+        block[np.isnan(block)] = np.inf
+        block[rows[:, 0], np.arange(start, stop)] = np.inf
+
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest = nearest[rows, np.argsort(block[rows, nearest], axis=1, kind="stable")]
+        distances[start:stop] = block[rows, nearest]
+        neighbors[start:stop] = np.where(np.isinf(distances[start:stop]), -1, nearest)
+    return neighbors, distances
+
+
+def _read_sparse_npz(archive) -> Tuple[SparseDistanceMatrix, Dict]:
+    """Load the CSR members of a sparse matrix archive."""
+    for member in ("ids", "indices", "data"):
+        if member not in archive.files:
+            raise ValueError(f"Sparse NPZ matrix must contain '{member}' array")
+    metadata = {}
+    if "metadata" in archive.files:
+        metadata = json.loads(str(archive["metadata"]))
+    matrix = SparseDistanceMatrix(
+        archive["ids"].tolist(), archive["indptr"], archive["indices"], archive["data"]
+    )
+    return matrix, metadata
+
+
+def write_sparse_npz_matrix(
+    matrix: SparseDistanceMatrix, metadata: Dict, output_file: str, dtype: str = "float64"
+) -> None:
+    """
+    Write a sparse distance matrix in the binary .npz format.
+
+    Args:
+        matrix: SparseDistanceMatrix to store
+        metadata: matrix_metadata fields to keep (format_version is set here)
+        output_file: Destination .npz path
+        dtype: Storage type of distances ("float64" or "float32")
+    """
+    metadata = {**metadata, "format_version": SPARSE_NPZ_FORMAT_VERSION}
+    np.savez(
+        output_file,
+        ids=np.array(matrix.ids, dtype=str),
+        indptr=matrix.indptr,
+        indices=matrix.indices,
+        data=np.asarray(matrix.data, dtype=dtype),
+        metadata=np.array(json.dumps(metadata)),
+    )
+
+
+def full_row_ids(ids, prefixes=DEFAULT_FULL_ROW_PREFIXES) -> list:
+    """IDs whose rows stay complete in a sparse matrix (depots and stations by default)."""
+    # "C" clients must not match the "CD" depot prefix and vice versa
+    return [
+        loc_id
+        for loc_id in ids
+        if any(loc_id.startswith(p) and loc_id[len(p) : len(p) + 1].isdigit() for p in prefixes)
+    ]
+
+
+def sparsify_matrix(matrix, k: int, full_rows=None) -> SparseDistanceMatrix:
+    """
+    Keep each location's k nearest destinations plus complete full_rows.
+
+    Args:
+        matrix: Dense DistanceMatrix or SparseDistanceMatrix
+        k: Destinations kept per row
+        full_rows: IDs kept complete (default: full_row_ids of the matrix)
+    """
+    if full_rows is None:
+        full_rows = full_row_ids(matrix.ids)
+    if matrix.is_dense:
+        return SparseDistanceMatrix.from_dense(matrix, k, full_rows)
+    return matrix.keep_nearest(k, full_rows)
+
+
+def write_npz_matrix(
+    matrix: DistanceMatrix,
+    metadata: Dict,
+    output_file: str,
+    dtype: str = "float64",
+    neighbors: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> None:
+    """
+    Write a distance matrix in the binary .npz format.
+
+    Args:
+        matrix: Matrix with a dense distance array
+        metadata: matrix_metadata fields to keep (format_version is set here)
+        output_file: Destination .npz path
+        dtype: Storage type of distances ("float64" or "float32")
+        neighbors: (neighbors, distances) lists to store, as returned by
+            matrix_neighbors or SpatialIndex.neighbors
+    """
+    if not matrix.is_dense:
+        raise ValueError("Only dense distance matrices can be written to NPZ")
+
+    metadata = {**metadata, "format_version": NPZ_FORMAT_VERSION}
+    members = {}
+    if neighbors is not None:
+        members["neighbors"] = np.asarray(neighbors[0], dtype=np.int32)
+        members["neighbor_distances"] = np.asarray(neighbors[1], dtype=float)
+
+    # np.savez stores members uncompressed, which keeps them mappable
+    np.savez(
+        output_file,
+        distances=np.asarray(matrix.distances, dtype=dtype),
+        ids=np.array(matrix.ids, dtype=str),
+        metadata=np.array(json.dumps(metadata)),
+        **members,
+    )
+
+
+def convert_distance_matrix(
+    matrix_file: str,
+    output_file: str,
+    dtype: str = "float64",
+    neighbors: int = 0,
+    sparse: int = 0,
+) -> DistanceMatrix:
+    """
+    Convert a JSON/CSV distance matrix file to the binary .npz format.
+
+    With neighbors > 0, the archive also stores that many neighbors per
+    location (see matrix_neighbors). With sparse > 0, it is written as a
+    sparse matrix keeping that many destinations per row (see
+    sparsify_matrix); the source is then read sparse as well.
+    """
+    if sparse:
+        matrix, metadata = read_distance_matrix(matrix_file, sparse=True)
+        matrix = sparsify_matrix(matrix, sparse)
+        metadata = {**metadata, "neighbors_per_row": sparse}
+        write_sparse_npz_matrix(matrix, metadata, output_file, dtype=dtype)
+        return matrix
+
+    matrix, metadata = read_distance_matrix(matrix_file)
+    neighbor_lists = matrix_neighbors(matrix, neighbors) if neighbors else None
+    write_npz_matrix(matrix, metadata, output_file, dtype=dtype, neighbors=neighbor_lists)
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a JSON/CSV distance matrix to the binary .npz format"
+    )
+    parser.add_argument("matrix", help="Source matrix file (.json or .csv)")
+    parser.add_argument("output", help="Destination .npz file")
+    parser.add_argument(
+        "--dtype",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Storage precision of distances (float32 halves the file size)",
+    )
+    parser.add_argument(
+        "--neighbors",
+        type=int,
+        default=0,
+        help="Also store the K nearest neighbors of every location (default: none)",
+    )
+    parser.add_argument(
+        "--sparse",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Write a sparse matrix with the K nearest destinations per location "
+        "plus complete depot (CD) and station (E) rows",
+    )
+    args = parser.parse_args()
+
+    if not args.output.lower().endswith(".npz"):
+        parser.error("output file must have the .npz extension")
+    if args.neighbors < 0 or args.sparse < 0:
+        parser.error("--neighbors and --sparse must not be negative")
+    if args.neighbors and args.sparse:
+        parser.error("--neighbors applies to dense matrices only")
+
+    matrix = convert_distance_matrix(
+        args.matrix, args.output, dtype=args.dtype, neighbors=args.neighbors, sparse=args.sparse
+    )
+    size_mb = os.path.getsize(args.output) / 1e6
+    if args.sparse:
+        print(
+            f"Wrote {len(matrix)} locations and {matrix.nnz:,} distances "
+            f"to {args.output} ({size_mb:.1f} MB)"
+        )
+    else:
+        print(f"Wrote {len(matrix)} locations to {args.output} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,742 @@
+"""
+Solver model export for base case and Project A instances.
+
+Builds the multi-depot CVRP as a three-index vehicle flow model straight
+from the validator's instance arrays and writes it to an LP or free MPS
+file for any MIP solver (Gurobi, CPLEX, HiGHS, CBC, SCIP). Every block of
+constraints is one set of NumPy index arrays, so the build time grows with
+the nonzeros rather than with Python model objects:
+
+    x[k,i,j] ∈ {0,1}   vehicle k drives arc (i, j)
+    u[j] ∈ [q_j, Q]     load delivered up to client j (Q: largest capacity)
+    load[k] ∈ [0, Q_k]  load of vehicle k
+    w[k,d] ≥ 0          load vehicle k takes from depot d (depot capacities only)
+
+    min  Σ fixed_k x[k,d,j] + Σ c_k dist_ij x[k,i,j]
+         (c_k = C_dist + C_time / speed + fuel_price / fuel_efficiency of vehicle k)
+    s.t. visit_j:      Σ_k Σ_i x[k,i,j] = 1                        every client j
+         flow_k_n:     Σ_i x[k,i,n] − Σ_j x[k,n,j] = 0             every vehicle k, node n
+         start_k:      Σ_d Σ_j x[k,d,j] ≤ 1                        one route per vehicle
+         load_k:       load[k] − Σ q_j x[k,i,j] = 0
+         range_k:      Σ dist_ij x[k,i,j] ≤ R_k
+         mtz_i_j:      u_i − u_j + Q Σ_k x[k,i,j] ≤ Q − q_j        client arcs (subtours)
+         depot_k_d:    w[k,d] − load[k] − Q_k Σ_j x[k,d,j] ≥ −Q_k
+         inventory_d:  Σ_k w[k,d] ≤ capacity_d
+
+Depot-to-depot arcs, arcs without a distance and (Project A) arcs to
+clients a vehicle's size may not serve are left out. Neighbor lists
+(spatial_index.py) prune client-to-client arcs to the k nearest clients of
+either end; depot arcs are always kept.
+
+Variables are named by StandardizedID (x_V001_CD01_C005), so a solver's
+solution file maps back to routes without the model and is written as a
+verification file the validators read.
+
+Usage:
+  python ../../utils/base_case/model_export.py --output model.lp
+  python ../../utils/base_case/model_export.py --project a --neighbors 15 --output model.mps
+  python ../../utils/base_case/model_export.py --project a --read-solution model.sol \\
+      --output verificacion_caso3.csv
+"""
+
+import argparse
+import csv
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from base_case_verification import SolutionValidator
+from cost_model import DEFAULT_SPEED
+from project_a_verification import ProjectAValidator
+from spatial_index import SpatialIndex, read_neighbor_lists
+
+# Validator reading the instance files of each supported project
+VALIDATORS = {"base": SolutionValidator, "a": ProjectAValidator}
+
+# Verification file columns written from solver solutions
+SOLUTION_COLUMNS = (
+    "VehicleId",
+    "DepotId",
+    "InitialLoad",
+    "RouteSequence",
+    "ClientsServed",
+    "DemandsSatisfied",
+    "TotalDistance",
+    "TotalTime",
+    "FuelCost",
+)
+
+# Verification file written by --read-solution unless --output is given
+# (never a verificacion_caso*.csv submission file)
+SOLVER_SOLUTION_FILE = "solver_solution.csv"
+
+# Solution values above this count as a used arc
+ARC_THRESHOLD = 0.5
+
+# Row senses of the constraint matrix
+EQUAL, LESS, GREATER = "E", "L", "G"
+_LP_SENSES = {EQUAL: "=", LESS: "<=", GREATER: ">="}
+
+
+@dataclass
+class RoutingModel:
+    """
+    A MIP in arrays: columns, rows and the constraint matrix as coordinates.
+
+    Attributes:
+        columns: Variable names
+        objective: Objective coefficient per column (minimized)
+        lower, upper: Bounds per column (upper may be inf)
+        binary: Whether each column is binary
+        rows: Constraint names
+        senses: EQUAL, LESS or GREATER per row
+        rhs: Right-hand side per row
+        entry_rows, entry_columns, entry_values: Constraint matrix nonzeros
+    """
+
+    columns: np.ndarray
+    objective: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    binary: np.ndarray
+    rows: np.ndarray
+    senses: np.ndarray
+    rhs: np.ndarray
+    entry_rows: np.ndarray
+    entry_columns: np.ndarray
+    entry_values: np.ndarray
+
+    def stats(self) -> Dict[str, int]:
+        """Number of binary and continuous columns, rows and nonzeros."""
+        binaries = int(self.binary.sum())
+        return {
+            "binaries": binaries,
+            "continuous": len(self.columns) - binaries,
+            "rows": len(self.rows),
+            "nonzeros": len(self.entry_values),
+        }
+
+    def write(self, path: str) -> None:
+        """Write the model as LP, or as free MPS for a .mps path."""
+        if path.lower().endswith(".mps"):
+            self.write_mps(path)
+        else:
+            self.write_lp(path)
+
+    def write_lp(self, path: str) -> None:
+        """Write the model in CPLEX LP format (one term per line)."""
+        names = self.columns.astype(object)
+        order = np.argsort(self.entry_rows, kind="stable")
+        terms = _terms(self.entry_values[order], self.entry_columns[order], names)
+        starts = np.searchsorted(self.entry_rows[order], np.arange(len(self.rows) + 1)).tolist()
+        used = np.flatnonzero(self.objective)
+
+        with open(path, "w") as f:
+            f.write("\\ Multi-depot CVRP, three-index vehicle flow (model_export.py)\n")
+            f.write("Minimize\n obj:\n")
+            f.write("\n".join(_terms(self.objective[used], used, names)))
+            f.write("\nSubject To\n")
+            for r, (name, sense, rhs) in enumerate(
+                zip(self.rows.tolist(), self.senses.tolist(), self.rhs.tolist())
+            ):
+                f.write(f" {name}:\n")
+                f.write("\n".join(terms[starts[r] : starts[r + 1]]))
+                f.write(f"\n {_LP_SENSES[sense]} {_number(rhs)}\n")
+
+            f.write("Bounds\n")
+            continuous = ~self.binary
+            for name, lower, upper in zip(
+                self.columns[continuous].tolist(),
+                self.lower[continuous].tolist(),
+                self.upper[continuous].tolist(),
+            ):
+                upper = "+inf" if math.isinf(upper) else _number(upper)
+                f.write(f" {_number(lower)} <= {name} <= {upper}\n")
+            f.write("Binaries\n")
+            f.write("".join(f" {name}\n" for name in self.columns[self.binary].tolist()))
+            f.write("End\n")
+
+    def write_mps(self, path: str) -> None:
+        """Write the model in free MPS format (binary columns between integer markers)."""
+        # Column-major entries, the objective as row "obj"; binary columns
+        # come first, inside the integer markers
+        used = np.flatnonzero(self.objective)
+        columns = np.concatenate([used, self.entry_columns])
+        rows = np.concatenate([np.full(len(used), len(self.rows)), self.entry_rows])
+        values = np.concatenate([self.objective[used], self.entry_values])
+        rank = np.where(self.binary, 0, 1)[columns]
+        order = np.lexsort((columns, rank))
+        integer_lines = int((rank == 0).sum())
+
+        names = np.char.add("    ", self.columns).astype(object)
+        row_names = np.char.add(np.char.add(" ", np.append(self.rows, "obj")), " ").astype(object)
+        lines = (
+            names[columns[order]] + row_names[rows[order]] + _texts(values[order]) + "\n"
+        ).tolist()
+
+        with open(path, "w") as f:
+            f.write("NAME cvrp\nROWS\n N obj\n")
+            for name, sense in zip(self.rows.tolist(), self.senses.tolist()):
+                f.write(f" {sense} {name}\n")
+            f.write("COLUMNS\n")
+            f.write("    MARKER 'MARKER' 'INTORG'\n")
+            f.write("".join(lines[:integer_lines]))
+            f.write("    MARKER 'MARKER' 'INTEND'\n")
+            f.write("".join(lines[integer_lines:]))
+
+            f.write("RHS\n")
+            nonzero = np.flatnonzero(self.rhs)
+            for name, value in zip(self.rows[nonzero].tolist(), self.rhs[nonzero].tolist()):
+                f.write(f"    RHS {name} {_number(value)}\n")
+
+            f.write("BOUNDS\n")
+            f.write("".join(f" BV BND {name}\n" for name in self.columns[self.binary].tolist()))
+            continuous = np.flatnonzero(~self.binary)
+            for name, lower, upper in zip(
+                self.columns[continuous].tolist(),
+                self.lower[continuous].tolist(),
+                self.upper[continuous].tolist(),
+            ):
+                if lower != 0:
+                    f.write(f" LO BND {name} {_number(lower)}\n")
+                if not math.isinf(upper):
+                    f.write(f" UP BND {name} {_number(upper)}\n")
+            f.write("ENDATA\n")
+
+
+def _number(value: float) -> str:
+    """Text of a coefficient (12 significant digits)."""
+    return f"{value:.12g}"
+
+
+def _signed(value: float) -> str:
+    """Coefficient text of an LP term: " + 2.5 " or " - 132 "."""
+    return f" - {_number(-value)} " if value < 0 else f" + {_number(value)} "
+
+
+def _texts(values: np.ndarray, format_value=_number) -> np.ndarray:
+    """
+    Text of every value as an object array.
+
+    Coefficients repeat (unit flows, capacities, distances shared by all
+    vehicles), so each distinct value is formatted once.
+    """
+    distinct, inverse = np.unique(values, return_inverse=True)
+    texts = np.array([format_value(value) for value in distinct.tolist()], dtype=object)
+    return texts[inverse.ravel()]
+
+
+def _terms(values: np.ndarray, columns: np.ndarray, names: np.ndarray) -> List[str]:
+    """LP terms (" + 2.5 x_V001_CD01_C003") of coefficients and column positions."""
+    return (_texts(values, _signed) + names[columns]).tolist()
+
+
+def _names(prefix: str, *parts: np.ndarray) -> np.ndarray:
+    """prefix_part1_part2... for aligned arrays of ID strings."""
+    names = np.full(len(parts[0]), prefix)
+    for part in parts:
+        names = np.char.add(np.char.add(names, "_"), part)
+    return names
+
+
+def neighbor_lists(validator: SolutionValidator, k: int) -> Dict[str, list]:
+    """k nearest clients of every client by haversine distance."""
+    clients = np.arange(validator.client_nodes.start, validator.client_nodes.stop)
+    index = SpatialIndex(
+        [validator.node_ids[node] for node in clients],
+        validator.nodes.latitude[clients],
+        validator.nodes.longitude[clients],
+    )
+    _, neighbors = index.neighbors(min(k, len(index) - 1))
+    return {
+        loc_id: [index.ids[j] for j in row] for loc_id, row in zip(index.ids, neighbors.tolist())
+    }
+
+
+class _Rows:
+    """Constraint rows and matrix nonzeros collected block by block."""
+
+    def __init__(self):
+        self.names: List[np.ndarray] = []
+        self.senses: List[np.ndarray] = []
+        self.rhs: List[np.ndarray] = []
+        self.entries: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self.count = 0
+
+    def add(self, names, sense: str, rhs, entries: List[tuple]) -> None:
+        """
+        Append a block of rows.
+
+        Args:
+            names: Row names of the block
+            sense: EQUAL, LESS or GREATER
+            rhs: Right-hand side per row (or one value for all)
+            entries: (block row, column, value) arrays of the nonzeros
+        """
+        names = np.asarray(names)
+        self.names.append(names)
+        self.senses.append(np.full(len(names), sense))
+        self.rhs.append(np.broadcast_to(np.asarray(rhs, dtype=float), len(names)))
+        for rows, columns, values in entries:
+            rows = np.asarray(rows, dtype=np.intp)
+            self.entries.append(
+                (
+                    rows + self.count,
+                    np.asarray(columns, dtype=np.intp),
+                    np.broadcast_to(np.asarray(values, dtype=float), len(rows)),
+                )
+            )
+        self.count += len(names)
+
+    def arrays(self) -> tuple:
+        def joined(parts, dtype):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+        return (
+            joined(self.names, str),
+            joined(self.senses, str),
+            joined(self.rhs, float),
+            joined([rows for rows, _, _ in self.entries], np.intp),
+            joined([columns for _, columns, _ in self.entries], np.intp),
+            joined([values for _, _, values in self.entries], float),
+        )
+
+
+def build_model(
+    validator: SolutionValidator, neighbors: Optional[Dict[str, list]] = None
+) -> RoutingModel:
+    """
+    Multi-depot CVRP model of a loaded validator's instance.
+
+    Args:
+        validator: SolutionValidator or ProjectAValidator (any distance method
+            with a dense distance table)
+        neighbors: Client ID mapped to nearby client IDs; client-to-client
+            arcs are kept only between neighbors (either direction)
+
+    Returns:
+        RoutingModel ready to write
+
+    Raises:
+        ValueError: If some client cannot be reached by any vehicle
+    """
+    num_depots = len(validator.depot_ids)
+    num_nodes = num_depots + len(validator.client_ids)
+    node_ids = np.array(validator.node_ids[:num_nodes])
+    is_depot = np.arange(num_nodes) < num_depots
+    demand = validator.nodes.demand[:num_nodes].astype(float)
+    table = np.asarray(validator.distance_table(), dtype=float)[:num_nodes, :num_nodes]
+
+    # Arcs between distinct nodes, except between depots
+    tails, heads = np.nonzero(~np.eye(num_nodes, dtype=bool))
+    keep = ~(is_depot[tails] & is_depot[heads]) & np.isfinite(table[tails, heads])
+    if neighbors is not None:
+        near = np.zeros((num_nodes, num_nodes), dtype=bool)
+        for loc_id, nearby in neighbors.items():
+            i = validator.nodes.lookup(loc_id)
+            js = validator.nodes.indices(nearby)
+            if 0 <= i < num_nodes:
+                js = js[(js >= 0) & (js < num_nodes)]
+                near[i, js] = near[js, i] = True
+        keep &= is_depot[tails] | is_depot[heads] | near[tails, heads]
+    tails, heads = tails[keep], heads[keep]
+    arc_km = table[tails, heads]
+
+    # Vehicles and the arcs each may drive
+    vehicle_numbers = sorted(validator.vehicle_specs)
+    vehicle_ids = np.array([f"V{number:03d}" for number in vehicle_numbers])
+    capacity = np.array([validator.vehicle_specs[n]["capacity"] for n in vehicle_numbers], float)
+    vehicle_range = np.array([validator.vehicle_specs[n]["range"] for n in vehicle_numbers], float)
+    serves = np.ones((len(vehicle_numbers), num_nodes), dtype=bool)
+    for k, number in enumerate(vehicle_numbers):
+        serves[k, num_depots:] = validator.serviceable_clients(number)
+    x_vehicle, x_arc = np.nonzero(serves[:, tails] & serves[:, heads])
+    x_tail, x_head = tails[x_arc], heads[x_arc]
+
+    unreachable = np.setdiff1d(np.arange(num_depots, num_nodes), x_head)
+    if len(unreachable):
+        raise ValueError(
+            f"{len(unreachable)} client(s) have no arc any vehicle may drive: "
+            f"{', '.join(node_ids[unreachable[:5]])}\n"
+            "Check the distance matrix, the vehicle size restrictions and the neighbor lists."
+        )
+
+    # Objective: activation on depot departures, per-km cost on every arc
+    fixed = np.zeros(len(vehicle_numbers))
+    per_km = np.ones(len(vehicle_numbers))
+    if validator.has_costs():
+        for k, number in enumerate(vehicle_numbers):
+            params = validator.route_cost_parameters(number)
+            fixed[k] = params.fixed
+            per_km[k] = params.distance + params.time / params.speed
+            per_km[k] += params.fuel_price / params.fuel_efficiency
+
+    # Columns: x, then u per client, load per vehicle and w per (vehicle, depot)
+    num_x = len(x_vehicle)
+    clients = np.arange(num_depots, num_nodes)
+    u_column = np.full(num_nodes, -1, dtype=np.intp)
+    u_column[clients] = num_x + np.arange(len(clients))
+    load_column = num_x + len(clients) + np.arange(len(vehicle_numbers))
+    # Project A depot inventories (other validators have none)
+    depot_capacity = getattr(validator, "depot_capacity", np.full(num_depots, np.inf))
+    limited = np.flatnonzero(np.isfinite(depot_capacity))
+    w_vehicle = np.repeat(np.arange(len(vehicle_numbers)), len(limited))
+    w_depot = np.tile(limited, len(vehicle_numbers))
+    w_column = num_x + len(clients) + len(vehicle_numbers) + np.arange(len(w_vehicle))
+
+    max_capacity = float(capacity.max(initial=0))
+    columns = np.concatenate(
+        [
+            _names("x", vehicle_ids[x_vehicle], node_ids[x_tail], node_ids[x_head]),
+            _names("u", node_ids[clients]),
+            _names("load", vehicle_ids),
+            _names("w", vehicle_ids[w_vehicle], node_ids[w_depot]),
+        ]
+    )
+    objective = np.zeros(len(columns))
+    objective[:num_x] = per_km[x_vehicle] * arc_km[x_arc] + fixed[x_vehicle] * is_depot[x_tail]
+    lower = np.zeros(len(columns))
+    lower[u_column[clients]] = demand[clients]
+    upper = np.full(len(columns), np.inf)
+    upper[:num_x] = 1.0
+    upper[u_column[clients]] = max_capacity
+    upper[load_column] = capacity
+    binary = np.zeros(len(columns), dtype=bool)
+    binary[:num_x] = True
+
+    x = np.arange(num_x)
+    rows = _Rows()
+    departs = is_depot[x_tail]
+    to_client = ~is_depot[x_head]
+
+    rows.add(
+        _names("visit", node_ids[clients]),
+        EQUAL,
+        1.0,
+        [(x_head[to_client] - num_depots, x[to_client], 1.0)],
+    )
+
+    # Flow balance of every node a vehicle may use
+    flow_in = x_vehicle * num_nodes + x_head
+    flow_out = x_vehicle * num_nodes + x_tail
+    flow_rows, positions = np.unique(np.concatenate([flow_in, flow_out]), return_inverse=True)
+    rows.add(
+        _names("flow", vehicle_ids[flow_rows // num_nodes], node_ids[flow_rows % num_nodes]),
+        EQUAL,
+        0.0,
+        [(positions[:num_x], x, 1.0), (positions[num_x:], x, -1.0)],
+    )
+
+    rows.add(_names("start", vehicle_ids), LESS, 1.0, [(x_vehicle[departs], x[departs], 1.0)])
+    rows.add(
+        _names("load", vehicle_ids),
+        EQUAL,
+        0.0,
+        [
+            (np.arange(len(vehicle_numbers)), load_column, 1.0),
+            (x_vehicle[to_client], x[to_client], -demand[x_head[to_client]]),
+        ],
+    )
+    ranged = np.isfinite(vehicle_range)
+    range_row = np.cumsum(ranged) - 1
+    has_range = ranged[x_vehicle]
+    rows.add(
+        _names("range", vehicle_ids[ranged]),
+        LESS,
+        vehicle_range[ranged],
+        [(range_row[x_vehicle[has_range]], x[has_range], arc_km[x_arc[has_range]])],
+    )
+
+    # MTZ load ordering on client-to-client arcs, shared by all vehicles
+    between = np.flatnonzero(~is_depot[tails] & ~is_depot[heads])
+    mtz_row = np.full(len(tails), -1, dtype=np.intp)
+    mtz_row[between] = np.arange(len(between))
+    on_client_arc = mtz_row[x_arc] >= 0
+    rows.add(
+        _names("mtz", node_ids[tails[between]], node_ids[heads[between]]),
+        LESS,
+        max_capacity - demand[heads[between]],
+        [
+            (np.arange(len(between)), u_column[tails[between]], 1.0),
+            (np.arange(len(between)), u_column[heads[between]], -1.0),
+            (mtz_row[x_arc[on_client_arc]], x[on_client_arc], max_capacity),
+        ],
+    )
+
+    # Depot inventories (Project A): w[k,d] takes load[k] when k starts at d
+    if len(w_vehicle):
+        block = np.full((len(vehicle_numbers), num_depots), -1, dtype=np.intp)
+        block[w_vehicle, w_depot] = np.arange(len(w_vehicle))
+        from_limited = departs & (block[x_vehicle, np.minimum(x_tail, num_depots - 1)] >= 0)
+        rows.add(
+            _names("depot", vehicle_ids[w_vehicle], node_ids[w_depot]),
+            GREATER,
+            -capacity[w_vehicle],
+            [
+                (np.arange(len(w_vehicle)), w_column, 1.0),
+                (np.arange(len(w_vehicle)), load_column[w_vehicle], -1.0),
+                (
+                    block[x_vehicle[from_limited], x_tail[from_limited]],
+                    x[from_limited],
+                    -capacity[x_vehicle[from_limited]],
+                ),
+            ],
+        )
+        inventory_row = np.searchsorted(limited, w_depot)
+        rows.add(
+            _names("inventory", node_ids[limited]),
+            LESS,
+            depot_capacity[limited],
+            [(inventory_row, w_column, 1.0)],
+        )
+
+    names, senses, rhs, entry_rows, entry_columns, entry_values = rows.arrays()
+    return RoutingModel(
+        columns=columns,
+        objective=objective,
+        lower=lower,
+        upper=upper,
+        binary=binary,
+        rows=names,
+        senses=senses,
+        rhs=rhs,
+        entry_rows=entry_rows,
+        entry_columns=entry_columns,
+        entry_values=entry_values,
+    )
+
+
+def read_solution_values(path: str) -> Dict[str, float]:
+    """
+    Arc variable values from a solver's solution file.
+
+    Reads any format listing each variable name followed by its value on
+    one line: Gurobi, SCIP and HiGHS .sol files ("name value") and CBC
+    solutions ("index name value cost"). Other lines are ignored.
+
+    Returns:
+        x_... column name mapped to its value
+    """
+    values = {}
+    with open(path) as f:
+        for line in f:
+            tokens = line.split()
+            for position, token in enumerate(tokens[:-1]):
+                if token.startswith("x_"):
+                    try:
+                        values[token] = float(tokens[position + 1])
+                    except ValueError:
+                        pass
+                    break
+    return values
+
+
+def solution_routes(values: Dict[str, float]) -> List[Tuple[str, str, List[str]]]:
+    """
+    Routes of the used arcs of a solution.
+
+    Args:
+        values: Column values as returned by read_solution_values
+
+    Returns:
+        (vehicle ID, depot ID, client IDs in visit order) per used vehicle,
+        by vehicle ID
+
+    Raises:
+        ValueError: If a vehicle's arcs do not form one route from a depot
+    """
+    successors: Dict[str, Dict[str, str]] = {}
+    for name, value in values.items():
+        if value > ARC_THRESHOLD:
+            _, vehicle, tail, head = name.split("_")
+            arcs = successors.setdefault(vehicle, {})
+            if tail in arcs:
+                raise ValueError(f"Vehicle {vehicle} leaves {tail} twice in the solution")
+            arcs[tail] = head
+
+    routes = []
+    for vehicle in sorted(successors):
+        arcs = successors[vehicle]
+        depots = [tail for tail in arcs if tail.startswith("CD")]
+        if len(depots) != 1:
+            raise ValueError(
+                f"Vehicle {vehicle} leaves {len(depots)} depots in the solution\n"
+                "Each vehicle must drive one route from one depot."
+            )
+        depot = depots[0]
+        clients = []
+        stop = arcs[depot]
+        while stop != depot and len(clients) < len(arcs):
+            clients.append(stop)
+            stop = arcs.get(stop, depot)
+        if len(clients) != len(arcs) - 1:
+            raise ValueError(
+                f"Vehicle {vehicle} has arcs outside its route from {depot} (a subtour)\n"
+                "The solution is not integer feasible; check the solver status."
+            )
+        routes.append((vehicle, depot, clients))
+    return routes
+
+
+def write_solution_csv(
+    validator: SolutionValidator, routes: List[Tuple[str, str, List[str]]], output_file: str
+) -> None:
+    """
+    Write routes as a verification file, with distances, times and fuel costs.
+
+    Args:
+        validator: Validator of the instance the routes belong to
+        routes: (vehicle ID, depot ID, client IDs) per route
+        output_file: Destination verificacion_caso*.csv
+    """
+    nodes = validator.nodes
+    with open(output_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SOLUTION_COLUMNS)
+        for vehicle, depot, clients in routes:
+            stops = nodes.indices([depot, *clients, depot])
+            distance = float(validator.node_distances(stops[:-1], stops[1:]).sum())
+            demands = nodes.demand[stops[1:-1]].tolist()
+            if validator.has_costs():
+                params = validator.route_cost_parameters(int(vehicle[1:]))
+                time_min = params.travel_time(distance)
+                fuel = distance / params.fuel_efficiency * params.fuel_price
+            else:
+                time_min, fuel = distance / DEFAULT_SPEED * 60, 0.0
+            writer.writerow(
+                [
+                    vehicle,
+                    depot,
+                    sum(demands),
+                    "-".join([depot, *clients, depot]),
+                    len(clients),
+                    "-".join(map(str, demands)),
+                    round(distance, 3),
+                    round(time_min, 2),
+                    round(fuel, 1),
+                ]
+            )
+
+
+def add_instance_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options that load an instance (project, parameters, distances)."""
+    parser.add_argument(
+        "--project",
+        choices=list(VALIDATORS),
+        default="base",
+        help="Instance type: base case or Project A (multi-depot, inventories, vehicle sizes)",
+    )
+    parser.add_argument(
+        "--parameters",
+        type=str,
+        default=None,
+        help="Cost parameters file (default: the project's parameters file)",
+    )
+    parser.add_argument(
+        "--method",
+        choices=["haversine", "geopy", "osrm", "matrix"],
+        default="haversine",
+        help="Distance calculation method (default: haversine)",
+    )
+    parser.add_argument("--matrix", type=str, default=None, help="Distance matrix file")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=DEFAULT_SPEED,
+        help=f"Average speed in km/h for the time cost (default: {DEFAULT_SPEED:g})",
+    )
+
+
+def load_validator(parser: argparse.ArgumentParser, args: argparse.Namespace) -> SolutionValidator:
+    """Validator of the instance in the working directory, without a solution."""
+    if args.method == "matrix" and not args.matrix:
+        parser.error("--matrix argument is required when using --method matrix")
+    options = {
+        "distance_method": args.method,
+        "matrix_file": args.matrix,
+        "speed": args.speed,
+        "load_solution": False,
+    }
+    if args.parameters:
+        options["parameters_file"] = args.parameters
+    return VALIDATORS[args.project](**options)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write the CVRP of an instance as an LP/MPS model, or turn a solver "
+        "solution of it into a verification file"
+    )
+    add_instance_arguments(parser)
+    parser.add_argument(
+        "--neighbors",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Keep client-to-client arcs only to the K nearest clients (0 keeps every arc)",
+    )
+    parser.add_argument(
+        "--neighbors-file",
+        type=str,
+        default=None,
+        help="Prune client-to-client arcs with the neighbor lists of this .npz file",
+    )
+    parser.add_argument(
+        "--read-solution",
+        type=str,
+        default=None,
+        metavar="SOL",
+        help="Solver solution file to convert into a verification file",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Model file (.lp or .mps, default model.lp), or the verification file "
+        f"written with --read-solution (default {SOLVER_SOLUTION_FILE})",
+    )
+    args = parser.parse_args()
+
+    if args.neighbors < 0:
+        parser.error("--neighbors must be 0 or more")
+    if args.neighbors and args.neighbors_file:
+        parser.error("use either --neighbors or --neighbors-file")
+
+    try:
+        validator = load_validator(parser, args)
+
+        if args.read_solution:
+            output = args.output or SOLVER_SOLUTION_FILE
+            routes = solution_routes(read_solution_values(args.read_solution))
+            write_solution_csv(validator, routes, output)
+            print(f"Wrote {len(routes)} routes to {output}")
+            return
+
+        neighbors = None
+        if args.neighbors_file:
+            neighbors = read_neighbor_lists(args.neighbors_file)
+        elif args.neighbors:
+            neighbors = neighbor_lists(validator, args.neighbors)
+
+        output = args.output or "model.lp"
+        start = time.perf_counter()
+        model = build_model(validator, neighbors)
+        model.write(output)
+        stats = model.stats()
+        print(
+            f"Wrote {output}: {stats['binaries']:,} binary and {stats['continuous']:,} "
+            f"continuous variables, {stats['rows']:,} constraints, {stats['nonzeros']:,} "
+            f"nonzeros ({time.perf_counter() - start:.2f} s)"
+        )
+
+    except Exception as e:
+        print(f"\nError: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Batched OSRM road distances via the table service.
+
+Resolves many origin/destination legs with a few /table requests instead of
+one /route request per leg. Requests share a pooled HTTP session, run
+concurrently, retry with exponential backoff and count against an optional
+per-run request budget.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_OSRM_URL = "http://router.project-osrm.org"
+
+# The public demo server rejects tables with more than 100 coordinates
+DEFAULT_MAX_TABLE_SIZE = 100
+
+# HTTP status codes worth retrying
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+Coordinate = Tuple[float, float]
+
+
+class OSRMError(Exception):
+    """Raised when OSRM cannot provide the requested distances."""
+
+
+class OSRMBudgetExceeded(OSRMError):
+    """Raised when a run would exceed its request budget."""
+
+
+class OSRMTableClient:
+    """
+    Client for the OSRM /table service.
+
+    Args:
+        base_url: Server root, e.g. http://localhost:5000 for a local instance
+        profile: Routing profile in the URL (driving, car, ...)
+        timeout: Per-request timeout in seconds
+        max_retries: Retries per request after the first attempt
+        backoff: Initial retry delay in seconds, doubled on every retry
+        request_budget: Maximum HTTP requests for this client (None = unlimited)
+        max_table_size: Maximum coordinates per table request
+        workers: Concurrent requests (also the connection pool size)
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_OSRM_URL,
+        profile: str = "driving",
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        request_budget: Optional[int] = None,
+        max_table_size: int = DEFAULT_MAX_TABLE_SIZE,
+        workers: int = 4,
+    ):
+        if max_table_size < 2:
+            raise ValueError("max_table_size must be at least 2")
+
+        self.base_url = base_url.rstrip("/")
+        self.profile = profile
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.request_budget = request_budget
+        self.max_table_size = max_table_size
+        self.workers = workers
+        self.requests_made = 0
+        # Seconds per HTTP request (read by profiling.Profiler)
+        self.latencies: List[float] = []
+        self._lock = threading.Lock()
+
+        # Imported here so validators that never call OSRM skip loading requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _reserve_request(self) -> None:
+        """Count one HTTP request against the budget."""
+        with self._lock:
+            if self.request_budget is not None and self.requests_made >= self.request_budget:
+                raise OSRMBudgetExceeded(
+                    f"OSRM request budget of {self.request_budget} exhausted"
+                )
+            self.requests_made += 1
+
+    def _get(self, url: str, params: Dict) -> Dict:
+        """GET with retry and exponential backoff; returns the decoded JSON."""
+        import requests
+
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            self._reserve_request()
+            try:
+                start = time.perf_counter()
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                self.latencies.append(time.perf_counter() - start)
+                if response.status_code not in _RETRY_STATUS:
+                    return response.json()
+                error = OSRMError(f"OSRM returned HTTP {response.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = OSRMError(f"OSRM request failed: {e}")
+
+            if attempt < self.max_retries:
+                time.sleep(delay)
+                delay *= 2
+
+        raise error
+
+    def _table_request(
+        self, coordinates: Sequence[Coordinate], sources: List[int], destinations: List[int]
+    ) -> List[List[Optional[float]]]:
+        """Run one /table request; distances are returned in meters."""
+        coords = ";".join(f"{lon},{lat}" for lat, lon in coordinates)
+        url = f"{self.base_url}/table/v1/{self.profile}/{coords}"
+        params = {
+            "sources": ";".join(map(str, sources)),
+            "destinations": ";".join(map(str, destinations)),
+            "annotations": "distance",
+        }
+
+        data = self._get(url, params)
+        if data.get("code") != "Ok" or "distances" not in data:
+            raise OSRMError(
+                f"OSRM table request failed: {data.get('code')} {data.get('message', '')}"
+            )
+        return data["distances"]
+
+    def _resolve_block(
+        self, coordinates: Sequence[Coordinate], legs: List[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], float]:
+        """Resolve legs whose endpoints fit in a single table request."""
+        origins = sorted({leg[0] for leg in legs})
+        destinations = sorted({leg[1] for leg in legs})
+        nodes = sorted(set(origins) | set(destinations))
+        position = {node: k for k, node in enumerate(nodes)}
+
+        table = self._table_request(
+            [coordinates[node] for node in nodes],
+            [position[node] for node in origins],
+            [position[node] for node in destinations],
+        )
+        row = {node: r for r, node in enumerate(origins)}
+        col = {node: c for c, node in enumerate(destinations)}
+
+        distances = {}
+        for origin, destination in legs:
+            meters = table[row[origin]][col[destination]]
+            if meters is not None:
+                distances[(origin, destination)] = meters / 1000
+        return distances
+
+    def _plan_blocks(self, legs: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+        """Group legs into requests of at most max_table_size coordinates."""
+        nodes = sorted({node for leg in legs for node in leg})
+        if len(nodes) <= self.max_table_size:
+            return [legs]
+
+        # Split nodes into chunks; each request covers one (origin, destination)
+        # chunk pair, so it never holds more than two chunks of coordinates.
+        chunk_size = self.max_table_size // 2
+        chunk_of = {node: k // chunk_size for k, node in enumerate(nodes)}
+        blocks: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for leg in legs:
+            blocks.setdefault((chunk_of[leg[0]], chunk_of[leg[1]]), []).append(leg)
+        return list(blocks.values())
+
+    def distances(
+        self, coordinates: Sequence[Coordinate], legs: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], float]:
+        """
+        Road distances for many legs with batched, concurrent table requests.
+
+        Args:
+            coordinates: (latitude, longitude) per node
+            legs: (origin, destination) node index pairs
+
+        Returns:
+            Dict mapping each resolved leg to its distance in kilometers. Legs
+            OSRM could not route, or whose request failed, are left out.
+        """
+        legs = sorted(set(legs))
+        if not legs:
+            return {}
+
+        blocks = self._plan_blocks(legs)
+        resolved: Dict[Tuple[int, int], float] = {}
+        failures = []
+
+        def run(block):
+            try:
+                return self._resolve_block(coordinates, block)
+            except OSRMError as e:
+                failures.append(str(e))
+                return {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for result in pool.map(run, blocks):
+                resolved.update(result)
+
+        if failures:
+            print(
+                f"OSRM: {len(failures)} of {len(blocks)} table requests failed "
+                f"({failures[0]})"
+            )
+
+        return resolved
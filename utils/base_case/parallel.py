@@ -0,0 +1,155 @@
+"""
+Parallel validation on a process pool.
+
+Workers are forked from the process that loaded the validator, so instance
+tables and distance matrices are shared read-only through copy-on-write
+memory instead of being pickled for every task. Tasks carry only a solution
+file name or a chunk of solution rows.
+
+- Batch mode shards solution files across workers; results come back in
+  input order.
+- Large single solutions are split into route chunks; their errors, visit
+  counts and route costs are merged in row order, so the result is
+  identical to a sequential validate_solution.
+
+Works with SolutionValidator and the project subclasses. Each worker opens
+its own connection to the SQLite distance cache and keeps its own route memo.
+
+Usage:
+  with ParallelValidator(validator, workers=8) as parallel:
+      for row in parallel.validate_batch(solution_files):
+          ...
+"""
+
+import multiprocessing
+import os
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+# Solutions with fewer routes are validated in one task
+MIN_ROUTES_PER_CHUNK = 256
+
+# Validator inherited by forked workers
+_worker_validator = None
+
+
+def default_workers() -> int:
+    """Number of CPUs available to this process."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _install_validator(validator) -> None:
+    """Pool initializer: keep the inherited validator and reopen its cache."""
+    global _worker_validator
+    _worker_validator = validator
+    if validator.distance_cache is not None:
+        # SQLite connections must not be shared across a fork
+        validator.load_cache()
+
+
+def _validate_file(solution_file: str) -> Dict:
+    """Worker task: validate one solution file into a batch result row."""
+    entry = _worker_validator.batch_entry(solution_file)
+    _worker_validator.save_cache()
+    return entry
+
+
+def _validate_chunk(task) -> Dict:
+    """Worker task: check one chunk of solution rows."""
+    chunk_df, first_row = task
+    partial = _worker_validator.validate_chunk(chunk_df, first_row)
+    _worker_validator.save_cache()
+    return partial
+
+
+class ParallelValidator:
+    """
+    Run a loaded validator's batch and single-solution checks on a process pool.
+
+    Args:
+        validator: Loaded SolutionValidator (or project subclass)
+        workers: Number of worker processes (default: available CPUs).
+            With 1 worker, or where fork is unavailable, everything runs
+            in this process.
+    """
+
+    def __init__(self, validator, workers: Optional[int] = None):
+        self.validator = validator
+        self.workers = workers or default_workers()
+        self._pool = None
+
+        if self.workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            print("Warning: parallel validation needs fork; validating in one process")
+            self.workers = 1
+
+    def __enter__(self) -> "ParallelValidator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pool(self):
+        """Process pool, started on first use."""
+        if self._pool is None:
+            # Flush pending cache entries so workers start from the same state
+            self.validator.save_cache()
+            context = multiprocessing.get_context("fork")
+            self._pool = context.Pool(
+                self.workers,
+                initializer=_install_validator,
+                initargs=(self.validator,),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def validate_batch(self, solution_files: Iterable[str]) -> Iterator[Dict]:
+        """
+        Validate solution files across the workers.
+
+        Yields:
+            validate_batch result rows, in the order of solution_files
+        """
+        if self.workers == 1:
+            yield from self.validator.validate_batch(solution_files)
+            return
+
+        solution_files = list(solution_files)
+        chunksize = max(1, len(solution_files) // (self.workers * 8))
+        yield from self.pool.imap(_validate_file, solution_files, chunksize=chunksize)
+
+    def validate_solution(self, solution_df=None, save_cache: bool = True) -> Dict:
+        """
+        Validate one solution, splitting its routes into chunks across workers.
+
+        Args:
+            solution_df: Solution to validate (defaults to the loaded solution file)
+            save_cache: Write the distance cache to disk after validating
+
+        Returns:
+            Result dict as returned by validate_solution
+        """
+        if solution_df is None:
+            solution_df = self.validator.solution_df
+        num_chunks = 0
+        if solution_df is not None:
+            num_chunks = min(self.workers, len(solution_df) // MIN_ROUTES_PER_CHUNK)
+        if num_chunks <= 1:
+            return self.validator.validate_solution(solution_df, save_cache=save_cache)
+
+        bounds = np.linspace(0, len(solution_df), num_chunks + 1).astype(int)
+        tasks = [
+            (solution_df.iloc[start:stop], int(start))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        partials = self.pool.map(_validate_chunk, tasks)
+        return self.validator.merge_results(partials, solution_df)
@@ -0,0 +1,168 @@
+"""
+Instrumentation for the solution validators.
+
+A Profiler passed to a validator records:
+- wall time per phase (instance loading, matrix building, parsing, each
+  route check, coverage, costs), accumulated over all calls
+- counters (distance calls per method, route legs resolved from tables)
+- distance cache hit ratio and OSRM request latencies (histogram, p50/p95)
+- route memo hit ratio (--route-memo)
+- the memory high-water mark of the process
+
+and reports them as one JSON document (--profile in the validator CLIs).
+Validators default to NULL_PROFILER, whose hooks do nothing.
+
+Usage:
+  profiler = Profiler()
+  validator = SolutionValidator(profiler=profiler)
+  validator.validate_solution()
+  profiler.write("profile.json", validator)
+"""
+
+import contextlib
+import json
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Upper bounds (milliseconds) of the OSRM latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss / 1e6 if sys.platform == "darwin" else max_rss / 1e3
+
+
+def latency_summary(latencies: Iterable[float]) -> Dict:
+    """
+    Histogram and percentiles of request latencies given in seconds.
+
+    Returns:
+        Dict with count, p50_ms, p95_ms, max_ms and histogram (bucket upper
+        bound in ms, or "inf", mapped to request count)
+    """
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    if not latencies_ms:
+        return {"count": 0}
+
+    histogram = {}
+    remaining = iter(latencies_ms)
+    latency = next(remaining, None)
+    for bound in (*LATENCY_BUCKETS_MS, "inf"):
+        count = 0
+        while latency is not None and (bound == "inf" or latency <= bound):
+            count += 1
+            latency = next(remaining, None)
+        histogram[str(bound)] = count
+
+    def percentile(q: float) -> float:
+        return latencies_ms[min(len(latencies_ms) - 1, int(q * len(latencies_ms)))]
+
+    return {
+        "count": len(latencies_ms),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "max_ms": latencies_ms[-1],
+        "histogram": histogram,
+    }
+
+
+class Profiler:
+    """Accumulates phase timings and counters for one validator run."""
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, list] = {}
+        self.counters: Counter = Counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block and add it to the phase total."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add one timed call of a phase."""
+        totals = self.phases.setdefault(name, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] += amount
+
+    def report(self, validator=None) -> Dict:
+        """
+        Build the JSON-serializable profile.
+
+        Args:
+            validator: Profiled validator, for distance cache and OSRM figures
+
+        Returns:
+            Dict with wall_seconds, phases (seconds and calls per phase),
+            counters, distance_cache, route_memo, osrm and memory sections
+        """
+        report = {
+            "wall_seconds": time.perf_counter() - self.started,
+            "phases": {
+                name: {"seconds": seconds, "calls": calls}
+                for name, (seconds, calls) in sorted(
+                    self.phases.items(), key=lambda item: -item[1][0]
+                )
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "memory": {"max_rss_mb": max_rss_mb()},
+        }
+        if validator is not None:
+            report["distance_method"] = validator.distance_method
+            report["distance_cache"] = validator.cache_stats()
+            if validator.route_memo is not None:
+                report["route_memo"] = validator.memo_stats()
+            if validator.osrm_client is not None:
+                report["osrm"] = {
+                    "requests": validator.osrm_client.requests_made,
+                    "latency": latency_summary(validator.osrm_client.latencies),
+                }
+        return report
+
+    def write(self, path: str, validator=None) -> Dict:
+        """Write the report as JSON to path and return it."""
+        report = self.report(validator)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+class NullProfiler:
+    """Profiler stand-in whose hooks do nothing (the validators' default)."""
+
+    enabled = False
+    _null_phase = contextlib.nullcontext()
+
+    def phase(self, name: str):
+        return self._null_phase
+
+    def add_time(self, name: str, seconds: float) -> None:
+        pass
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
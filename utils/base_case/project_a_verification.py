@@ -0,0 +1,407 @@
+"""
+Project A (urban logistics, Bogotá) solution validator.
+
+Extends SolutionValidator with the Project A rules:
+- Multiple depots (12 in the case data): each route starts and ends at its
+  DepotId and every vehicle departs from exactly one depot
+- Depot inventory: the InitialLoads dispatched from a depot cannot exceed its
+  Capacity in depots.csv
+- Vehicle size restrictions (Caso 3): a client's VehicleSizeRestriction is
+  the largest vehicle type allowed to serve it
+- Routes are priced with the fuel efficiency of their vehicle type
+
+Checks run on all routes of a chunk at once: vehicle/client compatibility is
+a precomputed boolean matrix (vehicle type x node) indexed with the interned
+stops, and loads, route counts and distances are aggregated per depot with
+one bincount over the routes, then summed across chunks for the inventory
+check. The result lists per-depot utilization.
+
+Usage (from Proyecto_A_Caso2/ or Proyecto_A_Caso3/):
+  python ../../utils/base_case/project_a_verification.py
+  python ../../utils/base_case/project_a_verification.py --solution verificacion_caso3.csv
+  python ../../utils/base_case/project_a_verification.py --method matrix --matrix distances.npz
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from base_case_verification import (
+    SolutionValidator,
+    add_distance_arguments,
+    add_sweep_arguments,
+    check_distance_arguments,
+    distance_options,
+    print_result,
+    run_batch,
+    run_stream,
+    run_sweep,
+    write_profile,
+)
+from cost_model import DEFAULT_SPEED, CostParameters
+from csv_table import numeric_column
+from instance_model import RouteStops
+from parallel import ParallelValidator
+
+# Vehicle types from smallest to largest (vehicles.csv VehicleType and
+# clients.csv VehicleSizeRestriction)
+VEHICLE_SIZES = ("small van", "medium van", "light truck")
+
+# Dispatched loads may exceed a depot's inventory by this much (kg) before
+# it is reported
+INVENTORY_TOLERANCE = 1e-6
+
+
+def _exact(value: float):
+    """Whole numbers as int (printed without decimals), others unchanged."""
+    return int(value) if float(value).is_integer() else value
+
+
+def vehicle_size_codes(values, column: str) -> np.ndarray:
+    """
+    Convert vehicle type names to their position in VEHICLE_SIZES.
+
+    Names are compared case-insensitively and without surrounding spaces.
+
+    Args:
+        values: Column of vehicle type names
+        column: Column name used in the error message
+
+    Raises:
+        ValueError: If a name is not one of VEHICLE_SIZES
+    """
+    codes = {name: code for code, name in enumerate(VEHICLE_SIZES)}
+    names = [str(value).strip().lower() for value in np.asarray(values).tolist()]
+    unknown = sorted(set(names) - set(codes))
+    if unknown:
+        raise ValueError(
+            f"Unknown vehicle type(s) in {column}: {', '.join(unknown)}\n"
+            f"Project A vehicle types are: {', '.join(VEHICLE_SIZES)}."
+        )
+    return np.array([codes[name] for name in names], dtype=np.intp)
+
+
+def vehicle_type_column(vehicles_df) -> np.ndarray:
+    """
+    Size code of every vehicle in vehicles.csv.
+
+    Caso 2 swaps the VehicleType and StandardizedID headers, so the type is
+    read from whichever of the two columns holds vehicle type names.
+
+    Raises:
+        ValueError: If neither column lists known vehicle types
+    """
+    columns = [c for c in ("VehicleType", "StandardizedID") if c in vehicles_df.columns]
+    known = set(VEHICLE_SIZES)
+    for column in columns:
+        names = {str(value).strip().lower() for value in np.asarray(vehicles_df[column]).tolist()}
+        if names <= known:
+            return vehicle_size_codes(vehicles_df[column], f"vehicles.csv {column}")
+    # Report the unknown names of the column meant to hold them
+    return vehicle_size_codes(vehicles_df[columns[0]], f"vehicles.csv {columns[0]}")
+
+
+class ProjectAValidator(SolutionValidator):
+    """
+    Validator for Project A verification files (Caso 2 and Caso 3).
+
+    Args:
+        parameters_file: parameters_urban.csv (costs, fuel efficiency per
+            vehicle type)
+        solution_file: Verification file to validate
+        **kwargs: Distance and speed options passed to SolutionValidator
+    """
+
+    # Per-depot aggregates summed across route chunks for the inventory check
+    summed_results = ("visits", "vehicle_routes", "depot_loads", "depot_routes", "depot_km")
+
+    def __init__(
+        self,
+        parameters_file: str = "parameters_urban.csv",
+        solution_file: Optional[str] = "verificacion_caso2.csv",
+        **kwargs,
+    ):
+        super().__init__(parameters_file=parameters_file, solution_file=solution_file, **kwargs)
+
+        # Depots are nodes 0..num_depots-1 (see instance_model.NodeTable)
+        self.num_depots = len(self.depot_ids)
+        if "Capacity" in self.depots_df.columns:
+            self.depot_capacity = numeric_column(self.depots_df["Capacity"])
+        else:
+            self.depot_capacity = np.full(self.num_depots, np.inf)
+
+        # Caso 2 lists fractional capacities and ranges; keep them exact
+        vehicle_numbers = numeric_column(self.vehicles_df["VehicleID"]).astype(int)
+        self.vehicle_specs = {
+            vehicle_number: {"capacity": _exact(capacity), "range": _exact(vehicle_range)}
+            for vehicle_number, capacity, vehicle_range in zip(
+                vehicle_numbers.tolist(),
+                numeric_column(self.vehicles_df["Capacity"]).tolist(),
+                numeric_column(self.vehicles_df["Range"]).tolist(),
+            )
+        }
+        self.max_vehicle_number = int(vehicle_numbers.max(initial=0))
+        self.vehicle_size = dict(
+            zip(vehicle_numbers.tolist(), vehicle_type_column(self.vehicles_df).tolist())
+        )
+
+        # Largest vehicle type allowed per client (any type without a restriction)
+        client_limit = np.full(len(self.client_ids), len(VEHICLE_SIZES) - 1)
+        if "VehicleSizeRestriction" in self.clients_df.columns:
+            restrictions = np.asarray(self.clients_df["VehicleSizeRestriction"]).astype(str)
+            restricted = np.char.strip(restrictions) != ""
+            restricted &= np.char.lower(np.char.strip(restrictions)) != "nan"
+            client_limit[restricted] = vehicle_size_codes(
+                restrictions[restricted], "clients.csv VehicleSizeRestriction"
+            )
+        self.client_limit = client_limit
+
+        # compatible[size, node]: whether a vehicle of that size may stop at
+        # the node (depots accept every vehicle)
+        self.compatible = np.ones((len(VEHICLE_SIZES), len(self.nodes)), dtype=bool)
+        self.compatible[:, self.client_nodes] = (
+            np.arange(len(VEHICLE_SIZES))[:, None] <= client_limit[None, :]
+        )
+
+        # Objective coefficients per vehicle type (fuel efficiency differs)
+        self.type_costs = {}
+        if self.cost_parameters is not None:
+            self.type_costs = {
+                code: CostParameters.from_file(
+                    parameters_file, vehicle_type, speed=self.cost_parameters.speed
+                )
+                for code, vehicle_type in enumerate(VEHICLE_SIZES)
+            }
+
+    def serviceable_clients(self, vehicle_number: int) -> np.ndarray:
+        """Clients whose size restriction admits the vehicle's size."""
+        return self.compatible[self.vehicle_size[vehicle_number], self.client_nodes]
+
+    def route_cost_parameters(self, vehicle_number: int) -> CostParameters:
+        """Objective coefficients of the vehicle's type."""
+        return self.type_costs[self.vehicle_size[vehicle_number]]
+
+    def cost_profiles(self) -> Dict[str, CostParameters]:
+        """Objective coefficients by vehicle type name."""
+        return {VEHICLE_SIZES[code]: costs for code, costs in self.type_costs.items()}
+
+    def route_cost_profile(self, vehicle_number: int) -> str:
+        """Type name of the vehicle's size."""
+        return VEHICLE_SIZES[self.vehicle_size[vehicle_number]]
+
+    def empty_totals(self) -> Dict[str, np.ndarray]:
+        totals = super().empty_totals()
+        totals["vehicle_routes"] = np.zeros(self.max_vehicle_number + 1, dtype=int)
+        totals["depot_loads"] = np.zeros(self.num_depots)
+        totals["depot_routes"] = np.zeros(self.num_depots, dtype=int)
+        totals["depot_km"] = np.zeros(self.num_depots)
+        return totals
+
+    def check_routes(
+        self, routes: Dict[str, list], stops: RouteStops, route_km: np.ndarray
+    ) -> Tuple[Dict[int, List[str]], Dict]:
+        """
+        Check vehicle size restrictions and aggregate the routes per depot.
+
+        Returns:
+            (size restriction errors by route, contributions to
+            "vehicle_routes" (routes per vehicle number) and, per depot,
+            "depot_loads" (dispatched InitialLoad), "depot_routes" and
+            "depot_km")
+        """
+        vehicle_numbers = np.asarray(routes["vehicle_number"], dtype=np.intp)
+        # Unknown vehicles (reported by validate_routes) get size -1 and are
+        # left out of the size and reuse checks
+        sizes = np.array(
+            [self.vehicle_size.get(n, -1) for n in vehicle_numbers.tolist()], dtype=np.intp
+        )
+        known_vehicle = sizes >= 0
+
+        # Vehicle/client compatibility for every known stop at once
+        stop_nodes = stops.stop_nodes
+        known = np.flatnonzero((stop_nodes >= 0) & known_vehicle[stops.route_of])
+        route_of = stops.route_of[known]
+        blocked = ~self.compatible[sizes[route_of], stop_nodes[known]]
+        errors: Dict[int, List[str]] = {}
+        for stop, r in zip(known[blocked].tolist(), route_of[blocked].tolist()):
+            vehicle_id = routes["vehicle_id"][r]
+            client = stop_nodes[stop] - self.client_nodes.start
+            errors.setdefault(r, []).append(
+                f"Route {vehicle_id} serves {self.client_ids[client]} with a "
+                f"{VEHICLE_SIZES[sizes[r]]}, but it only accepts up to a "
+                f"{VEHICLE_SIZES[self.client_limit[client]]}"
+            )
+
+        # Group routes by depot (routes with an unknown DepotId are left out;
+        # they are reported by the depot check)
+        depot_nodes = self.nodes.indices(routes["depot_id"])
+        at_depot = (depot_nodes >= 0) & (depot_nodes < self.num_depots)
+        depots = depot_nodes[at_depot]
+        loads = np.asarray(routes["initial_load"], dtype=float)[at_depot]
+
+        route_numbers = np.arange(len(vehicle_numbers))
+        depot_routes = route_numbers[at_depot]
+        return errors, {
+            "vehicle_routes": (
+                route_numbers[known_vehicle],
+                vehicle_numbers[known_vehicle],
+                None,
+            ),
+            "depot_loads": (depot_routes, depots, loads),
+            "depot_routes": (depot_routes, depots, None),
+            "depot_km": (depot_routes, depots, route_km[at_depot]),
+        }
+
+    def check_totals(self, totals: Dict[str, np.ndarray]) -> Dict:
+        """
+        Coverage, vehicle reuse and depot inventory checks.
+
+        Returns:
+            Dict with "errors" and "depots": per-depot routes, dispatched
+            load, inventory capacity, utilization (load / capacity, None
+            without inventory) and distance
+        """
+        errors = super().check_totals(totals)["errors"]
+
+        vehicle_routes = totals["vehicle_routes"]
+        for vehicle_number in np.flatnonzero(vehicle_routes > 1).tolist():
+            errors.append(
+                f"Vehicle V{vehicle_number:03d} departs on {vehicle_routes[vehicle_number]} "
+                "routes; each vehicle departs from exactly one depot"
+            )
+
+        loads = totals["depot_loads"]
+        capacity = self.depot_capacity
+        for depot in np.flatnonzero(loads > capacity + INVENTORY_TOLERANCE).tolist():
+            errors.append(
+                f"Depot {self.depot_ids[depot]} dispatches {loads[depot]:g} kg, "
+                f"above its inventory of {capacity[depot]:g} kg"
+            )
+
+        depots = [
+            {
+                "depot_id": self.depot_ids[d],
+                "routes": int(totals["depot_routes"][d]),
+                "load": float(loads[d]),
+                "capacity": float(capacity[d]),
+                "utilization": float(loads[d] / capacity[d]) if capacity[d] > 0 else None,
+                "distance_km": float(totals["depot_km"][d]),
+            }
+            for d in range(self.num_depots)
+        ]
+        return {"errors": errors, "depots": depots}
+
+
+def print_depots(depots: List[Dict]) -> None:
+    """Print the per-depot routes, inventory utilization and distance."""
+    print("\nDepot utilization:")
+    print(f"{'Depot':<8}{'Routes':>8}{'Load':>10}{'Inventory':>12}{'Used':>8}{'Km':>10}")
+    for depot in depots:
+        utilization = depot["utilization"]
+        used = f"{utilization:.0%}" if utilization is not None else "-"
+        print(
+            f"{depot['depot_id']:<8}{depot['routes']:>8}{depot['load']:>10,.0f}"
+            f"{depot['capacity']:>12,.0f}{used:>8}{depot['distance_km']:>10.1f}"
+        )
+
+
+def default_solution_file() -> str:
+    """Return the Caso 3 verification file if present, else the Caso 2 one."""
+    for solution_file in ("verificacion_caso3.csv", "verificacion_caso2.csv"):
+        if os.path.exists(solution_file):
+            return solution_file
+    return "verificacion_caso2.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Project A (Bogotá) Solution Validator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Checks capacity and range, depot inventories (sum of InitialLoad per depot),
+one route per vehicle and (Caso 3) the VehicleSizeRestriction of every client.
+Routes are priced with the fuel efficiency of their vehicle type.
+
+Examples:
+  python project_a_verification.py
+  python project_a_verification.py --solution verificacion_caso3.csv --verbose
+  python project_a_verification.py --solutions "runs/*.csv" --output results.jsonl
+        """,
+    )
+    parser.add_argument(
+        "--solution",
+        type=str,
+        default=None,
+        help="Path to solution file (default: verificacion_caso3.csv or verificacion_caso2.csv)",
+    )
+    parser.add_argument(
+        "--solutions",
+        type=str,
+        default=None,
+        help="Batch mode: directory or glob of solution files validated in one process",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Batch mode result table (.jsonl or .csv). Default: print one line per file",
+    )
+    parser.add_argument(
+        "--parameters",
+        type=str,
+        default="parameters_urban.csv",
+        help="Cost parameters file; routes are priced when it exists",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=DEFAULT_SPEED,
+        help=f"Average urban speed in km/h for route times (default: {DEFAULT_SPEED:g})",
+    )
+    add_distance_arguments(parser)
+    add_sweep_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="Show detailed output")
+
+    args = parser.parse_args()
+    check_distance_arguments(parser, args)
+
+    if args.output and not args.solutions:
+        parser.error("--output requires --solutions")
+
+    project_options = {"parameters_file": args.parameters, "speed": args.speed}
+
+    if args.solutions:
+        run_batch(args, ProjectAValidator, **project_options)
+        return
+
+    if args.stream:
+        run_stream(args, args.solution or default_solution_file(), ProjectAValidator, **project_options)
+        return
+
+    try:
+        solution_file = args.solution or default_solution_file()
+        print(f"Starting Project A validation with {args.method} distance calculation...")
+        print(f"Reading solution from: {solution_file}\n")
+
+        validator = ProjectAValidator(
+            **distance_options(args),
+            **project_options,
+            solution_file=solution_file,
+        )
+        with ParallelValidator(validator, args.workers) as parallel:
+            result = parallel.validate_solution()
+        print_depots(result["depots"])
+        print_result(result, validator, verbose=args.verbose)
+        run_sweep(args, validator, result)
+        write_profile(args, validator)
+
+    except Exception as e:
+        print(f"\nError during validation: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,636 @@
+"""
+Project B (rural/offshore logistics, La Guajira) solution validator.
+
+Extends SolutionValidator with the Project B rules:
+- Hybrid fleet: drones fly straight lines at their Speed; 4x4 trucks drive
+  the distances of the selected --method at an estimated road speed
+- HARD time windows, checked against the reported ArrivalTimes, which must
+  also be reachable from the previous stop
+- Resupply (Caso 3): routes may return to the depot mid-route; capacity and
+  range reset at every return and Resup/ResupAmounts must balance the loads
+
+Travel-time matrices are precomputed once per vehicle type and speed, and the
+"HH:MM-HH:MM" time windows are parsed once into integer minutes, so each
+route is checked with a few array operations.
+
+Usage (from Proyecto_B_Caso2/ or Proyecto_B_Caso3/):
+  python ../../utils/base_case/project_b_verification.py
+  python ../../utils/base_case/project_b_verification.py --solution verificacion_caso3.csv
+  python ../../utils/base_case/project_b_verification.py --truck-speed 35 --service-time 5
+"""
+
+import argparse
+import math
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from base_case_verification import (
+    SolutionValidator,
+    add_distance_arguments,
+    add_sweep_arguments,
+    check_distance_arguments,
+    distance_options,
+    print_result,
+    run_batch,
+    run_stream,
+    run_sweep,
+    write_profile,
+)
+from cost_model import CostParameters, read_parameters
+from csv_table import read_dataframe_chunks
+from distance_matrix import pairwise_matrix
+from parallel import ParallelValidator
+from route_memo import visit_route_result
+
+# Estimated 4x4 road speed; vehicles.csv only lists drone speeds
+DEFAULT_TRUCK_SPEED = 40.0
+
+# Minutes spent at each client (and reloading at each resupply)
+DEFAULT_SERVICE_TIME = 0.0
+
+DEFAULT_START_TIME = "07:45"
+
+# Reported arrival times are rounded to whole minutes
+TIME_TOLERANCE = 1.0
+
+# Vehicle type names in vehicles.csv and verification files
+VEHICLE_TYPES = {"drone": "drone", "4x4": "truck", "truck": "truck"}
+
+
+def parse_clock(value: str) -> int:
+    """
+    Convert an "HH:MM" time to minutes after midnight.
+
+    Minutes are not range-checked, so "10:60" is 11:00 as in the case data.
+
+    Raises:
+        ValueError: If value is not in HH:MM format
+    """
+    hours, sep, minutes = str(value).strip().partition(":")
+    if not sep or not hours.isdigit() or not minutes.isdigit():
+        raise ValueError(f"Invalid time '{value}' (expected HH:MM)")
+    return int(hours) * 60 + int(minutes)
+
+
+def format_clock(minutes: float) -> str:
+    """Format minutes after midnight as HH:MM."""
+    minutes = int(math.ceil(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_time_windows(windows: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a column of "HH:MM-HH:MM" windows into start and end minutes.
+
+    Returns:
+        Tuple of (start, end) integer arrays
+
+    Raises:
+        ValueError: If any window is malformed or ends before it starts
+    """
+    parts = windows.astype(str).str.extract(r"^\s*(\d+):(\d+)\s*-\s*(\d+):(\d+)\s*$")
+    malformed = parts.isna().any(axis=1).to_numpy()
+    if malformed.any():
+        k = int(np.flatnonzero(malformed)[0])
+        raise ValueError(
+            f"Invalid time window '{windows.iloc[k]}' in row {k + 1}\n"
+            "Time windows must use the HH:MM-HH:MM format."
+        )
+
+    values = parts.astype(int).to_numpy()
+    start = values[:, 0] * 60 + values[:, 1]
+    end = values[:, 2] * 60 + values[:, 3]
+
+    reversed_windows = np.flatnonzero(end < start)
+    if reversed_windows.size:
+        k = int(reversed_windows[0])
+        raise ValueError(f"Time window '{windows.iloc[k]}' in row {k + 1} ends before it starts")
+
+    return start, end
+
+
+class ProjectBValidator(SolutionValidator):
+    """
+    Validator for Project B verification files (Caso 2 and Caso 3).
+
+    Args:
+        parameters_file: parameters_rural.csv (costs per vehicle type,
+            start_time, resupply_allowed)
+        truck_speed: 4x4 speed in km/h for trucks without a Speed value
+        service_time: Minutes spent at each client and at each resupply
+        solution_file: Verification file to validate
+        **kwargs: Distance options passed to SolutionValidator
+    """
+
+    # Parsing relies on pandas string and numeric helpers
+    read_table = staticmethod(pd.read_csv)
+    read_table_chunks = staticmethod(read_dataframe_chunks)
+
+    def __init__(
+        self,
+        parameters_file: str = "parameters_rural.csv",
+        truck_speed: float = DEFAULT_TRUCK_SPEED,
+        service_time: float = DEFAULT_SERVICE_TIME,
+        solution_file: Optional[str] = "verificacion_caso2.csv",
+        **kwargs,
+    ):
+        super().__init__(solution_file=solution_file, **kwargs)
+
+        parameters = {}
+        if os.path.exists(parameters_file):
+            parameters = read_parameters(parameters_file)
+        self.start_time = parse_clock(parameters.get("start_time", DEFAULT_START_TIME))
+        self.resupply_allowed = parameters.get("resupply_allowed", "FALSE").upper() == "TRUE"
+        self.truck_speed = truck_speed
+        self.service_time = service_time
+
+        # Objective coefficients per vehicle type (drone energy, truck diesel)
+        self.vehicle_costs = {}
+        if os.path.exists(parameters_file):
+            self.vehicle_costs = {
+                vehicle_type: CostParameters.from_file(parameters_file, vehicle_type)
+                for vehicle_type in set(VEHICLE_TYPES.values())
+            }
+
+        self.window_start, self.window_end = parse_time_windows(self.clients_df["TimeWindow"])
+
+        # Node arrays: depots first, then clients (see instance_model.NodeTable)
+        self.node_index = self.location_index()
+        self.num_depots = len(self.depot_ids)
+        self.node_demand = self.nodes.demand
+
+        # Vehicle type and speed per vehicle number
+        types = self.vehicles_df["Type"].astype(str).str.strip().str.lower()
+        unknown = sorted(set(types) - set(VEHICLE_TYPES))
+        if unknown:
+            raise ValueError(
+                f"Unknown vehicle type(s) in vehicles.csv: {', '.join(unknown)}\n"
+                "Project B vehicles must be 'drone' or '4x4'."
+            )
+        speeds = pd.to_numeric(self.vehicles_df.get("Speed"), errors="coerce")
+        self.vehicle_profiles: Dict[int, Tuple[str, float]] = {}
+        for vehicle_number, vehicle_type, speed in zip(
+            self.vehicles_df["VehicleID"].astype(int).tolist(),
+            types.map(VEHICLE_TYPES).tolist(),
+            speeds.tolist(),
+        ):
+            if vehicle_type == "drone" and not speed > 0:
+                raise ValueError(f"Drone V{vehicle_number:03d} needs a positive Speed")
+            if not speed > 0:
+                speed = truck_speed
+            self.vehicle_profiles[vehicle_number] = (vehicle_type, float(speed))
+
+        # Drones fly great-circle distances, trucks use the selected method
+        with self.profiler.phase("build_distance_tables"):
+            self.type_distances = {
+                "drone": pairwise_matrix(self.nodes.latitude, self.nodes.longitude, "haversine"),
+                "truck": self.distance_table(),
+            }
+
+            # Travel times in minutes, one matrix per (type, speed)
+            self.travel_times = {
+                profile: self.type_distances[profile[0]] / profile[1] * 60
+                for profile in set(self.vehicle_profiles.values())
+            }
+
+    def parse_solution(self, solution_df: pd.DataFrame) -> Dict[str, list]:
+        """
+        Parse a Project B verification table column-wise.
+
+        Adds vehicle_type, arrival_times (minutes), resupplies and
+        resupply_amounts to the SolutionValidator.parse_solution lists. Caso 2
+        files have no Resup/ResupAmounts columns and parse as zero resupplies.
+        """
+        routes = super().parse_solution(solution_df)
+        num_routes = len(solution_df)
+
+        if "VehicleType" in solution_df.columns:
+            routes["vehicle_type"] = (
+                solution_df["VehicleType"].astype(str).str.strip().str.lower().tolist()
+            )
+        else:
+            routes["vehicle_type"] = [None] * num_routes
+
+        routes["arrival_times"] = [
+            [parse_clock(t) for t in times if t]
+            for times in self._split_column(solution_df["ArrivalTimes"])
+        ]
+
+        if "Resup" in solution_df.columns:
+            routes["resupplies"] = solution_df["Resup"].fillna(0).astype(int).tolist()
+        else:
+            routes["resupplies"] = [0] * num_routes
+
+        if "ResupAmounts" in solution_df.columns:
+            routes["resupply_amounts"] = [
+                [float(a) for a in amounts if a]
+                for amounts in self._split_column(solution_df["ResupAmounts"])
+            ]
+        else:
+            routes["resupply_amounts"] = [[] for _ in range(num_routes)]
+
+        return routes
+
+    def cost_profiles(self) -> Dict[str, CostParameters]:
+        """Objective coefficients by vehicle type (drone, truck)."""
+        return self.vehicle_costs
+
+    def route_cost_profile(self, vehicle_number: int) -> str:
+        """Type of the vehicle (drone or truck)."""
+        return self.vehicle_profiles[vehicle_number][0]
+
+    def bound_table(self) -> np.ndarray:
+        """Shorter of the drone and truck distance of every pair, for the lower bounds."""
+        return np.fmin(self.type_distances["drone"], self.type_distances["truck"])
+
+    def has_costs(self) -> bool:
+        """Whether routes are priced (parameters_rural.csv was loaded)."""
+        return bool(self.vehicle_costs)
+
+    def coverage_errors(self, visits: np.ndarray) -> List[str]:
+        """Errors for clients not visited exactly once across routes."""
+        errors = [
+            f"Client {self.client_ids[k]} was not visited" for k in np.flatnonzero(visits == 0)
+        ]
+        for k in np.flatnonzero(visits > 1):
+            errors.append(f"Client {self.client_ids[k]} was visited {visits[k]} times")
+        return errors
+
+    def validate_routes(
+        self, solution_df: pd.DataFrame, first_row: int = 0, per_route: bool = False
+    ) -> Dict:
+        """
+        Check the routes of a Project B solution (or a chunk of its rows).
+
+        Args:
+            solution_df: Solution rows to check
+            first_row: Position of the first row in the whole solution
+            per_route: Also return "route_results" (see route_memo.py)
+
+        Returns:
+            Dict with route "errors", client "visits" and "route_costs"
+        """
+        errors = []
+        visits = np.zeros(len(self.client_ids), dtype=int)
+        route_costs = []
+        route_results = []
+
+        with self.profiler.phase("parse_solution"):
+            routes = self.parse_solution(solution_df)
+        route_rows = zip(
+            routes["vehicle_id"],
+            routes["vehicle_number"],
+            routes["vehicle_type"],
+            routes["initial_load"],
+            routes["route_sequence"],
+            routes["clients_served"],
+            routes["demands_satisfied"],
+            routes["arrival_times"],
+            routes["resupplies"],
+            routes["resupply_amounts"],
+        )
+        for row, route in enumerate(route_rows, start=first_row):
+            first_error = len(errors)
+            route_visits = np.zeros_like(visits) if per_route else visits
+            with self.profiler.phase("check_route"):
+                costs = self.validate_route(*route, errors=errors, visits=route_visits)
+            if costs is not None:
+                route_costs.append({"vehicle_id": route[0], "row": row, **costs})
+            if per_route:
+                visits += route_visits
+                route_results.append(visit_route_result(errors[first_error:], route_visits))
+
+        result = {"errors": errors, "visits": visits, "route_costs": route_costs}
+        if per_route:
+            result["route_results"] = route_results
+        return result
+
+    def count_known_clients(self, route_sequence: List[str], visits: np.ndarray) -> None:
+        """Count the known client stops of a route that is not checked further."""
+        nodes = np.fromiter(
+            (self.node_index[loc] for loc in route_sequence if loc in self.node_index),
+            dtype=np.intp,
+        )
+        np.add.at(visits, nodes[nodes >= self.num_depots] - self.num_depots, 1)
+
+    def validate_route(
+        self,
+        vehicle_id: str,
+        vehicle_number: int,
+        vehicle_type: Optional[str],
+        initial_load: int,
+        route_sequence: List[str],
+        clients_served: int,
+        demands_satisfied: List[int],
+        arrival_times: List[int],
+        resupplies: int,
+        resupply_amounts: List[float],
+        errors: List[str],
+        visits: np.ndarray,
+    ) -> Optional[Dict]:
+        """
+        Check one route and count its client visits.
+
+        Route positions are classified once (depot or client); trip distances,
+        loads, travel times and time windows are then evaluated as arrays.
+
+        Args:
+            errors: List that route errors are appended to
+            visits: Visit counter per client, updated in place
+
+        Returns:
+            Route costs (CostParameters.route_costs), or None if the route
+            could not be evaluated or no parameters file was loaded
+        """
+        if vehicle_number not in self.vehicle_profiles:
+            errors.append(f"Route {vehicle_id}: unknown vehicle")
+            self.count_known_clients(route_sequence, visits)
+            return
+        spec = self.vehicle_specs[vehicle_number]
+        profile = self.vehicle_profiles[vehicle_number]
+
+        unknown = [loc for loc in route_sequence if loc not in self.node_index]
+        if unknown:
+            for loc in unknown:
+                errors.append(f"Route {vehicle_id} has invalid location: {loc}")
+            self.count_known_clients(route_sequence, visits)
+            return
+
+        if vehicle_type is not None and VEHICLE_TYPES.get(vehicle_type) != profile[0]:
+            errors.append(
+                f"Route {vehicle_id} VehicleType {vehicle_type.capitalize()} does not "
+                f"match vehicles.csv ({profile[0].capitalize()})"
+            )
+
+        nodes = np.fromiter(
+            (self.node_index[loc] for loc in route_sequence), dtype=np.intp
+        )
+        is_depot = nodes < self.num_depots
+        depot_positions = np.flatnonzero(is_depot)
+        client_positions = np.flatnonzero(~is_depot)
+
+        # Check 1: Route starts and ends at the same depot
+        if not (is_depot[0] and is_depot[-1] and nodes[0] == nodes[-1]):
+            errors.append(
+                f"Route {vehicle_id} does not start and end at depot {route_sequence[0]}"
+            )
+            self.count_known_clients(route_sequence, visits)
+            return
+
+        # Check 2: Resupply stops
+        resupply_positions = depot_positions[1:-1]
+        if resupply_positions.size and not self.resupply_allowed:
+            errors.append(
+                f"Route {vehicle_id} returns to the depot mid-route, "
+                "but resupply is not allowed in this case"
+            )
+        other_depot = resupply_positions[nodes[resupply_positions] != nodes[0]]
+        if other_depot.size:
+            errors.append(
+                f"Route {vehicle_id} resupplies at {route_sequence[other_depot[0]]}, "
+                f"not at its depot {route_sequence[0]}"
+            )
+        if resupplies != resupply_positions.size:
+            errors.append(
+                f"Route {vehicle_id} Resup mismatch: {resupplies} != {resupply_positions.size}"
+            )
+
+        # Trips run between consecutive depot visits
+        trip_start = depot_positions[:-1]
+        trip_end = depot_positions[1:]
+        num_trips = trip_start.size
+
+        # Check 3: Range per trip (range resets at every depot visit)
+        legs = (nodes[:-1], nodes[1:])
+        leg_distances = self.type_distances[profile[0]][legs]
+        cumulative_distance = np.concatenate(([0.0], np.cumsum(leg_distances)))
+        trip_distances = cumulative_distance[trip_end] - cumulative_distance[trip_start]
+        for trip in np.flatnonzero(trip_distances > spec["range"]):
+            trip_label = f" on trip {trip + 1}" if num_trips > 1 else ""
+            errors.append(
+                f"Route {vehicle_id} exceeds range{trip_label}: "
+                f"{trip_distances[trip]:.1f} > {spec['range']}"
+            )
+
+        # Route cost: travel plus service time at every intermediate stop
+        leg_times = self.travel_times[profile][legs]
+        route_costs = None
+        if self.vehicle_costs:
+            route_costs = self.vehicle_costs[profile[0]].route_costs(
+                cumulative_distance[-1],
+                time_min=leg_times.sum() + self.service_time * (nodes.size - 2),
+            )
+
+        # Check 4: Capacity and load balance across resupplies
+        cumulative_demand = np.concatenate(([0], np.cumsum(self.node_demand[nodes])))
+        trip_demands = cumulative_demand[trip_end] - cumulative_demand[trip_start]
+        if initial_load > spec["capacity"]:
+            errors.append(
+                f"Route {vehicle_id} exceeds capacity: {initial_load} > {spec['capacity']}"
+            )
+        if len(resupply_amounts) != resupply_positions.size:
+            errors.append(
+                f"Route {vehicle_id} has {len(resupply_amounts)} ResupAmounts "
+                f"for {resupply_positions.size} resupplies"
+            )
+            for trip in np.flatnonzero(trip_demands > spec["capacity"]):
+                errors.append(
+                    f"Route {vehicle_id} trip {trip + 1} delivers more than capacity: "
+                    f"{trip_demands[trip]} > {spec['capacity']}"
+                )
+        else:
+            # Load when leaving the depot on each trip, and after each trip
+            reloaded = np.concatenate(([0.0], np.cumsum(resupply_amounts)))
+            delivered = np.concatenate(([0], np.cumsum(trip_demands)))
+            departure_loads = initial_load + reloaded - delivered[:-1]
+            remaining_loads = departure_loads - trip_demands
+            for trip in np.flatnonzero(departure_loads[1:] > spec["capacity"]):
+                errors.append(
+                    f"Route {vehicle_id} exceeds capacity after resupply {trip + 1}: "
+                    f"{departure_loads[trip + 1]:g} > {spec['capacity']}"
+                )
+            for trip in np.flatnonzero(remaining_loads < 0):
+                errors.append(
+                    f"Route {vehicle_id} runs out of load on trip {trip + 1}: "
+                    f"carries {departure_loads[trip]:g}, delivers {trip_demands[trip]}"
+                )
+
+        # Check 5: Client visits and demand satisfaction
+        clients = nodes[client_positions] - self.num_depots
+        route_clients = [route_sequence[p] for p in client_positions]
+        np.add.at(visits, clients, 1)
+
+        if np.unique(clients).size != clients.size:
+            errors.append(f"Route {vehicle_id} has duplicate client visits")
+        if clients.size != clients_served:
+            errors.append(
+                f"Route {vehicle_id} clients_served mismatch: {clients.size} != {clients_served}"
+            )
+
+        reported = np.asarray(demands_satisfied[: clients.size], dtype=float)
+        expected = self.client_demand_array[clients[: reported.size]]
+        for k in np.flatnonzero(reported != expected):
+            errors.append(
+                f"Route {vehicle_id} has incorrect demand for {route_clients[k]}: "
+                f"{reported[k]:g} != {expected[k]}"
+            )
+        for loc in route_clients[reported.size :]:
+            errors.append(f"Route {vehicle_id} has missing demand value for client {loc}")
+
+        # Check 6: Time windows (hard) and reachable arrival times
+        if len(arrival_times) != clients.size:
+            errors.append(
+                f"Route {vehicle_id} has {len(arrival_times)} arrival times "
+                f"for {clients.size} clients"
+            )
+            return route_costs
+        if not clients.size:
+            return route_costs
+
+        arrivals = np.asarray(arrival_times, dtype=float)
+        window_start = self.window_start[clients]
+        window_end = self.window_end[clients]
+        for k in np.flatnonzero((arrivals < window_start) | (arrivals > window_end)):
+            errors.append(
+                f"Route {vehicle_id} arrives at {route_clients[k]} at "
+                f"{format_clock(arrivals[k])}, outside its time window "
+                f"{format_clock(window_start[k])}-{format_clock(window_end[k])}"
+            )
+
+        # Earliest arrival at each client given the previous reported arrival,
+        # the travel time in between and service/reload time at passed stops
+        cumulative_time = np.concatenate(([0.0], np.cumsum(leg_times)))
+        cumulative_depots = np.concatenate(([0], np.cumsum(is_depot)))
+        previous_positions = np.concatenate(([0], client_positions[:-1]))
+        travel = cumulative_time[client_positions] - cumulative_time[previous_positions]
+        reloads = (
+            cumulative_depots[client_positions] - cumulative_depots[previous_positions + 1]
+        )
+        previous_times = np.concatenate(([self.start_time], arrivals[:-1]))
+        service = np.full(clients.size, self.service_time)
+        service[0] = 0.0
+        earliest = previous_times + service + travel + reloads * self.service_time
+
+        for k in np.flatnonzero(arrivals < earliest - TIME_TOLERANCE):
+            errors.append(
+                f"Route {vehicle_id} cannot reach {route_clients[k]} by "
+                f"{format_clock(arrivals[k])}: earliest arrival is {format_clock(earliest[k])}"
+            )
+
+        return route_costs
+
+
+def default_solution_file() -> str:
+    """Return the Caso 3 verification file if present, else the Caso 2 one."""
+    for solution_file in ("verificacion_caso3.csv", "verificacion_caso2.csv"):
+        if os.path.exists(solution_file):
+            return solution_file
+    return "verificacion_caso2.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Project B (La Guajira) Solution Validator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Checks capacity and range per trip, hybrid fleet types, HARD time windows,
+reachable arrival times and (Caso 3) resupply load balances.
+
+Drones use straight-line (haversine) distances at their Speed; 4x4 trucks use
+--method distances at --truck-speed.
+
+Examples:
+  python project_b_verification.py
+  python project_b_verification.py --solution verificacion_caso3.csv --service-time 5
+  python project_b_verification.py --solutions "runs/*.csv" --output results.jsonl
+        """,
+    )
+    parser.add_argument(
+        "--solution",
+        type=str,
+        default=None,
+        help="Path to solution file (default: verificacion_caso3.csv or verificacion_caso2.csv)",
+    )
+    parser.add_argument(
+        "--solutions",
+        type=str,
+        default=None,
+        help="Batch mode: directory or glob of solution files validated in one process",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Batch mode result table (.jsonl or .csv). Default: print one line per file",
+    )
+    parser.add_argument(
+        "--parameters",
+        type=str,
+        default="parameters_rural.csv",
+        help="Parameters file with start_time and resupply_allowed",
+    )
+    parser.add_argument(
+        "--truck-speed",
+        type=float,
+        default=DEFAULT_TRUCK_SPEED,
+        help=f"Estimated 4x4 speed in km/h (default: {DEFAULT_TRUCK_SPEED:g})",
+    )
+    parser.add_argument(
+        "--service-time",
+        type=float,
+        default=DEFAULT_SERVICE_TIME,
+        help="Minutes spent at each client and at each resupply (default: 0)",
+    )
+    add_distance_arguments(parser)
+    add_sweep_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="Show detailed output")
+
+    args = parser.parse_args()
+    check_distance_arguments(parser, args)
+
+    if args.output and not args.solutions:
+        parser.error("--output requires --solutions")
+
+    project_options = {
+        "parameters_file": args.parameters,
+        "truck_speed": args.truck_speed,
+        "service_time": args.service_time,
+    }
+
+    if args.solutions:
+        run_batch(args, ProjectBValidator, **project_options)
+        return
+
+    if args.stream:
+        run_stream(args, args.solution or default_solution_file(), ProjectBValidator, **project_options)
+        return
+
+    try:
+        solution_file = args.solution or default_solution_file()
+        print(
+            f"Starting Project B validation with {args.method} distance calculation..."
+        )
+        print(f"Reading solution from: {solution_file}\n")
+
+        validator = ProjectBValidator(
+            **distance_options(args),
+            **project_options,
+            solution_file=solution_file,
+        )
+        with ParallelValidator(validator, args.workers) as parallel:
+            result = parallel.validate_solution()
+        print_result(result, validator, verbose=args.verbose)
+        run_sweep(args, validator, result)
+        write_profile(args, validator)
+
+    except Exception as e:
+        print(f"\nError during validation: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,755 @@
+"""
+Project C (national logistics, Colombia) solution validator and cost evaluator.
+
+Extends SolutionValidator with the Project C rules:
+- Routes pass municipalities (C###), refueling stations (E###) and, in
+  Caso 3, toll plazas (P###)
+- Fuel is tracked leg by leg; consumption uses the load-dependent
+  efficiency bands (empty / medium / full) of parameters_national.csv
+- Vehicle weight is tracked stop by stop: tolls cost
+  BaseRate + tons × RatePerTon and municipalities enforce MaxWeight
+- The objective is reported per route: fixed, distance, time, fuel, tolls
+
+Stations, tolls and instance locations are indexed once into arrays, so
+evaluate_route scores a candidate routing with a few array operations and
+can be called in a heuristic's inner loop.
+
+clients.csv lists municipalities without coordinates, so distances come from
+a matrix covering CD01, the C### clients and the E### stations. Toll plazas
+sit on the road between their neighbouring stops and add no distance.
+
+Usage (from Proyecto_C_Caso2/ or Proyecto_C_Caso3/):
+  python ../../utils/base_case/project_c_verification.py --method matrix --matrix distances.json
+  python ../../utils/base_case/project_c_verification.py --method matrix --matrix distances.npz \\
+      --solution verificacion_caso3.csv --verbose
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from base_case_verification import (
+    SolutionValidator,
+    add_distance_arguments,
+    add_sweep_arguments,
+    check_distance_arguments,
+    distance_options,
+    print_result,
+    run_batch,
+    run_stream,
+    run_sweep,
+    write_profile,
+)
+from cost_model import CostParameters, read_parameters
+from csv_table import read_dataframe_chunks
+from instance_model import CLIENT, DEPOT, STATION, TOLL
+from parallel import ParallelValidator
+from route_memo import visit_route_result
+
+# Average tractomula speed used for time costs (km/h); not part of the data
+DEFAULT_SPEED = 60.0
+
+# Load ratio of each efficiency band (cargo / capacity)
+EFFICIENCY_BANDS = ("empty", "medium", "full")
+
+# Absolute tolerances for reported values (fuel in gallons, weights in kg, COP)
+FUEL_TOLERANCE = 1e-6
+WEIGHT_TOLERANCE = 0.5
+COST_TOLERANCE = 1.0
+
+
+def _optional_column(df: pd.DataFrame, column: str, default=np.nan) -> list:
+    """Column values as a list, or default for every row if it is absent."""
+    if column not in df.columns:
+        return [default] * len(df)
+    return df[column].tolist()
+
+
+def _split_numbers(series: pd.Series) -> List[List[float]]:
+    """Parse a hyphen-separated numeric column into lists of floats."""
+    return [
+        [float(value) for value in values if value]
+        for values in series.fillna("").astype(str).str.split("-")
+    ]
+
+
+class ProjectCValidator(SolutionValidator):
+    """
+    Validator and cost evaluator for Project C verification files.
+
+    Args:
+        parameters_file: parameters_national.csv (costs, efficiency bands)
+        stations_file: Refueling stations with FuelCost (COP/gallon)
+        tolls_file: Toll plazas with BaseRate and RatePerTon (Caso 3; optional)
+        empty_weight: Empty vehicle weight in kg added to the cargo weight
+        speed: Average speed in km/h used for the time cost
+        solution_file: Verification file to validate
+        **kwargs: Distance options passed to SolutionValidator
+    """
+
+    # Parsing relies on pandas string and numeric helpers
+    read_table = staticmethod(pd.read_csv)
+    read_table_chunks = staticmethod(read_dataframe_chunks)
+
+    # Fuel is priced from the RefuelAmounts bought at each station
+    fuel_from_records = True
+
+    def __init__(
+        self,
+        parameters_file: str = "parameters_national.csv",
+        stations_file: str = "stations.csv",
+        tolls_file: str = "tolls.csv",
+        empty_weight: float = 0.0,
+        speed: float = DEFAULT_SPEED,
+        solution_file: Optional[str] = "verificacion_caso2.csv",
+        **kwargs,
+    ):
+        super().__init__(solution_file=solution_file, **kwargs)
+
+        self.cost_parameters = CostParameters.from_file(parameters_file, speed=speed)
+        self.band_efficiency = self._efficiency_bands(read_parameters(parameters_file))
+        self.empty_weight = empty_weight
+
+        # Stations become distance nodes after depots and clients
+        self.stations_df = pd.read_csv(stations_file)
+        self.station_ids = self._standard_ids(
+            self.stations_df,
+            self.stations_df["EstationID"].astype(int).to_numpy(),
+            "E{:03d}",
+        )
+        self.station_nodes = self.nodes.add(
+            STATION,
+            self.station_ids,
+            self.stations_df["Latitude"].to_numpy(dtype=float),
+            self.stations_df["Longitude"].to_numpy(dtype=float),
+        )
+
+        if os.path.exists(tolls_file):
+            self.tolls_df = pd.read_csv(tolls_file)
+            self.toll_ids = self._standard_ids(
+                self.tolls_df, self.tolls_df["TollID"].astype(int).to_numpy(), "P{:03d}"
+            )
+        else:
+            self.tolls_df = None
+            self.toll_ids = []
+
+        self._build_stop_index()
+
+        if self.distance_engine is not None:
+            self.distance_engine = self.build_distance_engine(self.distance_method)
+        elif self.distance_method != "matrix" and np.isnan(self.nodes.latitude).any():
+            raise ValueError(
+                f"{self.distance_method} distances need coordinates for every location.\n"
+                "Use --method matrix with a distance matrix for instances without coordinates."
+            )
+        with self.profiler.phase("build_distance_tables"):
+            # Sparse matrices stay sparse: legs are looked up on demand
+            self.table = self.distance_table(lazy=True)
+
+    @staticmethod
+    def _efficiency_bands(parameters: Dict[str, str]) -> np.ndarray:
+        """
+        Typical efficiency (km/gallon) per band: the midpoint of min and max.
+
+        Raises:
+            ValueError: If a band is missing from the parameters file
+        """
+        efficiencies = []
+        for band in EFFICIENCY_BANDS:
+            try:
+                low = float(parameters[f"fuel_efficiency_{band}_min"])
+                high = float(parameters[f"fuel_efficiency_{band}_max"])
+            except KeyError:
+                raise ValueError(
+                    f"Parameters file must define fuel_efficiency_{band}_min and "
+                    f"fuel_efficiency_{band}_max"
+                )
+            efficiencies.append((low + high) / 2)
+        return np.array(efficiencies)
+
+    def _build_stop_index(self) -> None:
+        """
+        Index every stop type by StandardizedID into aligned arrays.
+
+        Stops are depots, clients and stations (which are also distance
+        nodes, in node_ids order) followed by tolls. Attribute arrays hold
+        the neutral value where an attribute does not apply (0 demand, no
+        weight limit, no fuel price, no toll rates).
+        """
+        num_depots = len(self.depot_ids)
+        num_clients = len(self.client_ids)
+        num_tolls = len(self.toll_ids)
+        num_nodes = len(self.node_ids)
+
+        self.stop_ids = self.node_ids + self.toll_ids
+        self.stop_index = {stop_id: k for k, stop_id in enumerate(self.stop_ids)}
+        for alias, k in self.location_index().items():
+            self.stop_index.setdefault(alias, k)
+
+        self.stop_kind = np.concatenate([self.nodes.kind, np.full(num_tolls, TOLL, dtype=np.int8)])
+        self.stop_node = np.concatenate(
+            [np.arange(num_nodes), np.full(num_tolls, -1)]
+        ).astype(np.intp)
+
+        self.client_demands_float = self.clients_df["Demand"].to_numpy(dtype=float)
+        self.stop_demand = np.zeros(len(self.stop_ids))
+        self.stop_demand[num_depots : num_depots + num_clients] = self.client_demands_float
+
+        self.stop_max_weight = np.full(len(self.stop_ids), np.inf)
+        if "MaxWeight" in self.clients_df.columns:
+            max_weight = pd.to_numeric(self.clients_df["MaxWeight"], errors="coerce")
+            self.stop_max_weight[num_depots : num_depots + num_clients] = np.where(
+                max_weight.isna(), np.inf, max_weight
+            )
+
+        self.stop_fuel_price = np.full(len(self.stop_ids), np.nan)
+        self.stop_fuel_price[num_depots + num_clients : num_nodes] = self.stations_df[
+            "FuelCost"
+        ].to_numpy(dtype=float)
+
+        # Missing toll rates mean that component is not charged
+        self.stop_toll_base = np.zeros(len(self.stop_ids))
+        self.stop_toll_rate = np.zeros(len(self.stop_ids))
+        if num_tolls:
+            base = pd.to_numeric(self.tolls_df["BaseRate"], errors="coerce").fillna(0)
+            rate = pd.to_numeric(self.tolls_df["RatePerTon"], errors="coerce").fillna(0)
+            self.stop_toll_base[num_nodes:] = base.to_numpy()
+            self.stop_toll_rate[num_nodes:] = rate.to_numpy()
+
+    def encode_route(self, route_sequence: Sequence[str]) -> np.ndarray:
+        """
+        Translate stop IDs into a stop index array for evaluate_route.
+
+        Raises:
+            KeyError: If a stop is not a known depot, client, station or toll
+        """
+        stop_index = self.stop_index
+        normalize = self.normalize_location_id
+        return np.fromiter(
+            (
+                stop_index[loc] if loc in stop_index else stop_index[normalize(loc)]
+                for loc in route_sequence
+            ),
+            dtype=np.intp,
+            count=len(route_sequence),
+        )
+
+    def default_fuel_capacity(self, vehicle_number: int) -> float:
+        """Tank size in gallons: the vehicle's Range at full-load efficiency."""
+        return self.vehicle_specs[vehicle_number]["range"] / self.band_efficiency[-1]
+
+    def evaluate_route(
+        self,
+        vehicle_number: int,
+        stops: np.ndarray,
+        refuel_amounts: Sequence[float] = (),
+        initial_load: Optional[float] = None,
+        initial_fuel: Optional[float] = None,
+        fuel_capacity: Optional[float] = None,
+    ) -> Dict:
+        """
+        Simulate one route and compute its costs.
+
+        Args:
+            vehicle_number: Numeric vehicle ID (1 for V001)
+            stops: Stop index array from encode_route, depot to depot
+            refuel_amounts: Gallons bought at each station stop, in route order
+            initial_load: Cargo at departure (default: the route's total demand)
+            initial_fuel: Gallons at departure (default: a full tank)
+            fuel_capacity: Tank size in gallons (default: default_fuel_capacity)
+
+        Returns:
+            Dict with weights at each client and toll stop, toll_costs per
+            toll, fuel_arrival per non-toll stop, costs
+            (CostParameters.route_costs: distance_km, time_min, components
+            and total) and violations (messages for capacity, fuel and weight
+            limits; empty when feasible)
+
+        Raises:
+            ValueError: If refuel_amounts does not match the station stops, or
+                a leg has no distance (a pair a sparse matrix omits between
+                locations without coordinates)
+        """
+        spec = self.vehicle_specs[vehicle_number]
+        kind = self.stop_kind[stops]
+        on_path = kind != TOLL
+        path = stops[on_path]
+        nodes = self.stop_node[path]
+
+        station_positions = np.flatnonzero(kind[on_path] == STATION)
+        refuel_amounts = np.asarray(refuel_amounts, dtype=float)
+        if refuel_amounts.size != station_positions.size:
+            raise ValueError(
+                f"Got {refuel_amounts.size} refuel amounts for "
+                f"{station_positions.size} station stops"
+            )
+
+        # Cargo and weight stop by stop (tolls deliver nothing)
+        delivered = self.stop_demand[stops]
+        if initial_load is None:
+            initial_load = float(delivered.sum())
+        cargo_after = initial_load - np.cumsum(delivered)
+        weight_before = self.empty_weight + cargo_after + delivered
+
+        # Distance and fuel leg by leg along the non-toll stops
+        legs = self.table[nodes[:-1], nodes[1:]]
+        if np.isnan(legs).any():
+            k = int(np.flatnonzero(np.isnan(legs))[0])
+            raise ValueError(
+                f"has no distance for {self.node_ids[nodes[k]]} → {self.node_ids[nodes[k + 1]]} "
+                "(not in the sparse matrix and no coordinates for the haversine fallback)"
+            )
+        distance = float(legs.sum())
+        leg_cargo = cargo_after[on_path][:-1]
+        bands = np.rint(np.clip(leg_cargo / spec["capacity"], 0.0, 1.0) * 2).astype(np.intp)
+        consumption = legs / self.band_efficiency[bands]
+
+        if fuel_capacity is None:
+            fuel_capacity = self.default_fuel_capacity(vehicle_number)
+        if initial_fuel is None:
+            initial_fuel = fuel_capacity
+        refuels = np.zeros(path.size)
+        refuels[station_positions] = refuel_amounts
+        fuel_arrival = (
+            initial_fuel
+            + np.concatenate(([0.0], np.cumsum(refuels)[:-1]))
+            - np.concatenate(([0.0], np.cumsum(consumption)))
+        )
+
+        tolls = kind == TOLL
+        toll_stops = stops[tolls]
+        toll_costs = (
+            self.stop_toll_base[toll_stops]
+            + weight_before[tolls] / 1000 * self.stop_toll_rate[toll_stops]
+        )
+        costs = self.cost_parameters.route_costs(
+            distance,
+            fuel=refuel_amounts @ self.stop_fuel_price[path[station_positions]],
+            tolls=toll_costs.sum(),
+        )
+
+        violations = []
+        if initial_load > spec["capacity"]:
+            violations.append(f"exceeds capacity: {initial_load:g} > {spec['capacity']}")
+        if cargo_after.size and cargo_after[-1] < -WEIGHT_TOLERANCE:
+            violations.append(
+                f"delivers {float(delivered.sum()):g} but departs with {initial_load:g}"
+            )
+        if initial_fuel > fuel_capacity + FUEL_TOLERANCE:
+            violations.append(
+                f"starts with {initial_fuel:g} gallons, more than its {fuel_capacity:g} gallon tank"
+            )
+        for k in np.flatnonzero(fuel_arrival < -FUEL_TOLERANCE):
+            violations.append(
+                f"runs out of fuel before {self.stop_ids[path[k]]} "
+                f"({fuel_arrival[k]:.1f} gallons)"
+            )
+        for k in np.flatnonzero(fuel_arrival + refuels > fuel_capacity + FUEL_TOLERANCE):
+            violations.append(
+                f"refuels beyond tank capacity at {self.stop_ids[path[k]]}: "
+                f"{fuel_arrival[k] + refuels[k]:.1f} > {fuel_capacity:g} gallons"
+            )
+        overweight = (kind == CLIENT) & (
+            weight_before > self.stop_max_weight[stops] + WEIGHT_TOLERANCE
+        )
+        for k in np.flatnonzero(overweight):
+            violations.append(
+                f"enters {self.stop_ids[stops[k]]} at {weight_before[k]:g} kg, "
+                f"above its MaxWeight of {self.stop_max_weight[stops[k]]:g} kg"
+            )
+
+        return {
+            "client_weights": weight_before[kind == CLIENT],
+            "toll_weights": weight_before[tolls],
+            "toll_costs": toll_costs,
+            "fuel_arrival": fuel_arrival,
+            "costs": costs,
+            "violations": violations,
+        }
+
+    def parse_solution(self, solution_df: pd.DataFrame) -> Dict[str, list]:
+        """
+        Parse a Project C verification table (Caso 2 or Caso 3) column-wise.
+
+        Handles the RouteSequence/RouteSeq and DemandSatisfied/Demand column
+        name variations; Caso 3 toll and weight columns are None when absent.
+
+        Returns:
+            Dict of aligned per-route lists
+        """
+        route_col = self._resolve_column(solution_df, "RouteSequence", "RouteSeq")
+        demands_col = self._resolve_column(solution_df, "DemandSatisfied", "Demand")
+        vehicle_ids = solution_df["VehicleId"].astype(str)
+        num_routes = len(solution_df)
+
+        def optional_lists(column):
+            if column not in solution_df.columns:
+                return [None] * num_routes
+            return _split_numbers(solution_df[column])
+
+        return {
+            "vehicle_id": vehicle_ids.tolist(),
+            "vehicle_number": vehicle_ids.str.replace("V", "").astype(int).tolist(),
+            "route_sequence": self._split_column(solution_df[route_col]),
+            "municipalities": _optional_column(solution_df, "Municipalities", None),
+            "demands": _split_numbers(solution_df[demands_col]),
+            "initial_load": solution_df["InitLoad"].astype(float).tolist(),
+            "load_capacity": _optional_column(solution_df, "LoadCap"),
+            "fuel_capacity": _optional_column(solution_df, "FuelCap"),
+            "initial_fuel": _optional_column(solution_df, "InitFuel"),
+            "refuel_stops": _optional_column(solution_df, "RefuelStops", None),
+            "refuel_amounts": optional_lists("RefuelAmounts"),
+            "tolls_visited": _optional_column(solution_df, "TollsVisited", None),
+            "toll_costs": optional_lists("TollCosts"),
+            "vehicle_weights": optional_lists("VehicleWeights"),
+        }
+
+    def coverage_errors(self, visits: np.ndarray) -> List[str]:
+        """Errors for municipalities not visited exactly once across routes."""
+        errors = [
+            f"Client {self.client_ids[k]} was not visited" for k in np.flatnonzero(visits == 0)
+        ]
+        for k in np.flatnonzero(visits > 1):
+            errors.append(f"Client {self.client_ids[k]} was visited {visits[k]} times")
+        return errors
+
+    def validate_routes(
+        self, solution_df: pd.DataFrame, first_row: int = 0, per_route: bool = False
+    ) -> Dict:
+        """
+        Check and price the routes of a Project C solution (or a chunk of its rows).
+
+        Args:
+            solution_df: Solution rows to check
+            first_row: Position of the first row in the whole solution
+            per_route: Also return "route_results" (see route_memo.py)
+
+        Returns:
+            Dict with route "errors", client "visits", "route_costs" and
+            "fallback_legs" (see SolutionValidator.validate_routes)
+        """
+        errors = []
+        visits = np.zeros(len(self.client_ids), dtype=int)
+        route_costs = []
+        route_results = []
+        fallback_start = self.fallback_legs()
+
+        with self.profiler.phase("parse_solution"):
+            routes = self.parse_solution(solution_df)
+        for row, values in enumerate(zip(*routes.values()), start=first_row):
+            route = dict(zip(routes.keys(), values))
+            first_error = len(errors)
+            route_visits = np.zeros_like(visits) if per_route else visits
+            with self.profiler.phase("check_route"):
+                costs = self.validate_route(route, errors, route_visits)
+            if costs is not None:
+                route_costs.append({"vehicle_id": route["vehicle_id"], "row": row, **costs})
+            if per_route:
+                visits += route_visits
+                route_results.append(visit_route_result(errors[first_error:], route_visits))
+
+        result = {
+            "errors": errors,
+            "visits": visits,
+            "route_costs": route_costs,
+            "fallback_legs": self.fallback_legs() - fallback_start,
+        }
+        if per_route:
+            result["route_results"] = route_results
+        return result
+
+    def count_known_clients(self, route_sequence: Sequence[str], visits: np.ndarray) -> None:
+        """Count the known client stops of a route that is not checked further."""
+        stop_index = self.stop_index
+        normalize = self.normalize_location_id
+        stops = np.fromiter(
+            (
+                stop_index[loc] if loc in stop_index else stop_index[normalize(loc)]
+                for loc in route_sequence
+                if loc in stop_index or normalize(loc) in stop_index
+            ),
+            dtype=np.intp,
+        )
+        clients = stops[self.stop_kind[stops] == CLIENT]
+        np.add.at(visits, self.stop_node[clients] - len(self.depot_ids), 1)
+
+    def validate_route(self, route: Dict, errors: List[str], visits: np.ndarray) -> Optional[Dict]:
+        """
+        Check one parsed route and count its client visits.
+
+        Args:
+            route: One row of parse_solution (keys as in its lists)
+            errors: List that route errors are appended to
+            visits: Visit counter per client, updated in place
+
+        Returns:
+            Cost breakdown of the route, or None if it could not be evaluated
+        """
+        vehicle_id = route["vehicle_id"]
+        vehicle_number = route["vehicle_number"]
+        route_sequence = route["route_sequence"]
+
+        if vehicle_number not in self.vehicle_specs:
+            errors.append(f"Route {vehicle_id}: unknown vehicle")
+            self.count_known_clients(route_sequence, visits)
+            return None
+        spec = self.vehicle_specs[vehicle_number]
+
+        unknown = [
+            loc
+            for loc in route_sequence
+            if loc not in self.stop_index and self.normalize_location_id(loc) not in self.stop_index
+        ]
+        if unknown:
+            for loc in unknown:
+                errors.append(f"Route {vehicle_id} has invalid location: {loc}")
+            self.count_known_clients(route_sequence, visits)
+            return None
+
+        stops = self.encode_route(route_sequence)
+        kind = self.stop_kind[stops]
+
+        # Check 1: Route starts and ends at the port
+        if kind[0] != DEPOT or stops[-1] != stops[0] or (kind[1:-1] == DEPOT).any():
+            errors.append(f"Route {vehicle_id} does not start and end at depot {route_sequence[0]}")
+            self.count_known_clients(route_sequence, visits)
+            return None
+
+        # Check 2: Reported capacities match the fleet
+        load_capacity = route["load_capacity"]
+        if not pd.isna(load_capacity) and load_capacity != spec["capacity"]:
+            errors.append(
+                f"Route {vehicle_id} LoadCap {load_capacity:g} does not match "
+                f"vehicles.csv capacity {spec['capacity']}"
+            )
+
+        # Check 3: Municipalities and demand satisfaction
+        client_positions = np.flatnonzero(kind == CLIENT)
+        clients = self.stop_node[stops[client_positions]] - len(self.depot_ids)
+        np.add.at(visits, clients, 1)
+        if np.unique(clients).size != clients.size:
+            errors.append(f"Route {vehicle_id} has duplicate client visits")
+        municipalities = route["municipalities"]
+        if municipalities is not None and municipalities != clients.size:
+            errors.append(
+                f"Route {vehicle_id} municipalities mismatch: {clients.size} != {municipalities}"
+            )
+
+        demands = np.asarray(route["demands"], dtype=float)
+        expected = self.stop_demand[stops[1:-1]]
+        if demands.size != expected.size:
+            errors.append(
+                f"Route {vehicle_id} has {demands.size} demand values for "
+                f"{expected.size} stops (use 0 for stations and tolls)"
+            )
+        else:
+            for k in np.flatnonzero(np.abs(demands - expected) > WEIGHT_TOLERANCE):
+                errors.append(
+                    f"Route {vehicle_id} has incorrect demand for {route_sequence[k + 1]}: "
+                    f"{demands[k]:g} != {expected[k]:g}"
+                )
+
+        # Check 4: Refueling records
+        refuel_amounts = route["refuel_amounts"] or []
+        num_stations = int((kind == STATION).sum())
+        if route["refuel_stops"] is not None and route["refuel_stops"] != num_stations:
+            errors.append(
+                f"Route {vehicle_id} RefuelStops mismatch: {route['refuel_stops']} != {num_stations}"
+            )
+        if len(refuel_amounts) != num_stations:
+            errors.append(
+                f"Route {vehicle_id} has {len(refuel_amounts)} RefuelAmounts "
+                f"for {num_stations} station stops"
+            )
+            refuel_amounts = (list(refuel_amounts) + [0.0] * num_stations)[:num_stations]
+
+        # Check 5: Simulate cargo, fuel and weight along the route
+        fuel_capacity = route["fuel_capacity"]
+        if pd.isna(fuel_capacity):
+            fuel_capacity = None
+        initial_fuel = route["initial_fuel"]
+        if pd.isna(initial_fuel):
+            initial_fuel = None
+        try:
+            evaluation = self.evaluate_route(
+                vehicle_number,
+                stops,
+                refuel_amounts,
+                initial_load=route["initial_load"],
+                initial_fuel=initial_fuel,
+                fuel_capacity=fuel_capacity,
+            )
+        except ValueError as e:
+            errors.append(f"Route {vehicle_id} {e}")
+            return None
+        for violation in evaluation["violations"]:
+            errors.append(f"Route {vehicle_id} {violation}")
+
+        # Check 6: Reported toll and weight records (Caso 3)
+        num_tolls = int((kind == TOLL).sum())
+        if route["tolls_visited"] is not None and route["tolls_visited"] != num_tolls:
+            errors.append(
+                f"Route {vehicle_id} TollsVisited mismatch: {route['tolls_visited']} != {num_tolls}"
+            )
+        self._compare_reported(
+            vehicle_id,
+            "TollCosts",
+            route["toll_costs"],
+            evaluation["toll_costs"],
+            [route_sequence[p] for p in np.flatnonzero(kind == TOLL)],
+            COST_TOLERANCE,
+            errors,
+        )
+        self._compare_reported(
+            vehicle_id,
+            "VehicleWeights",
+            route["vehicle_weights"],
+            evaluation["client_weights"],
+            [route_sequence[p] for p in client_positions],
+            WEIGHT_TOLERANCE,
+            errors,
+        )
+
+        return evaluation["costs"]
+
+    @staticmethod
+    def _compare_reported(
+        vehicle_id: str,
+        column: str,
+        reported: Optional[List[float]],
+        computed: np.ndarray,
+        stop_ids: List[str],
+        tolerance: float,
+        errors: List[str],
+    ) -> None:
+        """Compare a reported per-stop column with the simulated values."""
+        if reported is None:
+            return
+        if len(reported) != computed.size:
+            errors.append(
+                f"Route {vehicle_id} has {len(reported)} {column} values "
+                f"for {computed.size} stops"
+            )
+            return
+        reported = np.asarray(reported, dtype=float)
+        for k in np.flatnonzero(np.abs(reported - computed) > tolerance):
+            errors.append(
+                f"Route {vehicle_id} {column} at {stop_ids[k]}: "
+                f"{reported[k]:g} != {computed[k]:.2f}"
+            )
+
+
+def default_solution_file() -> str:
+    """Return the Caso 3 verification file if present, else the Caso 2 one."""
+    for solution_file in ("verificacion_caso3.csv", "verificacion_caso2.csv"):
+        if os.path.exists(solution_file):
+            return solution_file
+    return "verificacion_caso2.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Project C (Colombia) Solution Validator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Checks coverage, demands, capacity, fuel levels (load-dependent efficiency),
+refueling records and (Caso 3) toll costs and municipal weight limits, and
+prints the objective breakdown per route.
+
+clients.csv has no coordinates: use --method matrix with a matrix covering
+CD01, all C### clients and all E### stations.
+
+Examples:
+  python project_c_verification.py --method matrix --matrix distances.json
+  python project_c_verification.py --method matrix --matrix distances.npz --empty-weight 8000
+        """,
+    )
+    parser.add_argument(
+        "--solution",
+        type=str,
+        default=None,
+        help="Path to solution file (default: verificacion_caso3.csv or verificacion_caso2.csv)",
+    )
+    parser.add_argument(
+        "--solutions",
+        type=str,
+        default=None,
+        help="Batch mode: directory or glob of solution files validated in one process",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Batch mode result table (.jsonl or .csv). Default: print one line per file",
+    )
+    parser.add_argument(
+        "--parameters",
+        type=str,
+        default="parameters_national.csv",
+        help="Parameters file with costs and fuel efficiency bands",
+    )
+    parser.add_argument(
+        "--empty-weight",
+        type=float,
+        default=0.0,
+        help="Empty vehicle weight in kg added to the cargo for tolls and MaxWeight",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=DEFAULT_SPEED,
+        help=f"Average speed in km/h for the time cost (default: {DEFAULT_SPEED:g})",
+    )
+    add_distance_arguments(parser)
+    add_sweep_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="Show detailed output")
+
+    args = parser.parse_args()
+    check_distance_arguments(parser, args)
+
+    if args.output and not args.solutions:
+        parser.error("--output requires --solutions")
+
+    project_options = {
+        "parameters_file": args.parameters,
+        "empty_weight": args.empty_weight,
+        "speed": args.speed,
+    }
+
+    if args.solutions:
+        run_batch(args, ProjectCValidator, **project_options)
+        return
+
+    if args.stream:
+        run_stream(args, args.solution or default_solution_file(), ProjectCValidator, **project_options)
+        return
+
+    try:
+        solution_file = args.solution or default_solution_file()
+        print(
+            f"Starting Project C validation with {args.method} distance calculation..."
+        )
+        print(f"Reading solution from: {solution_file}\n")
+
+        validator = ProjectCValidator(
+            **distance_options(args),
+            **project_options,
+            solution_file=solution_file,
+        )
+        with ParallelValidator(validator, args.workers) as parallel:
+            result = parallel.validate_solution()
+        print_result(result, validator, verbose=args.verbose)
+        run_sweep(args, validator, result)
+        write_profile(args, validator)
+
+    except Exception as e:
+        print(f"\nError during validation: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Route-level memoization of validation results across candidate solutions.
+
+Metaheuristic populations share most of their routes from one generation to
+the next. RouteMemo keys every solution row by a BLAKE2b digest of its cells
+(vehicle, depot, loads, route sequence, demands and any reported columns)
+and stores what validate_routes found for that route: its errors, its route
+cost and its contributions to the arrays summed across routes (client
+visits, Project A depot loads). Only rows with a new digest are validated,
+in one validate_routes call on the sub-table of new rows; repeated rows are
+assembled from the memo, so the result equals a full validation.
+
+Records are dropped least recently used first once more than max_routes are
+held. Reported-value differences and coverage checks are not memoized; they
+run on the assembled result as usual.
+
+Usage:
+  validator = SolutionValidator(route_memo=100_000)   # or --route-memo
+  for solution_df in population:
+      validator.validate_solution(solution_df, save_cache=False)
+  validator.memo_stats()   # hits, misses, hit_rate, entries, evictions
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+DEFAULT_MAX_ROUTES = 100_000
+
+# Separates cells in the hashed row text
+_CELL_SEPARATOR = "\x1f"
+
+
+def split_route_results(
+    errors: List[str], error_ends: Sequence[int], route_sums: Dict[str, tuple], num_routes: int
+) -> List[Dict]:
+    """
+    Split a chunk's errors and summed-array contributions by route.
+
+    Args:
+        errors: Route errors of the chunk, in route order
+        error_ends: Number of errors up to and including each route
+        route_sums: Array name mapped to (route, position, weight) arrays
+        num_routes: Routes in the chunk
+
+    Returns:
+        Per route, a dict with its "errors" and "sums" (array name mapped
+        to (position, weight) arrays; weight None adds 1 per entry)
+    """
+    bounds = [0, *error_ends]
+    results = [{"errors": errors[bounds[r] : bounds[r + 1]], "sums": {}} for r in range(num_routes)]
+
+    for key, (routes, positions, weights) in route_sums.items():
+        order = np.argsort(routes, kind="stable")
+        starts = np.searchsorted(routes[order], np.arange(num_routes + 1)).tolist()
+        positions = positions[order]
+        if weights is not None:
+            weights = weights[order]
+        for r, result in enumerate(results):
+            start, end = starts[r], starts[r + 1]
+            result["sums"][key] = (
+                positions[start:end],
+                None if weights is None else weights[start:end],
+            )
+    return results
+
+
+def visit_route_result(errors: List[str], visits: np.ndarray) -> Dict:
+    """
+    Per-route result of a validator that only sums client visits.
+
+    Args:
+        errors: Errors of the route
+        visits: Visits of the route per client
+
+    Returns:
+        Dict with "errors" and "sums", as in split_route_results
+    """
+    positions = np.repeat(np.arange(len(visits)), visits)
+    return {"errors": errors, "sums": {"visits": (positions, None)}}
+
+
+def row_keys(solution_df) -> List[bytes]:
+    """
+    BLAKE2b digest of every row of a solution table (Table or DataFrame).
+
+    The header is part of each digest, so files with other columns never
+    share records.
+    """
+    columns = list(solution_df.columns)
+    header = hashlib.blake2b(_CELL_SEPARATOR.join(map(str, columns)).encode(), digest_size=16)
+    cells = [map(str, solution_df[column].tolist()) for column in columns]
+
+    keys = []
+    for row in zip(*cells):
+        digest = header.copy()
+        digest.update(_CELL_SEPARATOR.join(row).encode())
+        keys.append(digest.digest())
+    return keys
+
+
+class RouteMemo:
+    """
+    Bounded LRU store of per-route validation results.
+
+    Records are only valid for the validator (instance and options) they
+    were computed with; each SolutionValidator owns its memo.
+
+    Args:
+        max_routes: Records kept before the least recently used are dropped
+    """
+
+    def __init__(self, max_routes: int = DEFAULT_MAX_ROUTES):
+        if max_routes < 1:
+            raise ValueError(f"max_routes must be at least 1, got {max_routes}")
+        self.max_routes = max_routes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._records: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def validate_routes(self, validator, solution_df, first_row: int = 0) -> Dict:
+        """
+        validate_routes through the memo: only rows not seen before are checked.
+
+        Args:
+            validator: SolutionValidator (or project subclass) owning the memo
+            solution_df: Solution rows to check
+            first_row: Position of the first row in the whole solution
+
+        Returns:
+            Dict as returned by validator.validate_routes; "fallback_legs"
+            counts only the legs computed for new routes
+        """
+        keys = row_keys(solution_df)
+        records = self._records
+
+        # New digests, each validated once even if repeated within the chunk
+        new_rows: Dict[bytes, int] = {}
+        for row, key in enumerate(keys):
+            if key in records:
+                records.move_to_end(key)
+            elif key not in new_rows:
+                new_rows[key] = row
+        misses = len(new_rows)
+        self.hits += len(keys) - misses
+        self.misses += misses
+        validator.profiler.count("route_memo_hits", len(keys) - misses)
+        validator.profiler.count("route_memo_misses", misses)
+
+        fallback_legs = 0
+        new_records = {}
+        if new_rows:
+            rows = np.fromiter(new_rows.values(), dtype=np.intp, count=misses)
+            partial = validator.validate_routes(solution_df.iloc[rows], per_route=True)
+            fallback_legs = partial.get("fallback_legs", 0)
+            costs = {route["row"]: route for route in partial["route_costs"]}
+            for k, (key, result) in enumerate(zip(new_rows, partial["route_results"])):
+                cost = costs.get(k)
+                if cost is not None:
+                    cost = {name: value for name, value in cost.items() if name != "row"}
+                # Unit weights are stored explicitly, so rows concatenate as is
+                sums = {
+                    name: (positions, np.ones(len(positions)) if weights is None else weights)
+                    for name, (positions, weights) in result["sums"].items()
+                }
+                new_records[key] = (tuple(result["errors"]), sums, cost)
+
+        # Look every row up before storing new records, which may evict
+        found = [records[key] if key in records else new_records[key] for key in keys]
+        for key, record in new_records.items():
+            records[key] = record
+        while len(records) > self.max_routes:
+            records.popitem(last=False)
+            self.evictions += 1
+
+        return self._assemble(validator, found, first_row, fallback_legs)
+
+    @staticmethod
+    def _assemble(validator, found: List[tuple], first_row: int, fallback_legs: int) -> Dict:
+        """validate_routes result from the records of a chunk's rows."""
+        result = {
+            "errors": [error for errors, _, _ in found for error in errors],
+            "route_costs": [
+                {**cost, "row": first_row + r}
+                for r, (_, _, cost) in enumerate(found)
+                if cost is not None
+            ],
+            "fallback_legs": fallback_legs,
+        }
+
+        empty = validator.empty_totals()
+        for key in validator.summed_results:
+            contributions = [sums[key] for _, sums, _ in found if key in sums]
+            if not contributions:
+                result[key] = empty[key]
+                continue
+            positions = np.concatenate([positions for positions, _ in contributions])
+            weights = np.concatenate([weights for _, weights in contributions])
+            result[key] = np.bincount(positions, weights, minlength=len(empty[key])).astype(
+                empty[key].dtype, copy=False
+            )
+        return result
+
+    def stats(self) -> Dict:
+        """Hit/miss counters plus the current number of records."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "evictions": self.evictions,
+        }
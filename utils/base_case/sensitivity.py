@@ -0,0 +1,362 @@
+"""
+Cost-parameter sensitivity analysis of a validated solution.
+
+The objective of a route is linear in its coefficients once the route is
+checked: activation (1), distance (km), time (hours) and fuel (km priced at
+fuel_price / fuel_efficiency) plus a constant for tolls and, in Project C,
+fuel bought at stations. CostSweep stores these per-route features once,
+one block of columns per vehicle type, and prices every scenario of a
+parameter grid with one matrix product:
+
+    route costs (routes × scenarios) = features (routes × k) @ coefficients.T
+
+so thousands of what-if scenarios take milliseconds instead of one
+validation each. Scenario totals reduce the features first (a k-vector).
+
+Sweep axes name a parameter of the parameters file (C_dist,
+fuel_efficiency_van_small, energy_consumption_drone) or a CostParameters
+field, optionally for one vehicle type (fuel_efficiency@small van). The
+grid is every combination of the axis values; parameters left out keep
+their value from the file. range_axes sweeps every parameter the file
+gives as a _min/_max range.
+
+Usage:
+  result = validator.validate_solution()
+  sweep = validator.cost_sweep(result)
+  axes = [parse_axis("C_dist=2000:3000:11"), *range_axes("parameters_urban.csv", sweep, 5)]
+  scenarios = sweep.run(axes)   # axis values, cost components and total per scenario
+"""
+
+import csv
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cost_model import (
+    COST_COMPONENTS,
+    CostParameters,
+    coefficient_value,
+    parameter_sources,
+    read_parameters,
+)
+
+# CostParameters fields a sweep can set
+SWEPT_FIELDS = ("fixed", "distance", "time", "fuel_price", "fuel_efficiency")
+
+# Feature columns per vehicle type, each priced by one coefficient:
+# activation (C_fixed), km (C_dist), hours (C_time), km (fuel price per km)
+FEATURES = ("fixed", "distance", "time", "fuel")
+
+# Largest grid priced at once
+MAX_SCENARIOS = 1_000_000
+
+
+@dataclass
+class SweepAxis:
+    """
+    One swept parameter.
+
+    Attributes:
+        name: Parameter name (or field@vehicle type) shown in results
+        values: Values swept, in the units of the parameter
+        targets: (vehicle type, CostParameters field) pairs the parameter
+            sets; None until resolved against the vehicle types
+        source: Parameters file name whose units convert the values
+            (km/L, kWh/km), if any
+        units: Unit of each parameter of the file, for source
+    """
+
+    name: str
+    values: np.ndarray
+    targets: Optional[List[Tuple[str, str]]] = None
+    source: Optional[str] = None
+    units: Dict[str, str] = field(default_factory=dict)
+
+    def coefficients(self, values: np.ndarray) -> np.ndarray:
+        """Coefficient values for swept values (unit conversions applied)."""
+        if self.source is None:
+            return values
+        return coefficient_value(self.source, values, self.units)
+
+
+def parse_values(text: str) -> np.ndarray:
+    """
+    Parse axis values: "start:stop:num" (num evenly spaced values, ends
+    included) or a comma-separated list.
+
+    Raises:
+        ValueError: If the values are not numbers or num is below 1
+    """
+    try:
+        if ":" in text:
+            start, stop, num = text.split(":")
+            if int(num) < 1:
+                raise ValueError
+            return np.linspace(float(start), float(stop), int(num))
+        return np.array([float(value) for value in text.split(",")])
+    except ValueError:
+        raise ValueError(
+            f"Invalid sweep values {text!r}.\n"
+            "Use start:stop:num (e.g. 2000:3000:11) or a list (e.g. 35,40,45)."
+        ) from None
+
+
+def parse_axis(spec: str) -> SweepAxis:
+    """
+    Parse a --sweep axis "NAME=VALUES".
+
+    NAME is a parameter of the parameters file or a CostParameters field,
+    optionally followed by @vehicle type; see parse_values for VALUES.
+    """
+    name, separator, values = spec.partition("=")
+    if not separator or not name.strip():
+        raise ValueError(
+            f"Invalid sweep axis {spec!r}.\n"
+            "Use NAME=VALUES, e.g. C_dist=2000:3000:11 or fuel_efficiency@small van=35,40,45."
+        )
+    return SweepAxis(name.strip(), parse_values(values.strip()))
+
+
+class CostSweep:
+    """
+    Per-route cost features of a solution, priced under many scenarios.
+
+    Args:
+        profiles: Objective coefficients by vehicle type ("" for the whole fleet)
+        route_profiles: Vehicle type of each priced route
+        route_costs: CostParameters.route_costs dicts of the routes
+        fuel_from_records: Fuel is a fixed per-route cost (bought at
+            stations) instead of distance over efficiency
+    """
+
+    def __init__(
+        self,
+        profiles: Dict[str, CostParameters],
+        route_profiles: Sequence[str],
+        route_costs: List[Dict],
+        fuel_from_records: bool = False,
+    ):
+        self.profiles = profiles
+        self.fuel_from_records = fuel_from_records
+        self.profile_names = list(profiles)
+        num_profiles = len(self.profile_names)
+        num_features = len(FEATURES)
+
+        # One block of FEATURES columns per vehicle type, then the constant
+        positions = {name: p for p, name in enumerate(self.profile_names)}
+        blocks = np.array([positions[name] for name in route_profiles], dtype=np.intp)
+        km = np.array([route["distance_km"] for route in route_costs], dtype=float)
+        hours = np.array([route["time_min"] for route in route_costs], dtype=float) / 60
+        tolls = np.array([route["tolls"] for route in route_costs], dtype=float)
+        recorded_fuel = np.zeros(len(route_costs))
+        if fuel_from_records:
+            recorded_fuel = np.array([route["fuel"] for route in route_costs], dtype=float)
+        self.tolls_total = float(tolls.sum())
+        self.recorded_fuel_total = float(recorded_fuel.sum())
+
+        rows = np.arange(len(route_costs))
+        self.features = np.zeros((len(route_costs), num_profiles * num_features + 1))
+        self.features[rows, blocks * num_features] = 1.0
+        self.features[rows, blocks * num_features + 1] = km
+        self.features[rows, blocks * num_features + 2] = hours
+        if not fuel_from_records:
+            self.features[rows, blocks * num_features + 3] = km
+        self.features[:, -1] = tolls + recorded_fuel
+
+    def resolve(self, axis: SweepAxis, parameters_file: Optional[str] = None) -> SweepAxis:
+        """
+        Find the vehicle types and coefficients an axis sets.
+
+        Raises:
+            ValueError: If the axis names no priced coefficient
+        """
+        if axis.targets is not None:
+            return axis
+
+        name, _, vehicle_type = axis.name.partition("@")
+        if name in SWEPT_FIELDS:
+            profiles = [vehicle_type.strip()] if vehicle_type else self.profile_names
+            unknown = [profile for profile in profiles if profile not in self.profiles]
+            if unknown:
+                raise ValueError(
+                    f"Unknown vehicle type {unknown[0]!r} in sweep axis {axis.name!r}.\n"
+                    f"Vehicle types: {', '.join(self.profile_names)}"
+                )
+            axis.targets = [(profile, name) for profile in profiles]
+        else:
+            parameters, axis.units = {}, {}
+            if parameters_file:
+                parameters = read_parameters(parameters_file)
+                axis.units = read_parameters(parameters_file, column="Unit")
+            axis.source = name
+            axis.targets = [
+                (profile, target)
+                for profile in self.profile_names
+                for target, source in parameter_sources(parameters, profile or None).items()
+                if source == name
+            ]
+            if not axis.targets:
+                raise ValueError(
+                    f"Sweep axis {axis.name!r} is not a coefficient of any vehicle type.\n"
+                    f"Use a parameter of {parameters_file or 'the parameters file'} or one of "
+                    f"{', '.join(SWEPT_FIELDS)} (optionally @vehicle type)."
+                )
+
+        if self.fuel_from_records:
+            axis.targets = [
+                (profile, name)
+                for profile, name in axis.targets
+                if name not in ("fuel_price", "fuel_efficiency")
+            ]
+            if not axis.targets:
+                raise ValueError(
+                    f"Sweep axis {axis.name!r} does not change the cost: fuel is priced "
+                    "from the refuels at stations, not from fuel price or efficiency."
+                )
+        return axis
+
+    def coefficients(self, axes: Sequence[SweepAxis]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scenario grid and its coefficient matrix.
+
+        Args:
+            axes: Resolved axes; the grid is every combination of their values
+
+        Returns:
+            (axis values per scenario (scenarios × axes), coefficients per
+            scenario aligned with the feature columns (scenarios × k))
+
+        Raises:
+            ValueError: If the grid has more than MAX_SCENARIOS scenarios
+        """
+        num_scenarios = math.prod(len(axis.values) for axis in axes)
+        if num_scenarios > MAX_SCENARIOS:
+            raise ValueError(
+                f"The sweep has {num_scenarios:,} scenarios; at most {MAX_SCENARIOS:,} "
+                "are priced at once. Use fewer values per axis."
+            )
+        grids = np.meshgrid(*(axis.values for axis in axes), indexing="ij")
+        values = np.stack([grid.ravel() for grid in grids], axis=1) if axes else np.zeros((1, 0))
+
+        # Coefficient per scenario and vehicle type, starting from the file values
+        fields = {
+            name: np.tile(
+                [getattr(self.profiles[profile], name) for profile in self.profile_names],
+                (len(values), 1),
+            ).astype(float)
+            for name in SWEPT_FIELDS
+        }
+        for k, axis in enumerate(axes):
+            coefficient = axis.coefficients(values[:, k])
+            for profile, name in axis.targets:
+                fields[name][:, self.profile_names.index(profile)] = coefficient
+
+        with np.errstate(divide="ignore"):
+            fuel_per_km = np.where(
+                np.isinf(fields["fuel_efficiency"]),
+                0.0,
+                fields["fuel_price"] / fields["fuel_efficiency"],
+            )
+        theta = np.ones((len(values), self.features.shape[1]))
+        blocks = theta[:, :-1].reshape(len(values), len(self.profile_names), len(FEATURES))
+        blocks[:, :, 0] = fields["fixed"]
+        blocks[:, :, 1] = fields["distance"]
+        blocks[:, :, 2] = fields["time"]
+        blocks[:, :, 3] = fuel_per_km
+        return values, theta
+
+    def run(self, axes: Sequence[SweepAxis], per_route: bool = False) -> Dict:
+        """
+        Price the solution under every scenario of the axes' grid.
+
+        Args:
+            axes: Resolved axes (see resolve)
+            per_route: Also return the cost of every route in every scenario
+
+        Returns:
+            Dict with "axes" (names), "values" (scenarios × axes), the
+            COST_COMPONENTS and "total" (one value per scenario) and, with
+            per_route, "route_totals" (routes × scenarios)
+        """
+        values, theta = self.coefficients(axes)
+        contributions = theta * self.features.sum(axis=0)
+
+        num_features = len(FEATURES)
+        by_feature = contributions[:, :-1].reshape(len(values), -1, num_features).sum(axis=1)
+        result = {"axes": [axis.name for axis in axes], "values": values}
+        for k, component in enumerate(FEATURES):
+            result[component] = by_feature[:, k]
+        # Fuel bought at stations is in the constant column with the tolls
+        result["fuel"] = result["fuel"] + self.recorded_fuel_total
+        result["tolls"] = np.full(len(values), self.tolls_total)
+        result["total"] = contributions.sum(axis=1)
+
+        if per_route:
+            result["route_totals"] = self.features @ theta.T
+        return result
+
+
+def range_axes(parameters_file: str, sweep: CostSweep, num: int) -> Tuple[List[SweepAxis], List[str]]:
+    """
+    Axes for every parameter given as a _min/_max range.
+
+    Args:
+        parameters_file: parameters_[type].csv
+        sweep: CostSweep the axes are resolved against
+        num: Values per axis, evenly spaced from min to max
+
+    Returns:
+        (resolved axes, names of ranges that set no priced coefficient)
+    """
+    parameters = read_parameters(parameters_file)
+    axes, unused = [], []
+    for name in parameters:
+        if not name.endswith("_min") or f"{name[:-4]}_max" not in parameters:
+            continue
+        base = name[:-4]
+        low, high = float(parameters[name]), float(parameters[f"{base}_max"])
+        axis = SweepAxis(base, np.linspace(low, high, num))
+        try:
+            axis = sweep.resolve(axis, parameters_file)
+        except ValueError:
+            axis.targets = []
+        if axis.targets:
+            axes.append(axis)
+        else:
+            unused.append(base)
+    return axes, unused
+
+
+def write_sweep(result: Dict, output_file: str) -> None:
+    """Write one CSV row per scenario: axis values, cost components and total."""
+    columns = (*COST_COMPONENTS, "total")
+    with open(output_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*result["axes"], *columns])
+        for s, values in enumerate(result["values"].tolist()):
+            writer.writerow([*(f"{v:g}" for v in values), *(f"{result[c][s]:.2f}" for c in columns)])
+
+
+def print_sweep(result: Dict, base_total: float, seconds: float, unused: Sequence[str] = ()) -> None:
+    """Print the spread of the total cost over the scenarios and per axis."""
+    total = result["total"]
+    values = result["values"]
+    scenarios = f"{len(total):,} scenario" + ("s" if len(total) != 1 else "")
+    print(f"\nCost sensitivity ({scenarios} priced in {seconds * 1000:.1f} ms):")
+    print(f"  File parameters: {base_total:,.0f} COP")
+    for label, s in (("Lowest", int(np.argmin(total))), ("Highest", int(np.argmax(total)))):
+        setting = ", ".join(f"{name}={value:g}" for name, value in zip(result["axes"], values[s]))
+        print(f"  {label}: {total[s]:,.0f} COP" + (f" ({setting})" if setting else ""))
+
+    if result["axes"]:
+        print(f"\n{'Parameter':<36}{'Low':>10}{'High':>10}{'Mean total at low':>20}{'at high':>16}")
+    for k, name in enumerate(result["axes"]):
+        low, high = values[:, k].min(), values[:, k].max()
+        print(
+            f"{name:<36}{low:>10g}{high:>10g}"
+            f"{total[values[:, k] == low].mean():>20,.0f}{total[values[:, k] == high].mean():>16,.0f}"
+        )
+    for name in unused:
+        print(f"  {name}: range does not enter the objective (not swept)")
@@ -0,0 +1,464 @@
+"""
+Spatial index for nearest-neighbor queries over instance locations.
+
+Locations are mapped to 3D points on the unit sphere. The straight-line
+(chord) distance between two such points grows with their great-circle
+distance, so the nearest points by chord are the nearest by haversine
+distance, and a KD-tree over the 3D points answers k-nearest and radius
+queries without per-pair trigonometry. Reported distances are haversine
+kilometers, as in DistanceMatrix.
+
+The tree is kept as its leaf buckets (points in tree order plus a bounding
+box per leaf). Queries are answered for a block of nearby query points at a
+time: leaves are ranked by their box distance to the block, the closest
+ones give an upper bound on every k-th neighbor distance, and the block is
+compared with all leaves within that bound in one array operation.
+
+Granular neighbor lists (the k nearest locations of every location, as
+used to restrict local search moves) are written to an .npz file with the
+ids, neighbors and neighbor_distances members; matrix_io.py stores the
+same members inside binary distance matrices (--neighbors).
+
+Usage:
+  index = SpatialIndex.from_instance(".", kinds=("station",))
+  distances, stations = index.query(4.65, -74.08, k=3)
+  distances, neighbors = SpatialIndex.from_instance(".").neighbors(k=20)
+
+  python ../utils/base_case/spatial_index.py --k 20 --output neighbors.npz
+"""
+
+import argparse
+import os
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from csv_table import numeric_column, read_table
+from distance_matrix import EARTH_RADIUS_KM, haversine_pairs
+
+# Points per KD-tree leaf (and per query block)
+DEFAULT_LEAF_SIZE = 32
+
+# Neighbors per location in granular neighbor lists
+DEFAULT_NEIGHBORS = 20
+
+# Instance file of each location kind (tolls have no coordinates in the
+# provided cases and are skipped like any location without them)
+INSTANCE_FILES = {
+    "depot": "depots.csv",
+    "client": "clients.csv",
+    "station": "stations.csv",
+    "toll": "tolls.csv",
+}
+
+
+def unit_vectors(latitudes, longitudes) -> np.ndarray:
+    """(N, 3) points on the unit sphere for coordinates in degrees."""
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def km_to_chord(kilometers) -> np.ndarray:
+    """Unit-sphere chord length of a great-circle distance in kilometers."""
+    angle = np.clip(np.asarray(kilometers, dtype=float) / EARTH_RADIUS_KM, 0.0, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def _partition(points: np.ndarray, leaf_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split points into KD-tree leaves.
+
+    Each node is split at the median of its widest axis until it holds at
+    most leaf_size points.
+
+    Returns:
+        (order, starts): point positions in leaf order, and the start of
+        each leaf in order (with the total count appended)
+    """
+    order = np.arange(len(points))
+    starts = []
+    stack = [(0, len(points))]
+    while stack:
+        start, stop = stack.pop()
+        if stop - start <= leaf_size:
+            starts.append(start)
+            continue
+        block = order[start:stop]
+        coords = points[block]
+        axis = int(np.argmax(coords.max(axis=0) - coords.min(axis=0)))
+        half = (stop - start) // 2
+        order[start:stop] = block[np.argpartition(coords[:, axis], half)]
+        # Left half is popped first, so leaves come out in tree order
+        stack.append((start + half, stop))
+        stack.append((start, start + half))
+    return order, np.array(starts + [len(points)], dtype=np.intp)
+
+
+class SpatialIndex:
+    """
+    KD-tree over locations for k-nearest and radius queries by haversine distance.
+
+    Args:
+        ids: Location IDs, one per coordinate pair
+        latitudes, longitudes: Coordinates in degrees (all finite)
+        leaf_size: Points per tree leaf
+
+    Raises:
+        ValueError: If a location has no coordinates
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        leaf_size: int = DEFAULT_LEAF_SIZE,
+    ):
+        self.ids = list(ids)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        if not (len(self.ids) == len(self.latitudes) == len(self.longitudes)):
+            raise ValueError("ids, latitudes and longitudes must have the same length")
+
+        missing = ~(np.isfinite(self.latitudes) & np.isfinite(self.longitudes))
+        if missing.any():
+            names = [self.ids[k] for k in np.flatnonzero(missing)[:5]]
+            raise ValueError(
+                f"{int(missing.sum())} location(s) without coordinates: {', '.join(names)}\n"
+                "The spatial index needs Latitude and Longitude for every location."
+            )
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size must be at least 1, got {leaf_size}")
+
+        self.leaf_size = leaf_size
+        self.skipped: List[str] = []
+        self.points = unit_vectors(self.latitudes, self.longitudes)
+        self.order, self.leaf_starts = _partition(self.points, leaf_size)
+
+        ordered = self.points[self.order]
+        if len(self.ids):
+            self.leaf_lo = np.minimum.reduceat(ordered, self.leaf_starts[:-1])
+            self.leaf_hi = np.maximum.reduceat(ordered, self.leaf_starts[:-1])
+        else:
+            self.leaf_lo = self.leaf_hi = np.zeros((0, 3))
+        self.leaf_sizes = np.diff(self.leaf_starts)
+
+    @classmethod
+    def from_instance(
+        cls,
+        directory: str = ".",
+        kinds: Iterable[str] = ("depot", "client", "station"),
+        leaf_size: int = DEFAULT_LEAF_SIZE,
+    ) -> "SpatialIndex":
+        """
+        Index the locations of an instance directory that have coordinates.
+
+        Args:
+            directory: Instance directory with the CSV files of INSTANCE_FILES
+            kinds: Location kinds to index (missing files are skipped)
+            leaf_size: Points per tree leaf
+
+        Returns:
+            SpatialIndex whose skipped attribute lists the IDs left out for
+            lack of coordinates
+        """
+        ids, latitudes, longitudes = read_instance_locations(directory, kinds)
+        located = np.isfinite(latitudes) & np.isfinite(longitudes)
+        index = cls(
+            [loc_id for loc_id, keep in zip(ids, located) if keep],
+            latitudes[located],
+            longitudes[located],
+            leaf_size=leaf_size,
+        )
+        index.skipped = [loc_id for loc_id, keep in zip(ids, located) if not keep]
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def query(self, latitudes, longitudes, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k nearest indexed locations of each query point.
+
+        Args:
+            latitudes, longitudes: Query coordinates in degrees (scalars or arrays)
+            k: Neighbors per query point (at most len(self))
+
+        Returns:
+            (distances, indices): haversine kilometers and positions in ids,
+            nearest first; shape (k,) for scalar queries and (Q, k) otherwise
+        """
+        scalar = np.ndim(latitudes) == 0
+        points = unit_vectors(np.atleast_1d(latitudes), np.atleast_1d(longitudes))
+        k = self._check_k(k, len(self))
+
+        indices = np.zeros((len(points), k), dtype=np.intp)
+        order, starts = _partition(points, self.leaf_size)
+        for start, stop in zip(starts[:-1], starts[1:]):
+            block = order[start:stop]
+            indices[block] = self._nearest(points[block], k)
+
+        distances = self._distances(np.atleast_1d(latitudes), np.atleast_1d(longitudes), indices)
+        if scalar:
+            return distances[0], indices[0]
+        return distances, indices
+
+    def neighbors(self, k: int = DEFAULT_NEIGHBORS) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Granular neighbor lists: the k nearest other locations of every location.
+
+        Args:
+            k: Neighbors per location (at most len(self) - 1)
+
+        Returns:
+            (distances, indices) of shape (len(self), k), nearest first;
+            indices are positions in ids
+        """
+        k = self._check_k(k, len(self) - 1)
+        indices = np.zeros((len(self), k), dtype=np.intp)
+        for start, stop in zip(self.leaf_starts[:-1], self.leaf_starts[1:]):
+            block = self.order[start:stop]
+            indices[block] = self._nearest(self.points[block], k, exclude=block)
+        return self._distances(self.latitudes, self.longitudes, indices), indices
+
+    def query_radius(self, latitudes, longitudes, radius_km: float):
+        """
+        Indexed locations within radius_km of each query point.
+
+        Args:
+            latitudes, longitudes: Query coordinates in degrees (scalars or arrays)
+            radius_km: Haversine radius in kilometers
+
+        Returns:
+            (distances, indices) sorted nearest first: two arrays for a scalar
+            query, two lists with one array per query point otherwise
+        """
+        scalar = np.ndim(latitudes) == 0
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=float))
+        points = unit_vectors(latitudes, longitudes)
+        chord = km_to_chord(radius_km)
+
+        found: List[np.ndarray] = [np.zeros(0, dtype=np.intp)] * len(points)
+        order, starts = _partition(points, self.leaf_size)
+        for start, stop in zip(starts[:-1], starts[1:]):
+            block = order[start:stop]
+            candidates = self._candidates(points[block], chord)
+            chords = self._chords(points[block], candidates)
+            for row, q in enumerate(block.tolist()):
+                within = np.flatnonzero(chords[row] <= chord)
+                found[q] = candidates[within[np.argsort(chords[row, within], kind="stable")]]
+
+        distances = [
+            haversine_pairs(
+                latitudes[q], longitudes[q], self.latitudes[hits], self.longitudes[hits]
+            )
+            for q, hits in enumerate(found)
+        ]
+        if scalar:
+            return distances[0], found[0]
+        return distances, found
+
+    @staticmethod
+    def _check_k(k: int, available: int) -> int:
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        if k > available:
+            raise ValueError(f"k={k} exceeds the {available} locations available")
+        return k
+
+    def _box_gaps(self, points: np.ndarray) -> np.ndarray:
+        """Smallest chord distance between the box around points and each leaf box."""
+        lo = points.min(axis=0)
+        hi = points.max(axis=0)
+        gaps = np.maximum(0.0, np.maximum(self.leaf_lo - hi, lo - self.leaf_hi))
+        return np.sqrt((gaps**2).sum(axis=1))
+
+    def _leaf_members(self, leaves: np.ndarray) -> np.ndarray:
+        return np.concatenate(
+            [self.order[self.leaf_starts[leaf] : self.leaf_starts[leaf + 1]] for leaf in leaves]
+        )
+
+    def _candidates(self, points: np.ndarray, chord: float) -> np.ndarray:
+        """Indexed points in leaves that may lie within chord of a query point."""
+        leaves = np.flatnonzero(self._box_gaps(points) <= chord)
+        if not len(leaves):
+            return np.zeros(0, dtype=np.intp)
+        return self._leaf_members(leaves)
+
+    def _chords(self, points: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """(Q, C) chord distances from query points to candidate points."""
+        diff = points[:, None, :] - self.points[candidates][None, :, :]
+        return np.sqrt((diff**2).sum(axis=2))
+
+    def _nearest(self, points: np.ndarray, k: int, exclude: np.ndarray = None) -> np.ndarray:
+        """
+        k nearest indexed points of a block of nearby query points.
+
+        Args:
+            points: (Q, 3) query points
+            k: Neighbors per query point
+            exclude: Position in ids to leave out for each query point
+
+        Returns:
+            (Q, k) positions in ids, nearest first
+        """
+        gaps = self._box_gaps(points)
+
+        # The closest leaves holding enough points bound every k-th distance
+        ranked = np.argsort(gaps, kind="stable")
+        needed = k + (exclude is not None)
+        first = int(np.searchsorted(np.cumsum(self.leaf_sizes[ranked]), needed)) + 1
+        bound = self._kth_chords(points, self._leaf_members(ranked[:first]), k, exclude).max()
+
+        candidates = self._leaf_members(np.flatnonzero(gaps <= bound))
+        chords = self._masked_chords(points, candidates, exclude)
+        nearest = np.argpartition(chords, k - 1, axis=1)[:, :k]
+        rows = np.arange(len(points))[:, None]
+        nearest = nearest[rows, np.argsort(chords[rows, nearest], axis=1, kind="stable")]
+        return candidates[nearest]
+
+    def _masked_chords(self, points, candidates, exclude) -> np.ndarray:
+        chords = self._chords(points, candidates)
+        if exclude is not None:
+            chords[candidates[None, :] == exclude[:, None]] = np.inf
+        return chords
+
+    def _kth_chords(self, points, candidates, k, exclude) -> np.ndarray:
+        chords = self._masked_chords(points, candidates, exclude)
+        return np.partition(chords, k - 1, axis=1)[:, k - 1]
+
+    def _distances(self, latitudes, longitudes, indices: np.ndarray) -> np.ndarray:
+        """Haversine kilometers from each query point to its neighbor indices."""
+        return haversine_pairs(
+            np.asarray(latitudes, dtype=float)[:, None],
+            np.asarray(longitudes, dtype=float)[:, None],
+            self.latitudes[indices],
+            self.longitudes[indices],
+        )
+
+
+def read_instance_locations(
+    directory: str = ".", kinds: Iterable[str] = ("depot", "client", "station")
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Read StandardizedIDs and coordinates from an instance directory.
+
+    Files of INSTANCE_FILES that do not exist are skipped; locations without
+    Latitude/Longitude columns or values get NaN coordinates.
+
+    Returns:
+        (ids, latitudes, longitudes) in file order, kind by kind
+    """
+    ids: List[str] = []
+    latitudes = []
+    longitudes = []
+    for kind in kinds:
+        if kind not in INSTANCE_FILES:
+            raise ValueError(
+                f"Unknown location kind: {kind}\n"
+                f"Available kinds: {', '.join(INSTANCE_FILES)}"
+            )
+        path = os.path.join(directory, INSTANCE_FILES[kind])
+        if not os.path.exists(path):
+            continue
+        table = read_table(path)
+        missing = np.full(len(table), np.nan)
+        ids.extend(str(loc_id) for loc_id in table["StandardizedID"].tolist())
+        latitudes.append(numeric_column(table["Latitude"]) if "Latitude" in table else missing)
+        longitudes.append(
+            numeric_column(table["Longitude"]) if "Longitude" in table else missing
+        )
+    if not ids:
+        return ids, np.zeros(0), np.zeros(0)
+    return ids, np.concatenate(latitudes), np.concatenate(longitudes)
+
+
+def write_neighbor_lists(
+    output_file: str, ids: Sequence[str], neighbors: np.ndarray, distances: np.ndarray
+) -> None:
+    """
+    Write granular neighbor lists to an uncompressed .npz file.
+
+    Args:
+        output_file: Destination .npz path
+        ids: Location IDs; neighbors hold positions in this list
+        neighbors: (N, k) neighbor positions, nearest first
+        distances: (N, k) neighbor distances in kilometers
+    """
+    np.savez(
+        output_file,
+        ids=np.array(ids, dtype=str),
+        neighbors=np.asarray(neighbors, dtype=np.int32),
+        neighbor_distances=np.asarray(distances, dtype=float),
+    )
+
+
+def read_neighbor_lists(path: str) -> Dict[str, list]:
+    """
+    Read neighbor lists from a neighbors .npz or an .npz distance matrix.
+
+    Returns:
+        Location ID mapped to its neighbor IDs, nearest first (padding
+        entries of -1 are dropped)
+
+    Raises:
+        ValueError: If the file has no neighbor lists
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if "neighbors" not in archive.files:
+            raise ValueError(
+                f"{path} has no neighbor lists.\n"
+                "Write them with spatial_index.py or matrix_io.py --neighbors."
+            )
+        ids = archive["ids"].tolist()
+        neighbors = archive["neighbors"]
+    return {
+        loc_id: [ids[k] for k in row if k >= 0] for loc_id, row in zip(ids, neighbors.tolist())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write k-nearest neighbor lists for the locations of an instance"
+    )
+    parser.add_argument(
+        "--instance", type=str, default=".", help="Instance directory (default: current)"
+    )
+    parser.add_argument(
+        "--k",
+        type=int,
+        default=DEFAULT_NEIGHBORS,
+        help=f"Neighbors per location (default: {DEFAULT_NEIGHBORS})",
+    )
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=list(INSTANCE_FILES),
+        default=["depot", "client", "station"],
+        help="Location kinds to include (default: depot client station)",
+    )
+    parser.add_argument(
+        "--output", type=str, default="neighbors.npz", help="Destination .npz file"
+    )
+    args = parser.parse_args()
+
+    if not args.output.lower().endswith(".npz"):
+        parser.error("output file must have the .npz extension")
+
+    index = SpatialIndex.from_instance(args.instance, kinds=args.kinds)
+    if index.skipped:
+        print(f"Skipped {len(index.skipped)} location(s) without coordinates")
+    k = min(args.k, len(index) - 1)
+    if k < 1:
+        parser.error("the instance needs at least two locations with coordinates")
+
+    distances, neighbors = index.neighbors(k)
+    write_neighbor_lists(args.output, index.ids, neighbors, distances)
+    print(f"Wrote {k} neighbors for {len(index)} locations to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+IncrementalValidator move deltas checked against full re-validation.
+
+Random moves are evaluated, applied, written as a verification file and
+validated from scratch; the evaluated distance delta and feasibility must
+match the change the full validator reports.
+
+Run from the repository root:
+  python -m pytest -q utils/base_case
+"""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+from base_case_verification import SolutionValidator
+from clarke_wright import savings_routes
+from distance_matrix import pairwise_matrix
+from incremental import IncrementalValidator
+from model_export import write_solution_csv
+from project_a_verification import ProjectAValidator
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+MOVES_PER_INSTANCE = 300
+
+INSTANCES = [
+    ("Proyecto_Caso_Base", SolutionValidator, False),
+    ("Proyecto_Caso_Base", SolutionValidator, True),
+    (os.path.join("project_a", "Proyecto_A_Caso3"), ProjectAValidator, False),
+]
+
+
+def write_asymmetric_matrix(validator, path: str) -> None:
+    """Haversine distances stretched by up to 30% per direction, as an .npz matrix."""
+    nodes = validator.nodes
+    distances = pairwise_matrix(nodes.latitude, nodes.longitude)
+    distances *= np.random.default_rng(0).uniform(1.0, 1.3, distances.shape)
+    np.savez(
+        path,
+        distances=distances,
+        ids=np.array(validator.node_ids, dtype=str),
+        metadata=np.array('{"matrix_type": "asymmetric", "format_version": "npz-1.0"}'),
+    )
+
+
+def random_move(incremental: IncrementalValidator, rng: random.Random):
+    """A valid random move (name, args) on the current routes."""
+    routes = [route.nodes for route in incremental.routes]
+    r1, r2 = rng.sample(range(len(routes)), 2)
+    interior1, interior2 = len(routes[r1]) - 2, len(routes[r2]) - 2
+    move = rng.choice(("two_opt", "relocate", "swap", "cross_exchange"))
+
+    if move == "two_opt":
+        return move, (r1, rng.randint(1, interior1), rng.randint(1, interior1))
+    if move == "relocate":
+        # Keep at least one client on the origin route
+        if interior1 < 2:
+            r1, r2 = r2, r1
+        target = rng.choice((r1, r2))
+        return move, (
+            r1,
+            rng.randint(1, len(routes[r1]) - 2),
+            target,
+            rng.randint(1, len(routes[target]) - 1),
+        )
+    if move == "swap":
+        target = rng.choice((r1, r2))
+        return move, (
+            r1,
+            rng.randint(1, interior1),
+            target,
+            rng.randint(1, len(routes[target]) - 2),
+        )
+    i1, j1 = sorted(rng.randint(1, interior1) for _ in range(2))
+    i2, j2 = sorted(rng.randint(1, interior2) for _ in range(2))
+    return move, (r1, i1, j1, r2, i2, j2)
+
+
+def revalidate(validator, incremental: IncrementalValidator, path: str) -> dict:
+    """Full validation of the incremental state written as a verification file."""
+    routes = [
+        (route.vehicle_id, sequence[0], sequence[1:-1])
+        for route, sequence in zip(incremental.routes, incremental.route_sequences())
+    ]
+    write_solution_csv(validator, routes, path)
+    return validator.validate_solution(validator.read_table(path), save_cache=False)
+
+
+@pytest.mark.parametrize("directory, validator_class, asymmetric", INSTANCES)
+def test_move_deltas_match_full_validation(
+    directory, validator_class, asymmetric, monkeypatch, tmp_path
+):
+    monkeypatch.chdir(os.path.join(ROOT, directory))
+    validator = validator_class(load_solution=False)
+    if asymmetric:
+        matrix_file = str(tmp_path / "distances.npz")
+        write_asymmetric_matrix(validator, matrix_file)
+        validator = validator_class(
+            distance_method="matrix", matrix_file=matrix_file, load_solution=False
+        )
+    path = str(tmp_path / "solution.csv")
+
+    write_solution_csv(validator, savings_routes(validator), path)
+    incremental = IncrementalValidator(validator, validator.read_table(path))
+    distance = revalidate(validator, incremental, path)["costs"]["total"]["distance_km"]
+    # The A validator adds checks (vehicle sizes, inventories) the state leaves out
+    compare_feasibility = validator_class is SolutionValidator
+
+    rng = random.Random(0)
+    for _ in range(MOVES_PER_INSTANCE):
+        move, args = random_move(incremental, rng)
+        delta = incremental.evaluate(move, *args)
+        incremental.apply(move, *args)
+        result = revalidate(validator, incremental, path)
+
+        moved = result["costs"]["total"]["distance_km"]
+        assert delta["distance_delta"] == pytest.approx(moved - distance, abs=1e-6), (move, args)
+        assert incremental.total_distance == pytest.approx(moved, abs=1e-6)
+        if compare_feasibility:
+            assert delta["feasible"] == result["feasible"], (move, args, result["errors"])
+
+        # Keep about half of the moves so later moves start from varied routes
+        if rng.random() < 0.5:
+            incremental.undo()
+        else:
+            distance = moved
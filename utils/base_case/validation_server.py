@@ -0,0 +1,433 @@
+"""
+Long-running validation server.
+
+Loads one or more instances (Base, B and C cases) once, keeps their
+validators, distance tables and caches in memory, and validates solutions
+posted over HTTP (TCP or a Unix socket). Optimization workers on the same
+host get a JSON verdict without paying interpreter startup, imports and
+instance loading for every solution.
+
+The server is a single asyncio event loop: many connections (with
+keep-alive) are served concurrently. Validations run in worker threads,
+one request per instance at a time, so requests never see a half-updated
+validator and a large solution (or HTTP calls to OSRM) does not stall the
+connections of other instances. Requests to the same instance are handled
+one at a time, in arrival order.
+
+Endpoints:
+  GET  /health                 {"status": "ok", "instances": [...]}
+  GET  /instances              project, directory and size of each instance
+  POST /validate/<instance>    body: a solution CSV (verification file format),
+                               or JSON {"solution": "<csv text>"} or
+                               {"rows": [{"VehicleId": ..., ...}, ...]}.
+                               ?routes=1 adds the per-route cost breakdown;
+                               with --gap the response has the "gap" to the
+                               instance lower bounds.
+
+Usage:
+  python validation_server.py --instance base=../../Proyecto_Caso_Base
+  python validation_server.py --socket /tmp/validator.sock \\
+      --instance b3=../../project_b/Proyecto_B_Caso3,project=b \\
+      --instance c3=../../project_c/Proyecto_C_Caso3,project=c,matrix=distances.npz
+
+  curl --data-binary @verificacion_caso1.csv http://127.0.0.1:8765/validate/base
+"""
+
+import argparse
+import asyncio
+import csv
+import importlib
+import io
+import json
+import os
+import signal
+import sys
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from base_case_verification import (
+    add_distance_arguments,
+    check_distance_arguments,
+    distance_options,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Requests with larger bodies are rejected (bytes)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Validator class per project, imported only when an instance uses it
+PROJECT_VALIDATORS = {
+    "base": ("base_case_verification", "SolutionValidator"),
+    "a": ("project_a_verification", "ProjectAValidator"),
+    "b": ("project_b_verification", "ProjectBValidator"),
+    "c": ("project_c_verification", "ProjectCValidator"),
+}
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+def parse_instance_spec(spec: str) -> Dict:
+    """
+    Parse an --instance argument: NAME=DIR[,project=base|a|b|c][,matrix=FILE][,key=value...].
+
+    Keys other than project and matrix are passed to the validator
+    constructor (parameters=FILE, empty_weight=8000, truck_speed=35, ...);
+    numeric values are converted to float. Paths are relative to DIR.
+
+    Returns:
+        Dict with name, directory, project, matrix and options
+    """
+    name, separator, rest = spec.partition("=")
+    if not separator or not name or not rest:
+        raise ValueError(
+            f"Invalid --instance {spec!r}.\n"
+            "Use NAME=DIR[,project=base|a|b|c][,matrix=FILE], "
+            "e.g. c3=project_c/Proyecto_C_Caso3,project=c,matrix=distances.npz"
+        )
+
+    directory, *pairs = rest.split(",")
+    instance = {
+        "name": name,
+        "directory": os.path.abspath(directory),
+        "project": "base",
+        "matrix": None,
+        "options": {},
+    }
+    for pair in pairs:
+        key, separator, value = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid option {pair!r} in --instance {spec!r}: expected key=value")
+        if key in ("project", "matrix"):
+            instance[key] = value
+        else:
+            try:
+                instance["options"][key] = float(value)
+            except ValueError:
+                instance["options"][key] = value
+
+    if instance["project"] not in PROJECT_VALIDATORS:
+        raise ValueError(
+            f"Unknown project {instance['project']!r} in --instance {spec!r}.\n"
+            f"Available projects: {', '.join(PROJECT_VALIDATORS)}"
+        )
+    return instance
+
+
+def load_validator(instance: Dict, options: Dict):
+    """
+    Build the validator of an instance from inside its directory.
+
+    Args:
+        instance: Parsed --instance spec
+        options: Shared validator keyword arguments (distance options)
+
+    Returns:
+        Validator with no solution loaded
+    """
+    module_name, class_name = PROJECT_VALIDATORS[instance["project"]]
+    validator_class = getattr(importlib.import_module(module_name), class_name)
+
+    options = dict(options)
+    if instance["matrix"]:
+        options["distance_method"] = "matrix"
+        options["matrix_file"] = instance["matrix"]
+    # The SQLite cache lives next to the instance it serves
+    options["cache_file"] = os.path.join(instance["directory"], options["cache_file"])
+
+    original_dir = os.getcwd()
+    os.chdir(instance["directory"])
+    try:
+        return validator_class(**options, **instance["options"], load_solution=False)
+    finally:
+        os.chdir(original_dir)
+
+
+def solution_text(body: bytes, content_type: str) -> str:
+    """
+    Extract the solution CSV text from a request body.
+
+    Raises:
+        ValueError: If a JSON body has neither "solution" nor "rows"
+    """
+    text = body.decode("utf-8-sig")
+    if "json" not in content_type:
+        return text
+
+    payload = json.loads(text)
+    if isinstance(payload, dict) and isinstance(payload.get("solution"), str):
+        return payload["solution"]
+    if isinstance(payload, dict) and isinstance(payload.get("rows"), list) and payload["rows"]:
+        rows = payload["rows"]
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        return out.getvalue()
+    raise ValueError(
+        'JSON payloads need "solution" (CSV text) or a non-empty "rows" list '
+        "of verification file rows"
+    )
+
+
+class ValidationServer:
+    """
+    HTTP front end for resident validators.
+
+    Args:
+        validators: Instance name mapped to its loaded validator
+        instances: Parsed --instance specs, by name (for /instances)
+    """
+
+    def __init__(self, validators: Dict, instances: Dict[str, Dict]):
+        self.validators = validators
+        self.instances = instances
+        self.requests_served = 0
+        # Validators are not thread-safe: one request per instance at a time
+        self._locks = {name: asyncio.Lock() for name in validators}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(
+                        writer, 413, {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"}, False
+                    )
+                    break
+
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                )
+                status, payload = await self.dispatch(method, target, headers, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool
+    ) -> None:
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, Dict]:
+        """Route one request; returns the status code and JSON payload."""
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+
+        if path == "/health":
+            return 200, {"status": "ok", "instances": list(self.validators)}
+
+        if path == "/instances":
+            return 200, {
+                name: {
+                    "project": instance["project"],
+                    "directory": instance["directory"],
+                    "distance_method": self.validators[name].distance_method,
+                    "clients": len(self.validators[name].client_ids),
+                }
+                for name, instance in self.instances.items()
+            }
+
+        if path.startswith("/validate/"):
+            if method != "POST":
+                return 405, {"error": "POST a solution to /validate/<instance>"}
+            name = path[len("/validate/") :]
+            if name not in self.validators:
+                return 404, {
+                    "error": f"Unknown instance {name!r}",
+                    "instances": list(self.validators),
+                }
+            include_routes = parse_qs(url.query).get("routes", ["0"])[0] not in ("0", "")
+            try:
+                text = solution_text(body, headers.get("content-type", ""))
+                return 200, await self.validate(name, text, include_routes)
+            except (ValueError, KeyError) as e:
+                return 400, {"error": f"Could not validate solution: {e}"}
+            except Exception as e:
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+
+        return 404, {"error": f"No endpoint {url.path}"}
+
+    async def validate(self, name: str, text: str, include_routes: bool = False) -> Dict:
+        """
+        Validate a solution CSV against a resident instance.
+
+        Returns:
+            Dict with instance, feasible, num_errors, errors, total_cost,
+            costs (totals, reported differences and, with include_routes,
+            per-route breakdown), gap (validators with report_gap) and
+            elapsed_ms
+        """
+        validator = self.validators[name]
+        start = time.perf_counter()
+
+        def run() -> Dict:
+            solution_df = validator.read_table(io.StringIO(text))
+            return validator.validate_solution(solution_df, save_cache=False)
+
+        async with self._locks[name]:
+            result = await asyncio.get_running_loop().run_in_executor(None, run)
+        self.requests_served += 1
+
+        response = {
+            "instance": name,
+            "feasible": result["feasible"],
+            "num_errors": len(result["errors"]),
+            "errors": result["errors"],
+            "total_cost": None,
+        }
+        costs = result.get("costs")
+        if costs:
+            response["total_cost"] = costs["total"]["total"]
+            response["costs"] = {"total": costs["total"], "differences": costs["differences"]}
+            if include_routes:
+                response["costs"]["routes"] = costs["routes"]
+        if "gap" in result:
+            response["gap"] = result["gap"]
+        response["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        return response
+
+    def save_caches(self) -> None:
+        """Write pending distance cache entries of every instance."""
+        for validator in self.validators.values():
+            validator.save_cache()
+
+
+async def serve(server: ValidationServer, host: str, port: int, socket_path: Optional[str]):
+    """Serve until SIGINT or SIGTERM, then flush the distance caches."""
+    if socket_path:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=socket_path)
+        print(f"Listening on unix socket {socket_path}")
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port)
+        print(f"Listening on http://{host}:{port}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except NotImplementedError:  # Windows: Ctrl+C raises KeyboardInterrupt
+            pass
+
+    async with listener:
+        await stop.wait()
+
+    server.save_caches()
+    if socket_path and os.path.exists(socket_path):
+        os.remove(socket_path)
+    print(f"Stopped after {server.requests_served} validations")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validation server with resident instances",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Instances:
+  --instance NAME=DIR[,project=base|a|b|c][,matrix=FILE][,key=value...]
+  matrix= switches that instance to --method matrix; other keys are passed
+  to the validator (parameters=..., empty_weight=8000, truck_speed=35, ...).
+  Paths inside the spec are relative to DIR.
+
+Examples:
+  python validation_server.py --instance base=../../Proyecto_Caso_Base
+  python validation_server.py --port 9000 \\
+      --instance c3=../../project_c/Proyecto_C_Caso3,project=c,matrix=distances.npz
+  curl --data-binary @solution.csv http://127.0.0.1:8765/validate/base
+        """,
+    )
+    parser.add_argument(
+        "--instance",
+        action="append",
+        required=True,
+        help="Instance to keep loaded (repeatable), see below",
+    )
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Listen on this Unix socket instead of TCP",
+    )
+    add_distance_arguments(parser, solution_files=False)
+
+    args = parser.parse_args()
+    check_distance_arguments(parser, args)
+
+    try:
+        instances = {}
+        for spec in args.instance:
+            instance = parse_instance_spec(spec)
+            if instance["name"] in instances:
+                parser.error(f"Instance {instance['name']!r} is given twice")
+            instances[instance["name"]] = instance
+
+        options = distance_options(args)
+        validators = {}
+        for name, instance in instances.items():
+            start = time.perf_counter()
+            validators[name] = load_validator(instance, options)
+            print(
+                f"Loaded {name} ({instance['project']}, {len(validators[name].client_ids)} "
+                f"clients) in {time.perf_counter() - start:.2f} s"
+            )
+
+        server = ValidationServer(validators, instances)
+        asyncio.run(serve(server, args.host, args.port, args.socket))
+        if args.profile:
+            options["profiler"].write(args.profile)
+            print(f"Profile written to: {args.profile}")
+
+    except Exception as e:
+        print(f"\nError in validation server: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()